@@ -0,0 +1,4 @@
+"""
+Benchmarks for the FoxFuel K-Factor Optimizer.
+Run from the repository root, e.g. python -m benchmarks.weighted_k
+"""
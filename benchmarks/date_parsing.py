@@ -0,0 +1,71 @@
+"""
+Ignite date parsing benchmark.
+Times parse_ignite_dates against the previous format-less pd.to_datetime path
+on synthetic ticket timestamps such as "1/31/25 1:35 PM".
+"""
+
+import argparse
+import time
+import warnings
+import numpy as np
+import pandas as pd
+
+from src.data_loader import parse_ignite_dates
+from src.logger import setup_logger
+
+def make_ticket_dates(rows: int, distinct: int, seed: int = 0) -> pd.Series:
+    """Create Ignite-style ticket timestamps drawn from a pool of distinct values over three years."""
+    rng = np.random.default_rng(seed)
+    minutes = rng.choice(3 * 365 * 24 * 60, size=distinct, replace=False)
+    timestamps = pd.Timestamp("2022-07-01") + pd.to_timedelta(minutes, unit="min")
+    # Ignite writes months, days and hours without leading zeros
+    pool = np.array([
+        f"{t.month}/{t.day}/{t.year % 100:02d} {(t.hour % 12) or 12}:{t.minute:02d} {'AM' if t.hour < 12 else 'PM'}"
+        for t in timestamps
+    ], dtype=object)
+    return pd.Series(pool[rng.integers(0, distinct, rows)])
+
+def previous_parse(values: pd.Series) -> pd.Series:
+    """The format-less pd.to_datetime used before parse_ignite_dates."""
+    with warnings.catch_warnings():
+        # pandas warns that it falls back to dateutil for every element
+        warnings.simplefilter("ignore", UserWarning)
+        return pd.to_datetime(values, errors='coerce')
+
+def best_time(func, repeat: int) -> float:
+    """Best wall time of repeat calls."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Ignite date parsing")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=12_000,
+                        help="Distinct timestamps (the sample DeliveryTickets file has about 12,000)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-previous", action="store_true",
+                        help="Only time the current parser (the previous path takes minutes at 1M rows)")
+    args = parser.parse_args(argv)
+
+    setup_logger("WARNING")
+    values = make_ticket_dates(args.rows, min(args.distinct, args.rows))
+
+    current = parse_ignite_dates(values)
+    current_time = best_time(lambda: parse_ignite_dates(values), args.repeat)
+    print(f"{args.rows:,} dates, {values.nunique():,} distinct")
+    print(f"parse_ignite_dates: {current_time:10.2f} s")
+
+    if not args.skip_previous:
+        start = time.perf_counter()
+        previous = previous_parse(values)
+        previous_time = time.perf_counter() - start
+        print(f"pd.to_datetime:     {previous_time:10.2f} s ({previous_time / current_time:.0f}x slower)")
+        pd.testing.assert_series_equal(previous, current, check_dtype=False)
+        print("parsed values match")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Import-time budget check for the FoxFuel K-Factor Optimizer.
+Measures cold imports of the light entry modules with python -X importtime and
+fails when one exceeds its budget or pulls in a heavy library.
+
+Usage: python -m benchmarks.import_time [--runs 5]
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+
+HEAVY_MODULES = ["pandas", "numpy", "openpyxl", "loguru", "tkinter", "numba"]
+
+# Module -> (budget in ms for its cumulative import time, heavy modules it must not import)
+IMPORT_BUDGETS = {
+    "src": (20, HEAVY_MODULES),
+    "src.config": (20, HEAVY_MODULES),
+    "src.input_files": (60, HEAVY_MODULES),
+    "src.cli": (60, HEAVY_MODULES),
+    "src.logger": (30, HEAVY_MODULES),
+    "src.events": (30, HEAVY_MODULES),
+    "src.run_process": (60, HEAVY_MODULES),
+    "src.pipeline": (120, HEAVY_MODULES),
+    "src.outputs_writer": (1000, ["openpyxl", "tkinter"])
+}
+
+def import_time_ms(module: str) -> float:
+    """
+    Cumulative import time of a module in a fresh interpreter.
+
+    Args:
+        module: Dotted module name
+
+    Returns:
+        Import time in milliseconds
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    pattern = re.compile(rf"import time:\s+\d+ \|\s+(\d+) \|\s*{re.escape(module)}$")
+    for line in completed.stderr.splitlines():
+        match = pattern.match(line)
+        if match:
+            return int(match.group(1)) / 1000
+    # Already imported by the interpreter itself
+    return 0.0
+
+def imported_modules(module: str, candidates: list) -> list:
+    """Which of the candidate modules are loaded after importing a module."""
+    completed = subprocess.run(
+        [sys.executable, "-c",
+         f"import json, sys, {module}; print(json.dumps([m for m in {candidates!r} if m in sys.modules]))"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout)
+
+def check_budgets(runs: int = 5) -> list:
+    """
+    Measure every module in IMPORT_BUDGETS.
+
+    Args:
+        runs: Fresh imports per module; the fastest is compared with the budget
+
+    Returns:
+        List of result dicts with module, ms, budget_ms, heavy and ok
+    """
+    results = []
+    for module, (budget_ms, forbidden) in IMPORT_BUDGETS.items():
+        ms = min(import_time_ms(module) for _ in range(max(runs, 1)))
+        heavy = imported_modules(module, forbidden)
+        results.append({
+            'module': module, 'ms': round(ms, 1), 'budget_ms': budget_ms,
+            'heavy': heavy, 'ok': ms <= budget_ms and not heavy
+        })
+    return results
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check import times against their budgets")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh imports per module; the fastest counts")
+    args = parser.parse_args(argv)
+
+    results = check_budgets(args.runs)
+    print(f"{'Module':<22}{'ms':>8}{'Budget':>8}  Heavy imports")
+    for result in results:
+        flag = "" if result['ok'] else "  FAIL"
+        print(f"{result['module']:<22}{result['ms']:>8.1f}{result['budget_ms']:>8}  "
+              f"{', '.join(result['heavy']) or '-'}{flag}")
+
+    failed = [result['module'] for result in results if not result['ok']]
+    if failed:
+        print(f"\nOver budget: {', '.join(failed)}")
+        return 1
+    print("\nAll imports within budget")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
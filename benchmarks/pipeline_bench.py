@@ -0,0 +1,201 @@
+"""
+Pipeline benchmark harness for the FoxFuel K-Factor Optimizer.
+Times each pipeline step on synthetic datasets and appends the results to a JSON history.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import src
+from src import kernels
+from src.data_loader import DataLoader
+from src.pipeline import KFactorPipeline
+from src.logger import setup_logger
+
+from .synthetic_data import generate_dataset
+
+BENCHMARK_DIR = Path(__file__).parent
+DATA_DIR = BENCHMARK_DIR / "data"
+HISTORY_FILE = BENCHMARK_DIR / "results" / "history.json"
+
+def run_pipeline(input_dir: Path, output_dir: Path, use_cache: bool = False,
+                 trace_memory: bool = False) -> dict:
+    """
+    Run the pipeline once and collect its step profile.
+
+    Args:
+        input_dir: Directory with the input CSV files
+        output_dir: Directory for the output files
+        use_cache: Read inputs through the input cache
+        trace_memory: Also record the traced allocation peak of each step
+
+    Returns:
+        Dictionary with the step profile records and row counts
+    """
+    pipeline = KFactorPipeline(input_dir, output_dir, profile_memory=trace_memory, cached_stages=False)
+    pipeline.data_loader = DataLoader(input_dir, use_cache=use_cache)
+    result = pipeline.run_pipeline()
+    if result['status'] != 'success':
+        raise RuntimeError(f"Pipeline failed on {input_dir}: {result['error']}")
+
+    return {
+        'profile': result['statistics']['profile'],
+        'rows': {
+            'customer_fuel': len(pipeline.customer_fuel),
+            'delivery_tickets': len(pipeline.delivery_tickets),
+            'degree_days': len(pipeline.degree_days),
+            'intervals': len(pipeline.intervals),
+            'customers_governed': len(pipeline.governed_data)
+        }
+    }
+
+def benchmark_dataset(input_dir: Path, repeat: int = 1, use_cache: bool = False,
+                      trace_memory: bool = True) -> dict:
+    """
+    Benchmark one dataset: the fastest of repeat runs, plus one traced run for memory.
+
+    Tracing allocations slows Python-heavy steps considerably, so timings
+    come only from the untraced runs.
+
+    Returns:
+        Dictionary with per-step seconds, CPU seconds and peak_mb, totals and row counts
+    """
+    output_dir = input_dir / "outputs"
+    runs = [run_pipeline(input_dir, output_dir, use_cache) for _ in range(max(repeat, 1))]
+    fastest = min(runs, key=lambda run: sum(record['wall_seconds'] for record in run['profile']))
+    steps = {
+        record['step']: {'seconds': record['wall_seconds'], 'cpu_seconds': record['cpu_seconds'],
+                         'rows_in': record['rows_in'], 'rows_out': record['rows_out']}
+        for record in fastest['profile']
+    }
+    result = {
+        'steps': steps,
+        'total_seconds': round(sum(step['seconds'] for step in steps.values()), 4),
+        'peak_rss_mb': max(record['peak_rss_mb'] or 0 for record in fastest['profile'])
+    }
+
+    if trace_memory:
+        traced = run_pipeline(input_dir, output_dir, use_cache, trace_memory=True)
+        for record in traced['profile']:
+            steps[record['step']]['peak_mb'] = record['peak_traced_mb']
+        result['peak_mb'] = max(step['peak_mb'] for step in steps.values())
+
+    result['rows'] = fastest['rows']
+    return result
+
+def environment() -> dict:
+    """Describe the code version and platform a result was measured on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCHMARK_DIR, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'version': src.__version__,
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'kernels': kernels.get_backend(),
+        'platform': platform.platform()
+    }
+
+def dataset_dir(customers: int, years: float, areas: int, seed: int) -> Path:
+    """Directory a generated dataset is kept in, so repeated runs reuse it."""
+    return DATA_DIR / f"{customers}c_{years:g}y_{areas}a_s{seed}"
+
+def ensure_dataset(customers: int, years: float, areas: int, seed: int) -> Path:
+    """Generate a dataset unless it already exists."""
+    directory = dataset_dir(customers, years, areas, seed)
+    marker = directory / "dataset.json"
+    if not marker.exists():
+        print(f"Generating {customers:,} customers, {years:g} years, {areas} areas...")
+        summary = generate_dataset(directory, customers, years, areas, seed)
+        marker.write_text(json.dumps(summary, indent=2))
+    return directory
+
+def load_history(history_file: Path = HISTORY_FILE) -> list:
+    """Load recorded results, oldest first."""
+    if not history_file.exists():
+        return []
+    return json.loads(history_file.read_text())
+
+def save_history(history: list, history_file: Path = HISTORY_FILE):
+    """Write recorded results."""
+    history_file.parent.mkdir(parents=True, exist_ok=True)
+    history_file.write_text(json.dumps(history, indent=2))
+
+def previous_result(history: list, dataset: dict) -> dict:
+    """Most recent recorded result for the same dataset, if any."""
+    for entry in reversed(history):
+        if entry['dataset'] == dataset:
+            return entry
+    return None
+
+def print_result(result: dict, previous: dict = None):
+    """Print step timings, with the change against the previous run of the same dataset."""
+    dataset = result['dataset']
+    print(f"\n{dataset['customers']:,} customers, {result['rows']['delivery_tickets']:,} tickets, "
+          f"{dataset['years']:g} years, {dataset['areas']} areas, {result['environment']['kernels']} kernels")
+    print(f"{'Step':<22}{'Seconds':>10}{'CPU s':>10}{'Peak MB':>10}{'vs last':>10}")
+    for name, step in result['steps'].items():
+        change = ""
+        if previous is not None and previous['steps'].get(name, {}).get('seconds'):
+            change = f"{step['seconds'] / previous['steps'][name]['seconds'] - 1:+.0%}"
+        peak = f"{step['peak_mb']:.1f}" if 'peak_mb' in step else "-"
+        print(f"{name:<22}{step['seconds']:>10.3f}{step.get('cpu_seconds', 0):>10.3f}{peak:>10}{change:>10}")
+    peak = f"{result['peak_mb']:.1f}" if 'peak_mb' in result else "-"
+    print(f"{'total':<22}{result['total_seconds']:>10.3f}{'':>10}{peak:>10}")
+    if result.get('peak_rss_mb'):
+        print(f"Process peak RSS: {result['peak_rss_mb']:.0f} MB")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the K-Factor pipeline on synthetic data")
+    parser.add_argument("--customers", type=int, nargs="+", default=[1000, 10_000],
+                        help="Dataset sizes in customers (e.g. 1000 100000 1000000)")
+    parser.add_argument("--years", type=float, default=3, help="Years of delivery history")
+    parser.add_argument("--areas", type=int, default=3, help="Number of DDay Areas")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per size; the fastest is recorded")
+    parser.add_argument("--use-cache", action="store_true", help="Read inputs through the input cache")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced run for peak memory")
+    parser.add_argument("--kernels", choices=kernels.KERNEL_BACKENDS, default=None,
+                        help="Force the interval kernel backend (default: KERNEL_BACKEND)")
+    parser.add_argument("--no-history", action="store_true", help="Do not append results to the history")
+    parser.add_argument("--history", type=Path, default=HISTORY_FILE)
+    args = parser.parse_args(argv)
+
+    setup_logger("WARNING")
+    if args.kernels:
+        try:
+            kernels.set_backend(args.kernels)
+        except ImportError as e:
+            parser.error(str(e))
+    history = load_history(args.history)
+    env = environment()
+
+    for customers in args.customers:
+        input_dir = ensure_dataset(customers, args.years, args.areas, args.seed)
+        best = benchmark_dataset(input_dir, args.repeat, args.use_cache, trace_memory=not args.no_memory)
+
+        dataset = {'customers': customers, 'years': args.years, 'areas': args.areas,
+                   'seed': args.seed, 'use_cache': args.use_cache}
+        result = {'timestamp': datetime.now().isoformat(timespec='seconds'), 'dataset': dataset,
+                  'environment': env, **best}
+        print_result(result, previous_result(history, dataset))
+        history.append(result)
+
+    if not args.no_history:
+        save_history(history, args.history)
+        print(f"\nResults appended to {args.history}")
+
+if __name__ == "__main__":
+    main()
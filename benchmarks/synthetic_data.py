@@ -0,0 +1,284 @@
+"""
+Synthetic Ignite data generator for the FoxFuel K-Factor Optimizer benchmarks.
+Writes 03_CustomerFuel, 04_DeliveryTickets and 06_DegreeDayValues files shaped like Ignite exports.
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Full Ignite export headers; the first (unnamed) column is Column A
+CUSTOMER_FUEL_HEADER = [
+    "", "Customer Number", "Customer Code", "Customer Fuel Unique ID", "Customer Location Unique ID",
+    "Customer Type", "Customer Fuel Type", "Zone - Fuel", "Usable Size", "Optimum Delivery - Fuel",
+    "K Factor", "Previous K Factor", "Previous K Factor (2nd)", "Last DDay", "Next DDay", "Run Out DDay",
+    "Allow Smart K", "Smart K Predictability", "Smart K Previous Predictability", "Recalc K Factor",
+    "Baseload", "Estimated Delivery - Fuel", "Currently in Tank", "% Full", "Salesperson - Fuel Acct",
+    "Customer Segment", "Automatic Delivery", "K Factor - Winter", "K Factor - Summer", "K Factor - Fall",
+    "K Factor - Spring", "PIDCustomerFuel1"
+]
+DELIVERY_TICKETS_HEADER = [
+    "", "Customer Number", "Customer Code", "Customer Fuel Unique ID", "Customer Location Unique ID",
+    "Transaction Number", "Transaction Date", "Transaction Type", "Quantity", "K Factor",
+    "Previous K Factor", "Previous K Factor (2nd)", "Recalc K Factor", "Next DDay", "Run Out DDay",
+    "Optimum Delivery - Fuel", "% Full", "Last Delivery Date - Fuel", "Last Delivery Quantity",
+    "Last Delivery Fill Percent", "Estimated Delivery - Fuel", "Zone - Fuel", "Salesperson - Fuel Acct",
+    "Ticket Message", "Service Status", "Automatic Delivery", "PIDCustomerFuel1"
+]
+DEGREE_DAY_HEADER = [
+    "", "Date Added - DDay", "DDay Area", "DDay Date", "Heat Only DDays", "Hot Water DDays",
+    "Last Modified - DDay"
+]
+
+DEFAULT_AREA = "Default"
+AREA_NAMES = ["North", "Shore", "Valley", "Hills", "Metro", "Lakes", "Ridge", "Coast"]
+# Zones of customers in the default area; customers in other areas use the area name as zone
+DEFAULT_ZONES = ["34E11", "M38C4", "P9-K7", "M32D5", "M31B6", "Other"]
+USABLE_SIZES = np.array([247, 250, 275, 330, 495, 500, 1000])
+USABLE_SIZE_WEIGHTS = np.array([0.45, 0.25, 0.1, 0.07, 0.06, 0.04, 0.03])
+TIME_STRINGS = np.array([
+    f"{hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+    for hour in range(24) for minute in (0, 5, 20, 35, 50)
+], dtype=object)
+TICKET_MESSAGES = np.array([
+    "", "", "", "", "***Pays By DEBIT Card***", "Gate code 1234", "Fill pipe behind garage",
+    "Call before delivery", "SMALL TANK UNTIL NEW TANK IS INSTALLED MARCH"
+], dtype=object)
+
+DEFAULT_END_DATE = "2025-06-30"
+CUSTOMER_CHUNK = 50_000
+
+def ignite_dates(dates: pd.DatetimeIndex) -> np.ndarray:
+    """Format dates like Ignite ("1/31/25"), without the platform-specific %-m directive."""
+    years = pd.Series(dates.year % 100).map("{:02d}".format)
+    return (pd.Series(dates.month).astype(str) + "/" + pd.Series(dates.day).astype(str) + "/" + years).to_numpy(object)
+
+def area_names(areas: int) -> list:
+    """Names of the degree day areas; the first is always the default area."""
+    names = [DEFAULT_AREA] + AREA_NAMES[:max(areas - 1, 0)]
+    names += [f"Area {i}" for i in range(len(names), areas)]
+    return names
+
+def generate_degree_days(areas: list, dates: pd.DatetimeIndex, rng: np.random.Generator) -> dict:
+    """
+    Simulate cumulative heating degree days for each area.
+
+    Returns:
+        Dictionary mapping area to its cumulative degree days per date
+    """
+    day_of_year = dates.dayofyear.to_numpy()
+    seasonal = 52 - 22 * np.cos(2 * np.pi * (day_of_year - 20) / 365.25)
+    cumulative = {}
+    for i, area in enumerate(areas):
+        temperature = seasonal + (i % 5 - 2) * 1.5 + rng.normal(0, 6, len(dates))
+        heating = np.clip(65 - temperature, 0, None).round()
+        cumulative[area] = 11000 + np.cumsum(heating).astype(np.int64)
+    return cumulative
+
+def degree_days_frame(cumulative: dict, dates: pd.DatetimeIndex) -> pd.DataFrame:
+    """Lay out cumulative degree days like the DegreeDayValues export."""
+    date_strings = ignite_dates(dates)
+    frames = []
+    for area, values in cumulative.items():
+        frames.append(pd.DataFrame({
+            "": "",
+            "Date Added - DDay": date_strings,
+            "DDay Area": area,
+            "DDay Date": date_strings,
+            "Heat Only DDays": values,
+            "Hot Water DDays": values + np.arange(len(values)) * 3,
+            "Last Modified - DDay": date_strings
+        }))
+    return pd.concat(frames, ignore_index=True)[DEGREE_DAY_HEADER]
+
+def generate_customers(customers: int, areas: list, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Create customers with a tank, a weather area and a true usage rate.
+
+    Winter K is set around the rate the pipeline will measure, so the
+    governance rules see a realistic mix of approved, capped and flagged customers.
+    """
+    area_weights = np.r_[0.5, np.full(len(areas) - 1, 0.5 / max(len(areas) - 1, 1))] if len(areas) > 1 else np.ones(1)
+    area_index = rng.choice(len(areas), customers, p=area_weights)
+    area = np.array(areas, dtype=object)[area_index]
+    zone = np.where(area_index == 0, rng.choice(DEFAULT_ZONES, customers), area).astype(object)
+    usable = rng.choice(USABLE_SIZES, customers, p=USABLE_SIZE_WEIGHTS).astype(float)
+
+    # Gallons per degree day, roughly 800 gallons a year for a 250 gallon tank
+    rate = rng.lognormal(np.log(0.18), 0.35, customers) * (usable / 250) ** 0.5
+    winter_k = (rate * rng.lognormal(0, 0.2, customers)).round(4)
+    return pd.DataFrame({
+        "Customer Number": (1_000_000 + np.arange(customers)).astype(str),
+        "Area": area,
+        "Zone - Fuel": zone,
+        "Usable Size": usable,
+        "Rate": rate,
+        "K Factor - Winter": winter_k,
+        "K Factor - Summer": (winter_k * rng.uniform(0.6, 0.9, customers)).round(4),
+        "K Factor": winter_k
+    })
+
+def customer_fuel_frame(customers: pd.DataFrame) -> pd.DataFrame:
+    """Lay out customers like the CustomerFuel export."""
+    count = len(customers)
+    numbers = customers["Customer Number"]
+    frame = pd.DataFrame("", index=customers.index, columns=CUSTOMER_FUEL_HEADER)
+    frame["Customer Number"] = numbers
+    frame["Customer Fuel Unique ID"] = numbers
+    frame["Customer Location Unique ID"] = numbers
+    frame["PIDCustomerFuel1"] = numbers
+    frame["Zone - Fuel"] = customers["Zone - Fuel"]
+    frame["Usable Size"] = customers["Usable Size"].astype(int)
+    frame["Optimum Delivery - Fuel"] = (customers["Usable Size"] * 0.72).round().astype(int)
+    for column in ["K Factor", "K Factor - Winter", "K Factor - Summer"]:
+        frame[column] = customers[column].map("{:.4f}".format)
+    frame["K Factor - Fall"] = frame["K Factor - Winter"]
+    frame["K Factor - Spring"] = frame["K Factor - Winter"]
+    frame["Previous K Factor"] = frame["K Factor"]
+    frame["Customer Type"] = np.where(np.arange(count) % 3 == 0, "Budget", "")
+    frame["Allow Smart K"] = "True"
+    frame["Recalc K Factor"] = "True"
+    frame["Baseload"] = "0.00"
+    frame["% Full"] = "100%"
+    frame["Automatic Delivery"] = 1
+    return frame
+
+def generate_tickets(customers: pd.DataFrame, cumulative: dict, dates: pd.DatetimeIndex,
+                     rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Simulate delivery tickets for a block of customers.
+
+    Each customer is filled whenever its usage since the last fill reaches
+    roughly one tank, plus occasional partial deliveries, service tickets and
+    negative adjustments, so every validation and interval path is exercised.
+    """
+    date_strings = ignite_dates(dates)
+    parts = []
+    for area, members in customers.groupby("Area", sort=False):
+        values = cumulative[area]
+        total_dd = values[-1] - values[0]
+        fill_size = members["Usable Size"].to_numpy() * rng.uniform(0.9, 0.98, len(members))
+        dd_per_fill = fill_size / members["Rate"].to_numpy()
+        phase = rng.uniform(0, 1, len(members))
+        fills = np.maximum(np.floor(total_dd / dd_per_fill - phase).astype(np.int64), 0)
+
+        # Full fills when cumulative usage crosses each tank's worth
+        owner = np.repeat(np.arange(len(members)), fills)
+        fill_number = np.arange(len(owner)) - np.repeat(np.cumsum(fills) - fills, fills)
+        threshold = values[0] + (fill_number + phase[owner]) * dd_per_fill[owner]
+        day = np.minimum(np.searchsorted(values, threshold), len(dates) - 1)
+        quantity = (fill_size[owner] * rng.uniform(0.97, 1.03, len(owner))).round(1)
+
+        # Partial top-offs and other transactions between fills
+        extras = rng.binomial(np.maximum(fills, 1), 0.15)
+        extra_owner = np.repeat(np.arange(len(members)), extras)
+        extra_day = rng.integers(0, len(dates), len(extra_owner))
+        extra_quantity = (members["Usable Size"].to_numpy()[extra_owner] * rng.uniform(0.1, 0.5, len(extra_owner))).round(1)
+        extra_type = rng.choice(["Delivery", "Delivery", "Delivery", "Service", "Adjustment"], len(extra_owner))
+        extra_quantity = np.where(extra_type == "Adjustment", -extra_quantity, extra_quantity)
+
+        owner = np.r_[owner, extra_owner]
+        parts.append(pd.DataFrame({
+            "Customer Number": members["Customer Number"].to_numpy()[owner],
+            "Zone - Fuel": members["Zone - Fuel"].to_numpy()[owner],
+            "K Factor": members["K Factor"].to_numpy()[owner],
+            "Usable Size": members["Usable Size"].to_numpy()[owner],
+            "Day": np.r_[day, extra_day],
+            "Transaction Type": np.r_[np.full(len(day), "Delivery", dtype=object), extra_type],
+            "Quantity": np.r_[quantity, extra_quantity]
+        }))
+
+    tickets = pd.concat(parts, ignore_index=True).sort_values(["Customer Number", "Day"], kind="mergesort")
+    count = len(tickets)
+    frame = pd.DataFrame("", index=np.arange(count), columns=DELIVERY_TICKETS_HEADER)
+    numbers = tickets["Customer Number"].to_numpy()
+    frame["Customer Number"] = numbers
+    frame["Customer Fuel Unique ID"] = numbers
+    frame["Customer Location Unique ID"] = numbers
+    frame["PIDCustomerFuel1"] = numbers
+    frame["Transaction Number"] = rng.integers(10_000, 9_000_000, count)
+    frame["Transaction Date"] = date_strings[tickets["Day"].to_numpy()] + " " + rng.choice(TIME_STRINGS, count)
+    frame["Transaction Type"] = tickets["Transaction Type"].to_numpy()
+    frame["Quantity"] = tickets["Quantity"].map("{:.2f}".format).to_numpy()
+    frame["K Factor"] = tickets["K Factor"].map("{:.4f}".format).to_numpy()
+    frame["Recalc K Factor"] = "True"
+    frame["Optimum Delivery - Fuel"] = (tickets["Usable Size"].to_numpy() * 0.76).round().astype(int)
+    frame["% Full"] = "0%"
+    frame["Zone - Fuel"] = tickets["Zone - Fuel"].to_numpy()
+    frame["Ticket Message"] = rng.choice(TICKET_MESSAGES, count)
+    frame["Service Status"] = "Fuel & Service"
+    frame["Automatic Delivery"] = 1
+    return frame
+
+def generate_dataset(output_dir, customers: int = 1000, years: float = 3, areas: int = 3,
+                     seed: int = 0, end_date: str = DEFAULT_END_DATE) -> dict:
+    """
+    Write a synthetic set of Ignite input files.
+
+    Tickets are generated and appended in blocks of customers, so memory use
+    stays bounded for million-customer datasets.
+
+    Args:
+        output_dir: Directory for the three CSV files
+        customers: Number of customers
+        years: Years of delivery history
+        areas: Number of DDay Areas (the first is the default area)
+        seed: Random seed; the same arguments always produce the same files
+        end_date: Last date of the history
+
+    Returns:
+        Dictionary with the file paths and row counts
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    end = pd.Timestamp(end_date)
+    dates = pd.date_range(end - pd.DateOffset(days=int(round(years * 365.25))), end, freq="D")
+    names = area_names(max(int(areas), 1))
+    cumulative = generate_degree_days(names, dates, rng)
+    customer_data = generate_customers(customers, names, rng)
+
+    files = {
+        'customer_fuel': output_dir / "03_CustomerFuel.csv",
+        'delivery_tickets': output_dir / "04_DeliveryTickets.csv",
+        'degree_days': output_dir / "06_DegreeDayValues.csv"
+    }
+    customer_fuel_frame(customer_data).to_csv(files['customer_fuel'], index=False)
+    degree_days_frame(cumulative, dates).to_csv(files['degree_days'], index=False)
+
+    ticket_rows = 0
+    for start in range(0, customers, CUSTOMER_CHUNK):
+        block = customer_data.iloc[start:start + CUSTOMER_CHUNK]
+        tickets = generate_tickets(block, cumulative, dates, rng)
+        tickets.to_csv(files['delivery_tickets'], index=False, mode='w' if start == 0 else 'a', header=start == 0)
+        ticket_rows += len(tickets)
+    if customers == 0:
+        pd.DataFrame(columns=DELIVERY_TICKETS_HEADER).to_csv(files['delivery_tickets'], index=False)
+
+    return {
+        'files': {file_type: str(path) for file_type, path in files.items()},
+        'customers': customers,
+        'tickets': ticket_rows,
+        'areas': len(names),
+        'years': years,
+        'degree_day_rows': len(dates) * len(names),
+        'seed': seed
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic Ignite input files")
+    parser.add_argument("output_dir", help="Directory for the generated CSV files")
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--years", type=float, default=3)
+    parser.add_argument("--areas", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    summary = generate_dataset(args.output_dir, args.customers, args.years, args.areas, args.seed)
+    print(f"Wrote {summary['customers']:,} customers, {summary['tickets']:,} tickets and "
+          f"{summary['degree_day_rows']:,} degree day rows to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Weighted K aggregation benchmark.
+Times KFactorCalculator.calculate_weighted_k_by_customer against the previous
+per-customer np.average aggregation on synthetic interval K-factors.
+"""
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from src.kfactor_calculator import KFactorCalculator
+from src.logger import setup_logger
+
+def make_interval_k_factors(customers: int, intervals_per_customer: int = 8, seed: int = 0) -> pd.DataFrame:
+    """Create synthetic interval K-factors with a varying interval count per customer."""
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(1, 2 * intervals_per_customer, customers)
+    customer_numbers = np.repeat(np.char.add('C', np.arange(customers).astype(str)), counts)
+    rows = len(customer_numbers)
+    gallons = rng.uniform(50, 300, rows).round(1)
+    degree_days = rng.uniform(20, 600, rows).round(1)
+    return pd.DataFrame({
+        'Customer Number': customer_numbers,
+        'Total Gallons': gallons,
+        'Degree Days Used': degree_days,
+        'Usable Size': np.repeat(rng.choice([275.0, 500.0, 1000.0], customers), counts),
+        'Interval K Factor': gallons / degree_days
+    })
+
+def previous_weighted_k(interval_k_factors: pd.DataFrame) -> pd.DataFrame:
+    """The per-customer np.average aggregation used before the grouped sums."""
+    customer_stats = interval_k_factors.groupby('Customer Number').agg({
+        'Total Gallons': ['sum', 'count'],
+        'Interval K Factor': lambda x: np.average(x, weights=interval_k_factors.loc[x.index, 'Total Gallons']),
+        'Degree Days Used': 'sum',
+        'Usable Size': 'first'
+    }).round(4)
+    customer_stats.columns = ['Total Gallons', 'Interval Count', 'Weighted K Factor', 'Total Degree Days', 'Usable Size']
+    return customer_stats.reset_index()
+
+def best_time(func, repeat: int) -> float:
+    """Best wall time of repeat calls."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark weighted K aggregation")
+    parser.add_argument("--customers", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-previous", action="store_true", help="Only time the current aggregation")
+    args = parser.parse_args(argv)
+
+    setup_logger("WARNING")
+    interval_k_factors = make_interval_k_factors(args.customers)
+    calculator = KFactorCalculator()
+
+    current = calculator.calculate_weighted_k_by_customer(interval_k_factors)
+    current_time = best_time(lambda: calculator.calculate_weighted_k_by_customer(interval_k_factors), args.repeat)
+    print(f"{args.customers:,} customers, {len(interval_k_factors):,} intervals")
+    print(f"grouped sums:  {current_time * 1000:10.1f} ms")
+
+    if not args.skip_previous:
+        previous = previous_weighted_k(interval_k_factors)
+        previous_time = best_time(lambda: previous_weighted_k(interval_k_factors), 1)
+        mismatched = (previous['Weighted K Factor'] != current['Weighted K Factor']).sum()
+        print(f"np.average:    {previous_time * 1000:10.1f} ms ({previous_time / current_time:.0f}x slower)")
+        print(f"rounded weighted K mismatches: {mismatched}")
+        pd.testing.assert_frame_equal(previous, current)
+
+if __name__ == "__main__":
+    main()
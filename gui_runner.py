@@ -5,7 +5,7 @@ A user-friendly graphical interface for running the K-Factor optimization pipeli
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import threading
+import multiprocessing
 import subprocess
 import os
 import sys
@@ -15,11 +15,17 @@ import webbrowser
 # Add src to path for imports
 sys.path.append(str(Path(__file__).parent / "src"))
 
-from src.pipeline import KFactorPipeline
+from src.events import EventBus, LOG, PROGRESS, STATUS, STEP_START
+from src.run_process import PipelineProcess
 from src.logger import get_logger
 
 logger = get_logger()
 
+# The run process publishes events; the main loop applies them in batches on a timer
+EVENT_POLL_MS = 100
+EVENT_BATCH_SIZE = 2000
+LOG_MAX_LINES = 5000
+
 class FoxFuelGUI:
     def __init__(self, root):
         self.root = root
@@ -39,6 +45,7 @@ class FoxFuelGUI:
         
         self.setup_ui()
         self.setup_variables()
+        self.root.after(EVENT_POLL_MS, self._poll_events)
         
     def setup_ui(self):
         """Create the user interface."""
@@ -92,6 +99,10 @@ class FoxFuelGUI:
                                     command=self.run_optimization, style='Accent.TButton')
         self.run_button.pack(side=tk.LEFT, padx=(0, 10))
         
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", command=self.cancel_optimization,
+                                        state='disabled')
+        self.cancel_button.pack(side=tk.LEFT, padx=(0, 10))
+        
         self.open_inputs_button = ttk.Button(button_frame, text="Open Inputs Folder", 
                                             command=self.open_inputs_folder)
         self.open_inputs_button.pack(side=tk.LEFT, padx=(0, 10))
@@ -100,6 +111,11 @@ class FoxFuelGUI:
                                              command=self.open_outputs_folder)
         self.open_outputs_button.pack(side=tk.LEFT)
         
+        # Saves a .prof file with the outputs when a run is unexpectedly slow
+        self.profile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="Profile run",
+                        variable=self.profile_var).pack(side=tk.LEFT, padx=(10, 0))
+        
         # Progress section
         progress_frame = ttk.LabelFrame(main_frame, text="Progress", padding="10")
         progress_frame.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
@@ -108,7 +124,9 @@ class FoxFuelGUI:
         self.progress_var = tk.StringVar(value="Ready to run optimization...")
         ttk.Label(progress_frame, textvariable=self.progress_var).grid(row=0, column=0, sticky=tk.W)
         
-        self.progress_bar = ttk.Progressbar(progress_frame, mode='indeterminate')
+        self.progress_value = tk.DoubleVar(value=0.0)
+        self.progress_bar = ttk.Progressbar(progress_frame, mode='determinate', maximum=100,
+                                            variable=self.progress_value)
         self.progress_bar.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
         
         # Log section
@@ -160,6 +178,11 @@ class FoxFuelGUI:
         self.is_running = False
         self.csv_file_path = None
         self.excel_file_path = None
+        # Runs happen in a child process, started when inputs are detected so it
+        # loads them in the background and Run starts with warm data
+        self.pipeline_process = None
+        # Log, progress and status events from the run process
+        self.events = EventBus()
         
     def auto_detect_files(self):
         """Auto-detect CSV files in the inputs folder."""
@@ -199,6 +222,7 @@ class FoxFuelGUI:
         if all_found:
             self.status_var.set("All input files detected")
             self.log_message("✓ All required CSV files detected successfully")
+            self.start_prefetch()
         else:
             missing = []
             if not customer_fuel_files:
@@ -211,16 +235,55 @@ class FoxFuelGUI:
             self.status_var.set(f"Missing files: {', '.join(missing)}")
             self.log_message(f"⚠ Missing files: {', '.join(missing)}")
     
+    def start_prefetch(self):
+        """Start a run process that loads the detected input files in the background."""
+        if self.pipeline_process is not None:
+            return
+        
+        self.status_var.set("Loading input data in the background...")
+        self.pipeline_process = PipelineProcess(self.events)
+    
+    def _poll_events(self):
+        """Collect the run process's events, apply them in one batch and schedule the next poll."""
+        result = self.pipeline_process.poll() if self.pipeline_process is not None else None
+        self._apply_events(self.events.drain(EVENT_BATCH_SIZE))
+        if result is not None:
+            self.pipeline_process = None
+            if self.is_running:
+                self._run_finished(result)
+            # A process that ended before a run (failed prefetch) is replaced when Run is clicked
+        self.root.after(EVENT_POLL_MS, self._poll_events)
+    
+    def _apply_events(self, events):
+        """Apply a batch of events: one log insert, then the latest progress and status."""
+        log_lines = []
+        for event in events:
+            if event['kind'] == LOG:
+                log_lines.append(event['message'])
+            elif event['kind'] == PROGRESS:
+                self.progress_value.set(event['percent'])
+                self.progress_var.set(f"Running K-Factor optimization... {event['percent']:.0f}%")
+            elif event['kind'] == STEP_START:
+                self.status_var.set(f"Processing: {event['step'].replace('_', ' ')}")
+            elif event['kind'] == STATUS and not self.is_running:
+                # Prefetch messages do not replace the status of a run
+                self.status_var.set(event['message'])
+        if log_lines:
+            self.log_message("\n".join(log_lines))
+    
     def log_message(self, message):
-        """Add a message to the log display."""
+        """Add a message to the log display (main thread only)."""
         self.log_text.configure(state='normal')
         self.log_text.insert(tk.END, f"{message}\n")
+        # Keep the widget small under heavy logging
+        line_count = int(self.log_text.index('end-1c').split('.')[0])
+        if line_count > LOG_MAX_LINES:
+            self.log_text.delete('1.0', f"{line_count - LOG_MAX_LINES}.0")
         self.log_text.see(tk.END)
         self.log_text.configure(state='disabled')
-        self.root.update_idletasks()
     
     def run_optimization(self):
-        """Run the K-Factor optimization in a separate thread."""
+        """Run the K-Factor optimization in a child process."""
         if self.is_running:
             return
         
@@ -231,63 +294,79 @@ class FoxFuelGUI:
             messagebox.showerror("Error", "Please auto-detect files first or ensure CSV files are in data/inputs/ folder.")
             return
         
-        # Start optimization in separate thread
-        self.is_running = True
-        self.run_button.configure(state='disabled')
-        self.progress_bar.start()
-        self.progress_var.set("Running K-Factor optimization...")
-        self.status_var.set("Processing...")
-        
         # Clear log
         self.log_text.configure(state='normal')
         self.log_text.delete(1.0, tk.END)
         self.log_text.configure(state='disabled')
         
-        # Start thread
-        thread = threading.Thread(target=self._run_optimization_thread)
-        thread.daemon = True
-        thread.start()
-    
-    def _run_optimization_thread(self):
-        """Run optimization in background thread."""
+        self.log_message("Starting FoxFuel K-Factor Optimization...")
+        self.log_message("=" * 50)
         try:
-            self.log_message("Starting FoxFuel K-Factor Optimization...")
+            # The process started at detection has usually loaded the inputs already
+            self.start_prefetch()
+            self.pipeline_process.run(profile=self.profile_var.get())
+        except Exception as e:
+            self.pipeline_process = None
+            self.log_message(f"✗ Error: {str(e)}")
+            self._optimization_error(str(e))
+            return
+        
+        self.is_running = True
+        self.run_button.configure(state='disabled')
+        self.cancel_button.configure(state='normal')
+        self.progress_value.set(0)
+        self.progress_var.set("Running K-Factor optimization...")
+        self.status_var.set("Processing...")
+    
+    def cancel_optimization(self):
+        """Ask the running optimization to stop."""
+        if not self.is_running or self.pipeline_process is None:
+            return
+        
+        self.pipeline_process.cancel()
+        self.cancel_button.configure(state='disabled')
+        self.progress_var.set("Cancelling after the current step...")
+        self.log_message("Cancelling...")
+    
+    def _run_finished(self, result):
+        """Report a finished run and start loading inputs for the next one."""
+        if result['status'] == 'success':
             self.log_message("=" * 50)
+            self.log_message("✓ Optimization completed successfully!")
             
-            # Create and run the pipeline
-            pipeline = KFactorPipeline()
-            result = pipeline.run_pipeline()
+            # Set result paths
+            self.csv_file_path = Path(result['files']['apply_k_this_week'])
+            self.excel_file_path = Path(result['files']['k_review_queue'])
             
-            if result['status'] == 'success':
-                self.log_message("=" * 50)
-                self.log_message("✓ Optimization completed successfully!")
-                
-                # Set result paths
-                self.csv_file_path = Path(result['files']['apply_k_this_week'])
-                self.excel_file_path = Path(result['files']['k_review_queue'])
-                
-                # Log summary statistics
-                stats = result['statistics']
-                self.log_message(f"Total customers processed: {stats['total_customers']}")
-                self.log_message(f"Valid intervals found: {stats['valid_intervals']}")
-                self.log_message(f"Customers ready for auto-apply: {stats['auto_apply_customers']}")
-                
-                # Update UI
-                self.root.after(0, self._optimization_success)
-            else:
-                self.log_message("=" * 50)
-                self.log_message(f"✗ Optimization failed: {result['error']}")
-                self.root.after(0, self._optimization_failed)
-                
-        except Exception as e:
-            self.log_message(f"✗ Error: {str(e)}")
-            self.root.after(0, self._optimization_error, str(e))
+            # Log summary statistics
+            stats = result['statistics']
+            self.log_message(f"Total customers processed: {stats['total_customers']}")
+            self.log_message(f"Valid intervals found: {stats['valid_intervals']}")
+            self.log_message(f"Customers ready for auto-apply: {stats['auto_apply_customers']}")
+            if 'profile_file' in result:
+                self.log_message(f"Profile saved: {result['profile_file']}")
+                for row in result['top_functions'][:10]:
+                    self.log_message(f"  {row['cumulative_seconds']:.2f}s  {row['function']}")
+            
+            self._optimization_success()
+        elif result['status'] == 'cancelled':
+            self.log_message("=" * 50)
+            self.log_message(f"✗ Optimization cancelled: {result['error']}")
+            self._optimization_cancelled(result['error'])
+        else:
+            self.log_message("=" * 50)
+            self.log_message(f"✗ Optimization failed: {result['error']}")
+            self._optimization_failed()
+        
+        # The next run starts with warm data again
+        self.start_prefetch()
     
     def _optimization_success(self):
         """Handle successful optimization."""
         self.is_running = False
         self.run_button.configure(state='normal')
-        self.progress_bar.stop()
+        self.cancel_button.configure(state='disabled')
+        self.progress_value.set(100)
         self.progress_var.set("Optimization completed successfully!")
         self.status_var.set("Completed successfully")
         
@@ -306,11 +385,21 @@ class FoxFuelGUI:
                            "K-Factor optimization completed successfully!\n\n"
                            "Click the buttons below to open the result files.")
     
+    def _optimization_cancelled(self, message):
+        """Handle a cancelled or timed out optimization."""
+        self.is_running = False
+        self.run_button.configure(state='normal')
+        self.cancel_button.configure(state='disabled')
+        self.progress_var.set("Optimization cancelled")
+        self.status_var.set("Cancelled")
+        
+        messagebox.showwarning("Cancelled", f"K-Factor optimization was stopped:\n\n{message}")
+    
     def _optimization_failed(self):
         """Handle failed optimization."""
         self.is_running = False
         self.run_button.configure(state='normal')
-        self.progress_bar.stop()
+        self.cancel_button.configure(state='disabled')
         self.progress_var.set("Optimization failed")
         self.status_var.set("Failed")
         
@@ -320,7 +409,7 @@ class FoxFuelGUI:
         """Handle optimization error."""
         self.is_running = False
         self.run_button.configure(state='normal')
-        self.progress_bar.stop()
+        self.cancel_button.configure(state='disabled')
         self.progress_var.set("Error occurred")
         self.status_var.set("Error")
         
@@ -358,6 +447,8 @@ class FoxFuelGUI:
 
 def main():
     """Main function to run the GUI."""
+    # Lets run processes start from the built executable
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = FoxFuelGUI(root)
     
@@ -371,6 +462,10 @@ def main():
     root.geometry(f"+{x}+{y}")
     
     root.mainloop()
+    
+    # The run process is not a daemon, so stop it before exiting
+    if app.pipeline_process is not None:
+        app.pipeline_process.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,3 +5,19 @@ A Python-based system for optimizing heating oil delivery K-factors.
 
 __version__ = "1.0.0"
 __author__ = "Fox Fuel, Inc."
+
+# Public classes, imported on first access so `import src` stays light
+_LAZY_EXPORTS = {
+    'KFactorPipeline': 'pipeline',
+    'DataLoader': 'data_loader',
+    'CustomerQuery': 'customer_query',
+    'find_latest_files': 'input_files',
+    'validate_config': 'input_files'
+}
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+        module = importlib.import_module(f".{_LAZY_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
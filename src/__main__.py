@@ -0,0 +1,13 @@
+"""
+Entry point for python -m src.
+"""
+
+import multiprocessing
+import sys
+
+from .cli import main
+
+if __name__ == "__main__":
+    # Required for worker processes in frozen executables
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,381 @@
+"""
+Command-line interface for the FoxFuel K-Factor Optimizer.
+Non-interactive entry point for scheduled and server runs: python -m src check|run|analyze|sweep|bench|diff.
+
+Stage modules, pandas and openpyxl are imported inside the subcommand that
+needs them, so --help and argument errors return immediately.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Exit codes
+EXIT_OK = 0
+EXIT_FAILED = 1  # Pipeline or command error
+EXIT_USAGE = 2  # Invalid arguments (argparse)
+EXIT_MISSING_INPUT = 3  # Input files or directories not found
+EXIT_NOT_FOUND = 4  # analyze: customer not in CustomerFuel
+EXIT_DIFFERENT = 5  # diff: outputs differ
+EXIT_INTERRUPTED = 130
+
+def _print_json(data):
+    """Write a JSON document to stdout."""
+    json.dump(data, sys.stdout, indent=2, default=lambda value: value.item() if hasattr(value, 'item') else str(value))
+    sys.stdout.write("\n")
+
+def _records(df) -> list:
+    """DataFrame rows as JSON-ready dicts."""
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+def cmd_check(args) -> int:
+    """List the detected input files and validate config.py without loading any data."""
+    from .input_files import find_latest_files, validate_config, INPUT_FILE_LABELS
+
+    files = find_latest_files(args.input_dir)
+    problems = validate_config()
+    missing = [INPUT_FILE_LABELS[file_type] for file_type in INPUT_FILE_LABELS if file_type not in files]
+    report = {
+        'input_dir': args.input_dir,
+        'files': {file_type: str(path) for file_type, path in files.items()},
+        'missing': missing,
+        'config_problems': problems
+    }
+
+    if args.json:
+        _print_json(report)
+    else:
+        for file_type, label in INPUT_FILE_LABELS.items():
+            print(f"{label + ':':<17}{report['files'].get(file_type, 'not found')}")
+        for problem in problems:
+            print(f"Config: {problem}")
+
+    if missing:
+        return EXIT_MISSING_INPUT
+    return EXIT_FAILED if problems else EXIT_OK
+
+def cmd_run(args) -> int:
+    """Run the full pipeline."""
+    from .pipeline import KFactorPipeline
+
+    pipeline_options = {
+        'input_dir': args.input_dir, 'output_dir': args.output_dir, 'incremental': args.incremental,
+        'streaming': args.stream, 'profile_memory': args.trace_memory, 'profile': args.profile
+    }
+    if args.workers is not None:
+        pipeline_options['workers'] = args.workers
+    pipeline = KFactorPipeline(**pipeline_options)
+    results = pipeline.run_pipeline()
+
+    if results['status'] == 'success' and args.timings is not None:
+        results['timings_file'] = str(pipeline.export_profile(args.timings))
+    if args.json:
+        _print_json(results)
+    elif results['status'] == 'success':
+        print(pipeline.get_pipeline_summary())
+        print(f"Apply_K_ThisWeek.csv: {results['files']['apply_k_this_week']}")
+        print(f"K_Review_Queue.xlsx: {results['files']['k_review_queue']}")
+    else:
+        print(f"Error: {results['error']}", file=sys.stderr)
+
+    if results['status'] == 'success':
+        return EXIT_OK
+    if results['error_type'] == 'FileNotFoundError':
+        return EXIT_MISSING_INPUT
+    return EXIT_FAILED
+
+def cmd_analyze(args) -> int:
+    """Trace the K-factor calculation for single customers."""
+    from .data_loader import DataLoader
+    from .customer_query import CustomerQuery
+
+    data_loader = DataLoader(args.input_dir)
+    try:
+        customer_fuel, delivery_tickets, degree_days = data_loader.load_all_data()
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_MISSING_INPUT
+    query = CustomerQuery(customer_fuel, delivery_tickets, degree_days, data_loader.files)
+
+    report = {}
+    exit_code = EXIT_OK
+    for customer_number in args.customers:
+        if not query.has_customer(customer_number):
+            report[customer_number] = None
+            exit_code = EXIT_NOT_FOUND
+            continue
+        analysis = query.analyze(customer_number)
+        customer_report = {
+            'tickets': len(analysis['tickets']),
+            'intervals': len(analysis['intervals']),
+            'valid_intervals': len(analysis['valid_intervals']),
+            'governed': _records(analysis['governed'])
+        }
+        if args.intervals:
+            customer_report['interval_k_factors'] = _records(analysis['interval_k_factors'])
+        report[customer_number] = customer_report
+
+    if args.json:
+        _print_json(report)
+    else:
+        for customer_number, customer_report in report.items():
+            if customer_report is None:
+                print(f"{customer_number}: not found in CustomerFuel")
+                continue
+            print(f"{customer_number}: {customer_report['tickets']} tickets, "
+                  f"{customer_report['valid_intervals']}/{customer_report['intervals']} valid intervals")
+            for row in customer_report['governed']:
+                print(f"  {row['Final Status']}: K {row['K Factor - Winter']} -> {row['Proposed K Factor']} "
+                      f"({row['Final Variance Percent']:+.2f}%), confidence {row['Confidence']}")
+    return exit_code
+
+def parameter_values(text: str) -> list:
+    """
+    Parse a sweep parameter: comma-separated values or an inclusive start:stop:step range.
+
+    Args:
+        text: e.g. "0.1,0.15,0.2" or "0.05:0.30:0.05"
+
+    Returns:
+        List of floats
+    """
+    try:
+        if ":" in text:
+            start, stop, step = (float(part) for part in text.split(":"))
+            if step <= 0 or stop < start:
+                raise ValueError
+            count = int(round((stop - start) / step)) + 1
+            return [round(start + index * step, 10) for index in range(count)]
+        return [float(part) for part in text.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected values like 0.1,0.2 or start:stop:step, got '{text}'")
+
+def cmd_sweep(args) -> int:
+    """Evaluate governance over a grid of parameter values."""
+    from .pipeline import KFactorPipeline
+    from .governance import GovernanceEngine
+
+    grid = {name: getattr(args, name) for name in
+            ['max_increase', 'max_decrease', 'cap_pct', 'var_threshold_pct', 'confidence_threshold', 'min_intervals']
+            if getattr(args, name) is not None}
+    pipeline = KFactorPipeline(input_dir=args.input_dir)
+    try:
+        variance_data = pipeline.compute_variance_data()
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_MISSING_INPUT
+    results = GovernanceEngine().sweep(variance_data, grid)
+    results = results.sort_values(['auto_apply', 'capped'], ascending=[False, True], kind='stable')
+
+    if args.output:
+        if args.output.suffix.lower() == ".json":
+            args.output.write_text(results.to_json(orient="records", indent=2))
+        else:
+            results.to_csv(args.output, index=False)
+    if args.json:
+        _print_json(_records(results.head(args.limit)))
+    else:
+        print(f"{len(results)} combinations over {len(variance_data)} customers")
+        print(results.head(args.limit).to_string(index=False))
+    return EXIT_OK
+
+def cmd_bench(args) -> int:
+    """Run the synthetic-data benchmark harness."""
+    try:
+        from benchmarks import pipeline_bench
+    except ImportError:
+        print("Error: benchmarks package not found; run from the repository root", file=sys.stderr)
+        return EXIT_MISSING_INPUT
+    pipeline_bench.main(args.bench_args)
+    return EXIT_OK
+
+def _read_output(path: Path):
+    """
+    Read Apply_K_ThisWeek.csv or the review sheet of K_Review_Queue.xlsx, keyed by customer.
+
+    Customers with several tanks have several rows; later rows are keyed
+    as "<customer>#2", "<customer>#3" in file order.
+    """
+    import pandas as pd
+
+    if path.suffix.lower() == ".xlsx":
+        df = pd.read_excel(path, sheet_name="K Review Queue", dtype={'Customer Number': str})
+    else:
+        df = pd.read_csv(path, dtype={'Customer Number': str})
+    occurrence = df.groupby('Customer Number', sort=False).cumcount()
+    key = df['Customer Number'].where(occurrence == 0, df['Customer Number'] + "#" + (occurrence + 1).astype(str))
+    return df.drop(columns='Customer Number').set_index(key.rename('Customer Number'))
+
+def diff_outputs(old_file: Path, new_file: Path) -> dict:
+    """
+    Compare two runs' output files customer by customer.
+
+    Args:
+        old_file: Apply_K_ThisWeek.csv or K_Review_Queue.xlsx of the earlier run
+        new_file: Same file of the later run
+
+    Returns:
+        Dictionary with added and removed customer numbers and changed values
+    """
+    old = _read_output(old_file)
+    new = _read_output(new_file)
+
+    common = old.index.intersection(new.index, sort=False)
+    columns = [column for column in old.columns if column in new.columns]
+    changed = []
+    for column in columns:
+        old_values = old.loc[common, column]
+        new_values = new.loc[common, column]
+        differs = (old_values != new_values) & ~(old_values.isna() & new_values.isna())
+        for customer_number in common[differs.to_numpy()]:
+            changed.append({
+                'customer': customer_number, 'column': column,
+                'old': old_values[customer_number], 'new': new_values[customer_number]
+            })
+
+    return {
+        'old': str(old_file),
+        'new': str(new_file),
+        'added': new.index.difference(old.index, sort=False).tolist(),
+        'removed': old.index.difference(new.index, sort=False).tolist(),
+        'changed': changed
+    }
+
+def cmd_diff(args) -> int:
+    """Compare the outputs of two runs."""
+    old_path, new_path = Path(args.old), Path(args.new)
+    missing = [str(path) for path in (old_path, new_path) if not path.exists()]
+    if missing:
+        print(f"Error: not found: {', '.join(missing)}", file=sys.stderr)
+        return EXIT_MISSING_INPUT
+    if old_path.is_dir() != new_path.is_dir():
+        print("Error: compare two files or two output directories", file=sys.stderr)
+        return EXIT_FAILED
+    if old_path.is_dir():
+        names = ["Apply_K_ThisWeek.csv", "K_Review_Queue.xlsx"]
+        pairs = [(old_path / name, new_path / name) for name in names]
+    else:
+        pairs = [(old_path, new_path)]
+
+    missing = [str(path) for pair in pairs for path in pair if not path.exists()]
+    if missing:
+        print(f"Error: not found: {', '.join(missing)}", file=sys.stderr)
+        return EXIT_MISSING_INPUT
+
+    reports = [diff_outputs(old_file, new_file) for old_file, new_file in pairs]
+    different = any(report['added'] or report['removed'] or report['changed'] for report in reports)
+
+    if args.json:
+        _print_json(reports)
+    else:
+        for report in reports:
+            print(f"{report['old']} -> {report['new']}: {len(report['added'])} added, "
+                  f"{len(report['removed'])} removed, {len(report['changed'])} changed values")
+            for change in report['changed'][:args.limit]:
+                print(f"  {change['customer']} {change['column']}: {change['old']} -> {change['new']}")
+    return EXIT_DIFFERENT if different else EXIT_OK
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser with all subcommands."""
+    from . import __version__
+    from .config import INPUT_DIR, OUTPUT_DIR
+
+    parser = argparse.ArgumentParser(
+        prog="kfactor", description="FoxFuel K-Factor Optimizer",
+        epilog=f"Exit codes: {EXIT_OK} ok, {EXIT_FAILED} failed, {EXIT_USAGE} usage, "
+               f"{EXIT_MISSING_INPUT} missing input, {EXIT_NOT_FOUND} customer not found, "
+               f"{EXIT_DIFFERENT} outputs differ"
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("--log-level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    parser.add_argument("--log-file", default=None, help="Also write the log to this file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    check = subparsers.add_parser("check", help="List input files and validate the configuration")
+    check.add_argument("--input-dir", default=INPUT_DIR)
+    check.add_argument("--json", action="store_true", help="Print the result as JSON")
+    # Nothing is logged, so loguru is not loaded either
+    check.set_defaults(handler=cmd_check, needs_logger=False)
+
+    run = subparsers.add_parser("run", help="Run the full pipeline")
+    run.add_argument("--input-dir", default=INPUT_DIR)
+    run.add_argument("--output-dir", default=OUTPUT_DIR)
+    run.add_argument("--incremental", action="store_true",
+                     help="Only rebuild intervals for customers whose tickets changed since the last run")
+    run.add_argument("--workers", type=int, default=None, metavar="N",
+                     help="Worker processes for interval and K-factor steps (default: PIPELINE_WORKERS)")
+    run.add_argument("--stream", action="store_true",
+                     help="Process delivery tickets in chunks for files larger than memory")
+    run.add_argument("--timings", type=Path, default=None, metavar="FILE",
+                     help="Write the per-step profile to a .json or .csv file")
+    run.add_argument("--trace-memory", action="store_true",
+                     help="Also record the traced allocation peak of each step (slower)")
+    run.add_argument("--profile", action="store_true",
+                     help="Run under cProfile and save a .prof file with the outputs")
+    run.add_argument("--json", action="store_true", help="Print the result as JSON")
+    run.set_defaults(handler=cmd_run)
+
+    analyze = subparsers.add_parser("analyze", help="Trace the K-factor calculation for customers")
+    analyze.add_argument("customers", nargs="+", metavar="CUSTOMER")
+    analyze.add_argument("--input-dir", default=INPUT_DIR)
+    analyze.add_argument("--intervals", action="store_true", help="Include interval K-factors")
+    analyze.add_argument("--json", action="store_true", help="Print the result as JSON")
+    analyze.set_defaults(handler=cmd_analyze)
+
+    sweep = subparsers.add_parser("sweep", help="Compare governance outcomes over a grid of settings")
+    sweep.add_argument("--input-dir", default=INPUT_DIR)
+    for option, setting in [("--max-increase", "MAX_INCREASE"), ("--max-decrease", "MAX_DECREASE"),
+                            ("--cap-pct", "CAP_PCT"), ("--var-threshold-pct", "VAR_THRESHOLD_PCT"),
+                            ("--confidence-threshold", "CONFIDENCE_THRESHOLD"), ("--min-intervals", "MIN_INTERVALS")]:
+        sweep.add_argument(option, type=parameter_values, default=None, metavar="VALUES",
+                           help=f"Values to try for {setting} (default: config value)")
+    sweep.add_argument("--output", type=Path, default=None, metavar="FILE",
+                       help="Write every combination to a .csv or .json file")
+    sweep.add_argument("--limit", type=int, default=20, help="Combinations to print, most auto-applied first")
+    sweep.add_argument("--json", action="store_true", help="Print the result as JSON")
+    sweep.set_defaults(handler=cmd_sweep)
+
+    # Options after 'bench' (including --help) are passed on to benchmarks.pipeline_bench
+    bench = subparsers.add_parser("bench", help="Benchmark the pipeline on synthetic data", add_help=False)
+    bench.set_defaults(handler=cmd_bench)
+
+    diff = subparsers.add_parser("diff", help="Compare the outputs of two runs")
+    diff.add_argument("old", help="Earlier output file or output directory")
+    diff.add_argument("new", help="Later output file or output directory")
+    diff.add_argument("--limit", type=int, default=50, help="Changed values to print")
+    diff.add_argument("--json", action="store_true", help="Print the result as JSON")
+    diff.set_defaults(handler=cmd_diff)
+
+    return parser
+
+def main(argv=None) -> int:
+    """
+    Parse arguments and run a subcommand.
+
+    Args:
+        argv: Arguments without the program name (default: sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    parser = build_parser()
+    args, extra_args = parser.parse_known_args(argv)
+    if args.command == "bench":
+        args.bench_args = extra_args
+    elif extra_args:
+        parser.error(f"unrecognized arguments: {' '.join(extra_args)}")
+
+    if getattr(args, 'needs_logger', True):
+        from .logger import setup_logger
+        # Logs go to stderr so --json output on stdout stays parseable
+        setup_logger(args.log_level, args.log_file, stream=sys.stderr, colorize=None)
+
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        print("Interrupted", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_FAILED
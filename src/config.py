@@ -18,7 +18,25 @@ SUMMER_MULTIPLIER = 1.2  # Seasonal adjustment factor (summer heating reduction)
 INPUT_DIR = "data/inputs"
 OUTPUT_DIR = "data/outputs"
 CSV_ENCODING = "utf-8"
-# DATE_FORMAT removed - using pandas auto-detection for Ignite formats
+
+# Input Cache (validated frames stored by file fingerprint)
+CACHE_DIR = "data/cache"
+INPUT_CACHE_ENABLED = True
+INPUT_CACHE_MAX_AGE_DAYS = 30  # Entries unused for this long are evicted
+INCREMENTAL_STATE_DIR = "data/cache/incremental"  # Per-customer interval state for incremental runs
+POPULATION_STATS_FILE = "data/cache/population_stats.json"  # Confidence maxima from the last full run
+
+# Stage Cache (intermediates of the serial pipeline stored by content key)
+STAGE_CACHE_ENABLED = True
+STAGE_CACHE_DIR = "data/cache/stages"
+STAGE_CACHE_KEEP = 3  # Entries kept per stage, so a few alternative settings stay cached
+
+# Ignite date formats, tried in order; the first that fits a sample is used for the whole column
+IGNITE_DATE_FORMATS = [
+    "%m/%d/%y %I:%M %p", "%m/%d/%y", "%m/%d/%Y %I:%M %p", "%m/%d/%Y",
+    "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"
+]
+DATE_FORMAT_SAMPLE_SIZE = 200  # Distinct values sampled to detect the date format
 
 # CSV File Patterns
 CUSTOMER_FUEL_PATTERN = "03_*.csv"
@@ -36,10 +54,41 @@ DELIVERY_TICKETS_COLUMNS = [
     "Quantity", "% Full", "PIDCustomerFuel1"
 ]
 
+# Explicit read dtypes for the required DeliveryTickets columns
+DELIVERY_TICKETS_DTYPES = {
+    "Customer Number": "category", "Transaction Date": "str", "Transaction Type": "category",
+    "Quantity": "float64", "% Full": "category", "PIDCustomerFuel1": "float64"
+}
+
 DEGREE_DAY_COLUMNS = [
     "DDay Area", "DDay Date", "Heat Only DDays"
 ]
 
+# Degree Day Areas
+DEFAULT_DDAY_AREA = "Default"  # DDay Area for zones without their own when DegreeDayValues has several areas (None = no fallback)
+ZONE_DDAY_AREA_MAP = {}  # Zone - Fuel -> DDay Area, e.g. {"M38C4": "North"}
+
+# Parallel Execution
+PIPELINE_WORKERS = 1  # Worker processes for interval and K-factor steps (1 = serial)
+
+# Streaming Execution (ticket files larger than memory)
+STREAM_MEMORY_BUDGET_MB = 512  # Target peak memory for ticket processing
+STREAM_CHUNK_ROWS = 100_000  # Rows read per CSV chunk
+STREAM_SPILL_DIR = None  # Directory for spilled ticket runs (None = system temp)
+
+# Compute Kernels
+KERNEL_BACKEND = "auto"  # "auto" (Numba when installed), "numba" or "numpy"
+
+# GUI Runs (the pipeline runs in a child process)
+GUI_RUN_TIMEOUT_SECONDS = 3600  # Runs taking longer are cancelled (0 = no limit)
+GUI_CANCEL_GRACE_SECONDS = 10  # Time a cancelled run gets to stop at a checkpoint before it is terminated
+
+# Governance Sweeps
+SWEEP_CHUNK_CELLS = 20_000_000  # Cap combinations x customers evaluated per block (bounds memory)
+
+# Profiling
+PROFILE_TOP_FUNCTIONS = 25  # Functions listed after a --profile run
+
 # Validation Rules
 MIN_USABLE_SIZE = 0
 MIN_K_FACTOR = 0
@@ -0,0 +1,60 @@
+"""
+Customer key module for the FoxFuel K-Factor Optimizer.
+Maps customer numbers to dense int32 codes so the pipeline stages join, group
+and sort on integers instead of strings.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Column holding the int32 code of each row's customer
+CUSTOMER_KEY = 'Customer Key'
+
+# Code of customer numbers that are not in the dictionary
+MISSING_KEY = -1
+
+class CustomerKeys:
+    """Dictionary of customer numbers, sorted so that key order is customer number order."""
+
+    def __init__(self, customer_numbers):
+        """
+        Args:
+            customer_numbers: Customer numbers to encode (duplicates allowed)
+        """
+        numbers = pd.Index(pd.unique(pd.Series(customer_numbers).astype(str)))
+        self.numbers = numbers.sort_values()
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def encode(self, customer_numbers: pd.Series) -> np.ndarray:
+        """
+        Codes of customer numbers.
+
+        Categorical columns (delivery tickets) are encoded once per category.
+
+        Args:
+            customer_numbers: Series of customer numbers
+
+        Returns:
+            int32 array of keys, MISSING_KEY for numbers not in the dictionary
+        """
+        if isinstance(customer_numbers.dtype, pd.CategoricalDtype):
+            category_keys = self.numbers.get_indexer(customer_numbers.cat.categories.astype(str))
+            codes = customer_numbers.cat.codes.to_numpy()
+            keys = np.where(codes >= 0, category_keys[codes] if len(category_keys) else MISSING_KEY, MISSING_KEY)
+        else:
+            keys = self.numbers.get_indexer(customer_numbers.astype(str))
+        return keys.astype(np.int32)
+
+    def decode(self, keys) -> np.ndarray:
+        """
+        Customer numbers of keys.
+
+        Args:
+            keys: Array of keys from encode (no MISSING_KEY)
+
+        Returns:
+            Array of customer number strings
+        """
+        return self.numbers.take(np.asarray(keys, dtype=np.int64)).to_numpy()
@@ -0,0 +1,187 @@
+"""
+Customer query module for the FoxFuel K-Factor Optimizer.
+Traces the interval, K-factor and governance steps for a single customer.
+"""
+
+import pandas as pd
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import *
+from .degree_days import DegreeDayIndex
+from .input_cache import file_fingerprint
+from .interval_builder import IntervalBuilder
+from .kfactor_calculator import KFactorCalculator
+from .governance import GovernanceEngine
+from .logger import get_logger
+
+logger = get_logger()
+
+def save_population_stats(population_maxima: dict, input_files: Dict[str, Path],
+                          stats_file: str = POPULATION_STATS_FILE):
+    """
+    Save the confidence maxima of a full run together with the inputs it used.
+
+    Args:
+        population_maxima: Interval count and gallon maxima from calculate_variance
+        input_files: Dictionary mapping file type to the input file used
+        stats_file: Path of the stats file
+    """
+    stats = {
+        'timestamp': datetime.now().isoformat(),
+        'max_intervals': int(population_maxima['max_intervals']),
+        'max_gallons': float(population_maxima['max_gallons']),
+        'inputs': {file_type: file_fingerprint(path) for file_type, path in input_files.items()}
+    }
+    try:
+        stats_path = Path(stats_file)
+        stats_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = stats_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(stats, indent=2))
+        temp_path.replace(stats_path)
+    except Exception as e:
+        logger.warning(f"Could not save population stats: {e}")
+
+def load_population_stats(input_files: Dict[str, Path],
+                          stats_file: str = POPULATION_STATS_FILE) -> Optional[dict]:
+    """
+    Load the confidence maxima of the last full run if it used the same inputs.
+
+    Args:
+        input_files: Dictionary mapping file type to the current input file
+        stats_file: Path of the stats file
+
+    Returns:
+        Dictionary with max_intervals and max_gallons, or None if missing or stale
+    """
+    stats_path = Path(stats_file)
+    if not stats_path.exists():
+        return None
+    try:
+        stats = json.loads(stats_path.read_text())
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable population stats: {e}")
+        return None
+
+    current = {file_type: file_fingerprint(path) for file_type, path in input_files.items()}
+    if stats.get('inputs') != current:
+        logger.info("Population stats are from different input files")
+        return None
+    return {'max_intervals': stats['max_intervals'], 'max_gallons': stats['max_gallons']}
+
+class CustomerQuery:
+    """Indexed per-customer access to the interval, K-factor and governance steps."""
+
+    def __init__(self, customer_fuel: pd.DataFrame, delivery_tickets: pd.DataFrame,
+                 degree_days: pd.DataFrame, input_files: Dict[str, Path] = None):
+        self.customer_fuel = customer_fuel
+        self.delivery_tickets = delivery_tickets
+        self.degree_days = degree_days
+        self.input_files = input_files or {}
+        self.degree_day_index = DegreeDayIndex(degree_days)
+        self._population_maxima = None
+
+        # Row positions of every customer, in file order
+        self.fuel_rows = self._row_offsets(customer_fuel)
+        self.ticket_rows = self._row_offsets(delivery_tickets)
+        logger.info(f"Indexed {len(self.fuel_rows)} customers and {len(delivery_tickets)} delivery tickets")
+
+    @staticmethod
+    def _row_offsets(df: pd.DataFrame) -> dict:
+        """Map each customer number to the positions of its rows."""
+        customers = df['Customer Number'].astype(str)
+        return customers.groupby(customers.to_numpy(), sort=False).indices
+
+    def has_customer(self, customer_number: str) -> bool:
+        """Check whether a customer has a valid CustomerFuel record."""
+        return customer_number in self.fuel_rows
+
+    def customer_fuel_rows(self, customer_number: str) -> pd.DataFrame:
+        """CustomerFuel rows of one customer."""
+        return self.customer_fuel.iloc[self.fuel_rows.get(customer_number, [])]
+
+    def customer_tickets(self, customer_number: str) -> pd.DataFrame:
+        """Delivery tickets of one customer."""
+        return self.delivery_tickets.iloc[self.ticket_rows.get(customer_number, [])]
+
+    def population_maxima(self) -> dict:
+        """
+        Confidence maxima of the whole population.
+
+        Taken from the last full pipeline run on the same inputs; otherwise all
+        customers are built once and the result is saved for later sessions.
+
+        Returns:
+            Dictionary with max_intervals and max_gallons
+        """
+        if self._population_maxima is None:
+            maxima = load_population_stats(self.input_files) if self.input_files else None
+            if maxima is None:
+                logger.info("No population stats for these inputs, building all customers once")
+                maxima = self._compute_population_maxima()
+                if self.input_files:
+                    save_population_stats(maxima, self.input_files)
+            self._population_maxima = maxima
+        return self._population_maxima
+
+    def _compute_population_maxima(self) -> dict:
+        """Build intervals and K-factors for every customer to get the confidence maxima."""
+        interval_builder = IntervalBuilder()
+        kfactor_calculator = KFactorCalculator()
+        intervals = interval_builder.build_intervals(self.customer_fuel, self.delivery_tickets, self.degree_day_index)
+        intervals = interval_builder.filter_valid_intervals(intervals)
+        interval_k_factors = kfactor_calculator.calculate_interval_k_factors(intervals)
+        customer_k_factors = kfactor_calculator.calculate_weighted_k_by_customer(interval_k_factors)
+        if len(customer_k_factors) == 0:
+            return {'max_intervals': 0, 'max_gallons': 0.0}
+        kfactor_calculator.calculate_variance(self.customer_fuel, customer_k_factors)
+        return kfactor_calculator.population_maxima
+
+    def analyze(self, customer_number: str) -> dict:
+        """
+        Run the interval, K-factor, variance and governance steps for one customer.
+
+        Only the customer's own rows are processed; confidence is scaled by the
+        population maxima, so results match the customer's row in a full run.
+
+        Args:
+            customer_number: Customer number to analyze
+
+        Returns:
+            Dictionary with the customer's intervals, valid intervals, interval
+            K-factors, weighted K row, variance row and governed row
+        """
+        customer_fuel = self.customer_fuel_rows(customer_number)
+        tickets = self.customer_tickets(customer_number)
+
+        interval_builder = IntervalBuilder()
+        kfactor_calculator = KFactorCalculator()
+
+        intervals = interval_builder.build_intervals(customer_fuel, tickets, self.degree_day_index)
+        valid_intervals = interval_builder.filter_valid_intervals(intervals)
+
+        interval_k_factors = pd.DataFrame()
+        customer_k_factors = pd.DataFrame()
+        variance = pd.DataFrame()
+        governed = pd.DataFrame()
+        if len(valid_intervals) > 0:
+            interval_k_factors = kfactor_calculator.calculate_interval_k_factors(valid_intervals)
+            customer_k_factors = kfactor_calculator.calculate_weighted_k_by_customer(interval_k_factors)
+        if len(customer_k_factors) > 0:
+            variance = kfactor_calculator.calculate_variance(
+                customer_fuel, customer_k_factors, self.population_maxima()
+            )
+            governed = GovernanceEngine().apply_governance(variance)
+
+        return {
+            'customer_fuel': customer_fuel,
+            'tickets': tickets,
+            'intervals': intervals,
+            'valid_intervals': valid_intervals,
+            'interval_k_factors': interval_k_factors,
+            'customer_k_factors': customer_k_factors,
+            'variance': variance,
+            'governed': governed
+        }
@@ -4,24 +4,97 @@ Handles loading and validating the three CSV input files.
 """
 
 import pandas as pd
+import numpy as np
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Tuple, Dict, List
-import glob
+from typing import Tuple, Dict, List, Callable, Optional
+from functools import lru_cache
 
 from .config import *
+from .input_files import find_latest_files, INPUT_FILE_LABELS, INPUT_FILE_PATTERNS
+from .input_cache import InputCache
+from .customer_keys import CustomerKeys, CUSTOMER_KEY
 from .logger import get_logger
 
 logger = get_logger()
 
+@lru_cache(maxsize=100_000)
+def _parse_date_string(value: str):
+    """Parse a single date string of unknown format, caching the result."""
+    return pd.to_datetime(value, errors='coerce')
+
+def detect_date_format(values: pd.Series):
+    """
+    Detect which Ignite date format fits a column.
+    
+    Args:
+        values: Series of date strings
+        
+    Returns:
+        The format in IGNITE_DATE_FORMATS that parses the most sampled values, or None
+    """
+    sample = pd.Series(values.dropna().unique()[:DATE_FORMAT_SAMPLE_SIZE], dtype=object)
+    
+    best_format, best_count = None, 0
+    for date_format in IGNITE_DATE_FORMATS:
+        parsed_count = pd.to_datetime(sample, format=date_format, errors='coerce').notna().sum()
+        if parsed_count > best_count:
+            best_format, best_count = date_format, parsed_count
+        if best_count == len(sample):
+            break
+    return best_format
+
+def parse_ignite_dates(values: pd.Series) -> pd.Series:
+    """
+    Parse Ignite date strings such as "1/31/25 1:35 PM" into datetimes.
+    
+    Many tickets share a timestamp, so only the distinct strings are parsed.
+    The format is detected once and applied to all of them; strings that do
+    not fit (mixed exports) are parsed individually through a cache keyed on
+    the string. Unparseable values become NaT.
+    
+    Args:
+        values: Series of date strings
+        
+    Returns:
+        Series of datetimes
+    """
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    
+    date_format = detect_date_format(uniques)
+    if date_format is None:
+        parsed = pd.to_datetime(pd.Series(pd.NaT, index=uniques.index))
+    else:
+        parsed = pd.to_datetime(uniques, format=date_format, errors='coerce')
+    
+    # Fall back to per-string parsing for anything the detected format missed
+    unparsed = parsed.isna()
+    if unparsed.any():
+        if date_format is not None:
+            logger.debug(f"{unparsed.sum()} distinct dates did not match {date_format}, parsing individually")
+        parsed[unparsed] = pd.to_datetime(uniques[unparsed].astype(str).map(_parse_date_string), errors='coerce')
+    
+    # Missing values have code -1 and map to NaT
+    parsed_values = np.append(parsed.to_numpy(), np.array(['NaT'], dtype=parsed.dtype))
+    return pd.Series(parsed_values[codes], index=values.index)
+
 class DataLoader:
     """Handles loading and validation of input CSV files."""
     
-    def __init__(self, input_dir: str = INPUT_DIR):
+    def __init__(self, input_dir: str = INPUT_DIR, use_cache: bool = INPUT_CACHE_ENABLED,
+                 cache_dir: str = CACHE_DIR):
         self.input_dir = Path(input_dir)
+        self.cache = InputCache(cache_dir) if use_cache else None
         self.customer_fuel = None
         self.delivery_tickets = None
         self.degree_days = None
+        self.customer_keys = None
+        self.load_stats = {}
+        self.files = {}
+        # Validated frames by file type, with the file signature they were loaded from
+        self.preloaded = {}
         
     def find_latest_files(self) -> Dict[str, Path]:
         """
@@ -30,26 +103,9 @@ class DataLoader:
         Returns:
             Dictionary mapping file type to Path object
         """
-        files = {}
-        
-        # Find latest CustomerFuel file
-        customer_files = glob.glob(str(self.input_dir / CUSTOMER_FUEL_PATTERN))
-        if customer_files:
-            files['customer_fuel'] = Path(max(customer_files, key=lambda x: Path(x).stat().st_mtime))
-            logger.info(f"Found CustomerFuel file: {files['customer_fuel'].name}")
-        
-        # Find latest DeliveryTickets file
-        delivery_files = glob.glob(str(self.input_dir / DELIVERY_TICKETS_PATTERN))
-        if delivery_files:
-            files['delivery_tickets'] = Path(max(delivery_files, key=lambda x: Path(x).stat().st_mtime))
-            logger.info(f"Found DeliveryTickets file: {files['delivery_tickets'].name}")
-        
-        # Find latest DegreeDayValues file
-        degree_files = glob.glob(str(self.input_dir / DEGREE_DAY_PATTERN))
-        if degree_files:
-            files['degree_days'] = Path(max(degree_files, key=lambda x: Path(x).stat().st_mtime))
-            logger.info(f"Found DegreeDayValues file: {files['degree_days'].name}")
-        
+        files = find_latest_files(self.input_dir)
+        for file_type, file_path in files.items():
+            logger.info(f"Found {INPUT_FILE_LABELS[file_type]} file: {file_path.name}")
         return files
     
     def load_customer_fuel(self, file_path: Path) -> pd.DataFrame:
@@ -111,48 +167,138 @@ class DataLoader:
         """
         logger.info(f"Loading DeliveryTickets from {file_path.name}")
         
-        # Load CSV, skip first column (Column A)
-        df = pd.read_csv(file_path, encoding=CSV_ENCODING, usecols=lambda x: x != 'Unnamed: 0')
+        # Load only the required columns with explicit types (skips Column A and free text)
+        start_time = time.perf_counter()
+        df = self._read_typed_csv(file_path, DELIVERY_TICKETS_DTYPES)
+        self._log_read_throughput('delivery_tickets', file_path, len(df), time.perf_counter() - start_time)
+        
+        df = self.clean_delivery_tickets(df)
+        
+        logger.info(f"Loaded {len(df)} valid delivery records")
+        return df
+    
+    def iter_delivery_ticket_chunks(self, file_path: Path, chunk_rows: int):
+        """
+        Read and validate a DeliveryTickets CSV file in chunks.
+        
+        Numeric columns are read as text and coerced per chunk, since a typed
+        read cannot be retried part way through the file.
         
+        Args:
+            file_path: Path to the DeliveryTickets CSV file
+            chunk_rows: Rows per chunk
+            
+        Yields:
+            Validated DataFrame chunks in file order
+        """
+        logger.info(f"Streaming DeliveryTickets from {file_path.name} in chunks of {chunk_rows:,} rows")
+        
+        text_dtypes = {col: ('str' if dtype.startswith(('int', 'float')) else dtype)
+                       for col, dtype in DELIVERY_TICKETS_DTYPES.items()}
+        reader = pd.read_csv(file_path, encoding=CSV_ENCODING, usecols=lambda x: x in text_dtypes,
+                             dtype=text_dtypes, chunksize=chunk_rows)
+        customer_keys = self._require_customer_keys()
+        for chunk in reader:
+            chunk = self.clean_delivery_tickets(chunk, report_invalid=False)
+            yield chunk.assign(**{CUSTOMER_KEY: customer_keys.encode(chunk['Customer Number'])})
+    
+    def clean_delivery_tickets(self, df: pd.DataFrame, report_invalid: bool = True) -> pd.DataFrame:
+        """
+        Convert types and apply validation rules to raw DeliveryTickets rows.
+        
+        Args:
+            df: Raw DeliveryTickets DataFrame
+            report_invalid: Log counts of invalid values (off for per-chunk cleaning)
+            
+        Returns:
+            Validated DataFrame
+        """
         # Validate required columns
         missing_cols = set(DELIVERY_TICKETS_COLUMNS) - set(df.columns)
         if missing_cols:
             raise ValueError(f"Missing required columns in DeliveryTickets: {missing_cols}")
         
         # Data type conversions
-        df['Customer Number'] = df['Customer Number'].astype(str)
+        if not isinstance(df['Customer Number'].dtype, pd.CategoricalDtype):
+            df['Customer Number'] = df['Customer Number'].astype(str).astype('category')
         # Handle Ignite date format: "12/12/23 3:28 PM" or "1/24/24 2:00 PM"
-        df['Transaction Date'] = pd.to_datetime(df['Transaction Date'], errors='coerce')
+        df['Transaction Date'] = parse_ignite_dates(df['Transaction Date'])
         df['Quantity'] = pd.to_numeric(df['Quantity'], errors='coerce')
-        # Handle Ignite % Full format: "0%" -> convert to numeric
-        df['% Full'] = df['% Full'].str.replace('%', '').astype(float)
+        # Handle Ignite % Full format: "0%" -> convert to numeric once per distinct value
+        df['% Full'] = self._parse_percent(df['% Full'])
         
         # Filter for valid deliveries only
         df = df[df['Transaction Type'] == VALID_TRANSACTION_TYPE]
         
         # Validation rules
-        invalid_quantity = df['Quantity'] <= MIN_QUANTITY
-        if invalid_quantity.any():
-            logger.warning(f"Found {invalid_quantity.sum()} invalid delivery quantities")
-        
-        invalid_percent = (df['% Full'] < MIN_PERCENT_FULL) | (df['% Full'] > MAX_PERCENT_FULL)
-        if invalid_percent.any():
-            logger.warning(f"Found {invalid_percent.sum()} invalid percent full values")
-        
-        invalid_date = df['Transaction Date'].isna()
-        if invalid_date.any():
-            logger.warning(f"Found {invalid_date.sum()} invalid transaction dates")
+        if report_invalid:
+            invalid_quantity = df['Quantity'] <= MIN_QUANTITY
+            if invalid_quantity.any():
+                logger.warning(f"Found {invalid_quantity.sum()} invalid delivery quantities")
+            
+            invalid_percent = (df['% Full'] < MIN_PERCENT_FULL) | (df['% Full'] > MAX_PERCENT_FULL)
+            if invalid_percent.any():
+                logger.warning(f"Found {invalid_percent.sum()} invalid percent full values")
+            
+            invalid_date = df['Transaction Date'].isna()
+            if invalid_date.any():
+                logger.warning(f"Found {invalid_date.sum()} invalid transaction dates")
         
         # Filter valid records
-        df = df[
+        return df[
             (df['Quantity'] > MIN_QUANTITY) &
             (df['% Full'] >= MIN_PERCENT_FULL) &
             (df['% Full'] <= MAX_PERCENT_FULL) &
             (df['Transaction Date'].notna())
         ]
+    
+    def _read_typed_csv(self, file_path: Path, dtypes: Dict[str, str]) -> pd.DataFrame:
+        """
+        Read only the given columns of a CSV file with explicit dtypes.
         
-        logger.info(f"Loaded {len(df)} valid delivery records")
-        return df
+        Falls back to reading the numeric columns as text when a value does not
+        parse, leaving them to the usual coercion and validation.
+        
+        Args:
+            file_path: Path to the CSV file
+            dtypes: Column name to dtype mapping for the columns to keep
+            
+        Returns:
+            DataFrame with the requested columns that exist in the file
+        """
+        read_kwargs = dict(encoding=CSV_ENCODING, usecols=lambda x: x in dtypes)
+        try:
+            return pd.read_csv(file_path, dtype=dtypes, **read_kwargs)
+        except ValueError as e:
+            logger.warning(f"Typed read of {file_path.name} failed ({e}), parsing numeric columns leniently")
+            text_dtypes = {col: ('str' if dtype.startswith(('int', 'float')) else dtype) for col, dtype in dtypes.items()}
+            return pd.read_csv(file_path, dtype=text_dtypes, **read_kwargs)
+    
+    def _parse_percent(self, values: pd.Series) -> pd.Series:
+        """Convert Ignite percentage strings like "85%" to floats, parsing each distinct value once."""
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype('category')
+        
+        category_values = pd.to_numeric(
+            pd.Series(values.cat.categories.astype(str)).str.replace('%', '', regex=False), errors='coerce'
+        ).to_numpy(dtype=float)
+        codes = values.cat.codes.to_numpy()
+        parsed = np.where(codes >= 0, category_values[codes], np.nan) if len(category_values) else np.full(len(codes), np.nan)
+        return pd.Series(parsed, index=values.index)
+    
+    def _log_read_throughput(self, file_type: str, file_path: Path, rows: int, elapsed: float):
+        """Record and log read throughput for an input file."""
+        size_bytes = file_path.stat().st_size
+        elapsed = max(elapsed, 1e-9)
+        self.load_stats[file_type] = {
+            'rows': rows,
+            'bytes': size_bytes,
+            'seconds': elapsed,
+            'rows_per_second': rows / elapsed,
+            'bytes_per_second': size_bytes / elapsed
+        }
+        logger.info(f"Read {rows:,} rows ({size_bytes / 1e6:.1f} MB) in {elapsed:.2f}s: "
+                    f"{rows / elapsed:,.0f} rows/s, {size_bytes / 1e6 / elapsed:.1f} MB/s")
     
     def load_degree_days(self, file_path: Path) -> pd.DataFrame:
         """
@@ -175,8 +321,9 @@ class DataLoader:
             raise ValueError(f"Missing required columns in DegreeDayValues: {missing_cols}")
         
         # Data type conversions
+        df['DDay Area'] = df['DDay Area'].astype(str)
         # Handle Ignite date format: "1/1/22" 
-        df['DDay Date'] = pd.to_datetime(df['DDay Date'], errors='coerce')
+        df['DDay Date'] = parse_ignite_dates(df['DDay Date'])
         df['Heat Only DDays'] = pd.to_numeric(df['Heat Only DDays'], errors='coerce')
         
         # Validation rules
@@ -200,14 +347,18 @@ class DataLoader:
         logger.info(f"Loaded {len(df)} valid degree day records")
         return df
     
-    def load_all_data(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    def load_all_data(self, load_tickets: bool = True) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         """
         Load all three CSV files automatically.
         
+        Args:
+            load_tickets: Load DeliveryTickets into memory (off when it is streamed)
+        
         Returns:
             Tuple of (customer_fuel, delivery_tickets, degree_days) DataFrames
         """
         files = self.find_latest_files()
+        self.files = files
         
         if 'customer_fuel' not in files:
             raise FileNotFoundError(f"No CustomerFuel file found matching pattern {CUSTOMER_FUEL_PATTERN}")
@@ -216,9 +367,107 @@ class DataLoader:
         if 'degree_days' not in files:
             raise FileNotFoundError(f"No DegreeDayValues file found matching pattern {DEGREE_DAY_PATTERN}")
         
-        self.customer_fuel = self.load_customer_fuel(files['customer_fuel'])
-        self.delivery_tickets = self.load_delivery_tickets(files['delivery_tickets'])
-        self.degree_days = self.load_degree_days(files['degree_days'])
+        self.customer_fuel = self._load_file('customer_fuel', files['customer_fuel'], self.load_customer_fuel)
+        if load_tickets:
+            self.delivery_tickets = self._load_file('delivery_tickets', files['delivery_tickets'], self.load_delivery_tickets)
+        self.degree_days = self._load_file('degree_days', files['degree_days'], self.load_degree_days)
         
         logger.info("All data files loaded successfully")
         return self.customer_fuel, self.delivery_tickets, self.degree_days
+    
+    def load_input(self, file_type: str) -> pd.DataFrame:
+        """
+        Load one input file, for callers that do not need all three.
+        
+        Args:
+            file_type: customer_fuel, delivery_tickets or degree_days
+            
+        Returns:
+            Validated DataFrame
+        """
+        if file_type not in self.files:
+            self.files = self.find_latest_files()
+        if file_type not in self.files:
+            raise FileNotFoundError(
+                f"No {INPUT_FILE_LABELS[file_type]} file found matching pattern {INPUT_FILE_PATTERNS[file_type]}"
+            )
+        
+        loaders = {
+            'customer_fuel': self.load_customer_fuel,
+            'delivery_tickets': self.load_delivery_tickets,
+            'degree_days': self.load_degree_days
+        }
+        df = self._load_file(file_type, self.files[file_type], loaders[file_type])
+        setattr(self, file_type, df)
+        return df
+    
+    def prefetch(self, progress: Optional[Callable[[str], None]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Load every detected input file ahead of a run.
+        
+        The GUIs call this on a background thread as soon as files are found;
+        later loads of unchanged files (same path, size and modification time)
+        reuse the frames instead of parsing or reading the cache again.
+        
+        Args:
+            progress: Called with a status message before each file and when done
+            
+        Returns:
+            Dictionary mapping file type to validated DataFrame
+        """
+        self.files = self.find_latest_files()
+        # CustomerFuel first: the tickets are keyed with its dictionary
+        file_types = [file_type for file_type in ('customer_fuel', 'delivery_tickets', 'degree_days')
+                      if file_type in self.files]
+        frames = {}
+        for number, file_type in enumerate(file_types, start=1):
+            if progress is not None:
+                progress(f"Loading {INPUT_FILE_LABELS[file_type]} ({number}/{len(file_types)})...")
+            frames[file_type] = self.load_input(file_type)
+        if progress is not None:
+            progress(f"Input data ready ({len(frames)} files)")
+        return frames
+    
+    def build_customer_keys(self, customer_fuel: pd.DataFrame) -> CustomerKeys:
+        """
+        Build the customer key dictionary from CustomerFuel.
+        
+        Every customer with a valid tank gets a key; delivery tickets of other
+        customers get MISSING_KEY and drop out of the interval join.
+        
+        Args:
+            customer_fuel: Validated CustomerFuel DataFrame
+            
+        Returns:
+            The CustomerKeys used for all later loads
+        """
+        self.customer_keys = CustomerKeys(customer_fuel['Customer Number'])
+        logger.info(f"Built customer key dictionary with {len(self.customer_keys)} customers")
+        return self.customer_keys
+    
+    def _require_customer_keys(self) -> CustomerKeys:
+        """The customer key dictionary, loading CustomerFuel first if it has not been built."""
+        if self.customer_keys is None:
+            self.load_input('customer_fuel')
+        return self.customer_keys
+    
+    def _load_file(self, file_type: str, file_path: Path, loader) -> pd.DataFrame:
+        """Load one input file through the input cache when it is enabled, adding customer keys."""
+        stat = file_path.stat()
+        signature = (str(file_path), stat.st_size, stat.st_mtime_ns)
+        preloaded = self.preloaded.get(file_type)
+        if preloaded is not None and preloaded[0] == signature:
+            logger.info(f"Using preloaded {INPUT_FILE_LABELS[file_type]} from {file_path.name}")
+            df = preloaded[1]
+        elif self.cache is None:
+            df = loader(file_path)
+        else:
+            df = self.cache.load(file_type, file_path, loader)
+        self.preloaded[file_type] = (signature, df)
+        
+        # Keys are added after the input cache so cached frames do not depend on each other
+        if file_type == 'customer_fuel':
+            df[CUSTOMER_KEY] = self.build_customer_keys(df).encode(df['Customer Number'])
+        elif file_type == 'delivery_tickets':
+            df[CUSTOMER_KEY] = self._require_customer_keys().encode(df['Customer Number'])
+        return df
@@ -0,0 +1,160 @@
+"""
+Degree day lookup module for the FoxFuel K-Factor Optimizer.
+Indexes the cumulative Heat Only DDays counter for fast interval lookups.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Tuple
+
+from .config import *
+from . import kernels
+from .logger import get_logger
+
+logger = get_logger()
+
+class DegreeDayIndex:
+    """Per-area, date-sorted cumulative degree day values searchable in O(log n) per date."""
+
+    def __init__(self, degree_days: pd.DataFrame):
+        """
+        Build the index from a degree days DataFrame.
+
+        Args:
+            degree_days: Degree days DataFrame with DDay Area, DDay Date and Heat Only DDays
+        """
+        self.dtype = degree_days['Heat Only DDays'].to_numpy().dtype
+        self.areas = {}
+
+        # Each area gets its own compact arrays so lookups never scan other areas
+        for area, area_days in degree_days.groupby(degree_days['DDay Area'].astype(str), sort=True):
+            dates = area_days['DDay Date'].to_numpy()
+            order = np.argsort(dates, kind='stable')
+            self.areas[area] = (dates[order], area_days['Heat Only DDays'].to_numpy()[order])
+
+        logger.debug(f"Indexed {len(self)} degree day values across {len(self.areas)} areas")
+
+    @classmethod
+    def from_arrays(cls, areas: dict, dtype) -> 'DegreeDayIndex':
+        """
+        Build an index from already sorted per-area arrays without copying them.
+
+        Args:
+            areas: DDay Area -> (sorted dates, cumulative values)
+            dtype: Dtype of the degree day values
+
+        Returns:
+            DegreeDayIndex over the given arrays
+        """
+        index = cls.__new__(cls)
+        index.dtype = np.dtype(dtype)
+        index.areas = dict(areas)
+        return index
+
+    def __len__(self) -> int:
+        return sum(len(dates) for dates, _ in self.areas.values())
+
+    @property
+    def default_area(self):
+        """
+        DDay Area used for zones without their own degree day values.
+
+        The only indexed area when there is one, whatever it is named;
+        otherwise DEFAULT_DDAY_AREA, which may be None for no fallback.
+        """
+        if len(self.areas) == 1:
+            return next(iter(self.areas))
+        return DEFAULT_DDAY_AREA
+
+    def resolve_areas(self, zones) -> np.ndarray:
+        """
+        Map customer zones to DDay Areas.
+
+        A zone listed in ZONE_DDAY_AREA_MAP uses the mapped area, a zone named
+        like an indexed area uses that area, and any other zone falls back to
+        default_area.
+
+        Args:
+            zones: Array of Zone - Fuel values
+
+        Returns:
+            Array of DDay Area names
+
+        Raises:
+            ValueError: If a zone has no area to fall back to, or resolves to an
+                area without degree day values
+        """
+        zones = pd.Series(zones, dtype=object).fillna('').astype(str)
+        areas = zones.map(ZONE_DDAY_AREA_MAP)
+        areas = areas.where(areas.notna(), zones.where(zones.isin(list(self.areas))))
+
+        unresolved = areas.isna()
+        if unresolved.any():
+            if self.default_area is None:
+                raise ValueError(
+                    f"Zones {self._examples(zones[unresolved])} have no DDay Area and the degree days "
+                    f"cover several areas {sorted(self.areas)}; map them in ZONE_DDAY_AREA_MAP "
+                    f"or set DEFAULT_DDAY_AREA"
+                )
+            areas = areas.where(~unresolved, self.default_area)
+
+        unindexed = ~areas.isin(list(self.areas))
+        if unindexed.any():
+            raise ValueError(
+                f"Zones {self._examples(zones[unindexed])} resolve to DDay Areas without degree day values "
+                f"{self._examples(areas[unindexed])}; the degree days cover {sorted(self.areas)}, "
+                f"so map the zones in ZONE_DDAY_AREA_MAP or set DEFAULT_DDAY_AREA"
+            )
+        return areas.to_numpy(dtype=object)
+
+    @staticmethod
+    def _examples(values: pd.Series, limit: int = 10) -> list:
+        """Sorted distinct values for an error message, at most limit of them."""
+        return sorted(values.unique())[:limit]
+
+    def degree_days_used(self, start_dates, end_dates, areas=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Look up degree days used for a batch of intervals.
+
+        The values dated in (start, end] are located in the interval's own area
+        with two binary searches. Degree days used is the difference between the
+        last and first of those cumulative values, or the single value when only
+        one day falls in the interval.
+
+        Args:
+            start_dates: Array of interval start dates
+            end_dates: Array of interval end dates
+            areas: Array of DDay Areas per interval (defaults to default_area)
+
+        Returns:
+            Tuple of (degree days used, mask of intervals with any degree day values)
+        """
+        start_dates = np.asarray(start_dates)
+        end_dates = np.asarray(end_dates)
+        if areas is None:
+            if self.default_area is None:
+                raise ValueError(f"Degree days cover several areas {sorted(self.areas)}; pass each interval's area")
+            areas = np.full(len(start_dates), self.default_area, dtype=object)
+
+        used = np.zeros(len(start_dates), dtype=self.dtype)
+        found = np.zeros(len(start_dates), dtype=bool)
+
+        area_codes, area_names = pd.factorize(np.asarray(areas, dtype=object))
+        for code, area in enumerate(area_names):
+            if area not in self.areas:
+                continue
+            members = np.flatnonzero(area_codes == code)
+            used[members], found[members] = self._lookup(
+                self.areas[area], start_dates[members], end_dates[members]
+            )
+
+        return used, found
+
+    def _lookup(self, area_index: tuple, start_dates: np.ndarray,
+                end_dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Search one area's arrays for a batch of (start, end] windows."""
+        dates, values = area_index
+        start_dates = start_dates.astype(dates.dtype)
+        end_dates = end_dates.astype(dates.dtype)
+
+        return kernels.degree_days_between(dates, values, start_dates, end_dates)
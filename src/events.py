@@ -0,0 +1,156 @@
+"""
+Event bus module for the FoxFuel K-Factor Optimizer.
+Carries step, progress, status and log events from a pipeline run to a GUI,
+which drains them in batches on its own thread, and the run's cancellation
+checkpoints.
+"""
+
+import queue
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Event kinds
+STEP_START = "step_start"
+STEP_END = "step_end"
+PROGRESS = "progress"
+STATUS = "status"
+LOG = "log"
+
+class PipelineCancelled(Exception):
+    """Raised at a checkpoint of a run whose cancel event has been set."""
+
+class EventBus:
+    """
+    Thread-safe queue of events.
+
+    Any thread may publish; one consumer drains. Tk widgets must only be
+    touched from the main loop, so a GUI drains the bus on a timer and applies
+    a whole batch per update instead of redrawing for every log line.
+    """
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+
+    def publish(self, kind: str, **data):
+        """
+        Add an event.
+
+        Args:
+            kind: One of STEP_START, STEP_END, PROGRESS, STATUS or LOG
+            **data: Event fields, e.g. step, percent or message
+        """
+        self._queue.put({'kind': kind, 'time': time.time(), **data})
+
+    def drain(self, max_events: Optional[int] = None) -> List[dict]:
+        """
+        Remove and return waiting events, oldest first.
+
+        Args:
+            max_events: Return at most this many; the rest wait for the next drain
+
+        Returns:
+            List of event dicts with 'kind', 'time' and the published fields
+        """
+        events = []
+        while max_events is None or len(events) < max_events:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def log_sink(self, message):
+        """Loguru sink publishing each record as a LOG event."""
+        record = message.record
+        self.publish(LOG, level=record['level'].name, message=record['message'])
+
+class ProgressTracker:
+    """
+    Overall percent complete of a run, published as PROGRESS events.
+
+    A run declares its planned steps with relative weights (their typical
+    share of the run time). When a step starts, every planned step before it
+    counts as done, so steps skipped by the stage cache simply move the bar
+    forward; steps that report fractions (shards, partitions) move it within
+    their own weight.
+
+    Every step start and fraction report is also a cancellation checkpoint:
+    once the cancel event is set, the next one raises PipelineCancelled.
+    """
+
+    def __init__(self, bus: Optional[EventBus], steps: List[Tuple[str, float]], cancel_event=None):
+        """
+        Args:
+            bus: Bus the events are published to, or None to only check for cancellation
+            steps: (step name, weight) pairs in run order
+            cancel_event: Optional threading or multiprocessing Event requesting cancellation
+        """
+        self.bus = bus
+        self.cancel_event = cancel_event
+        self.weights = {name: weight for name, weight in steps}
+        self.offsets = {}
+        offset = 0.0
+        for name, weight in steps:
+            self.offsets[name] = offset
+            offset += weight
+        self.total = offset or 1.0
+        self.step = None
+        self.percent = 0.0
+
+    def check_cancelled(self, next_step: str = None):
+        """
+        Raise PipelineCancelled if cancellation has been requested.
+
+        Args:
+            next_step: Step about to start, for the message; None when checking within the current step
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            where = f"before {next_step}" if next_step is not None else f"during {self.step}"
+            raise PipelineCancelled(f"Run cancelled {where}")
+
+    def start_step(self, name: str):
+        """Publish the start of a step."""
+        self.check_cancelled(next_step=name)
+        self.step = name
+        self._publish(STEP_START, step=name)
+        self.advance(0.0)
+
+    def advance(self, fraction: float):
+        """
+        Report progress within the current step.
+
+        Args:
+            fraction: Share of the current step completed, 0 to 1
+        """
+        self.check_cancelled()
+        if self.step not in self.weights:
+            return
+        fraction = min(max(fraction, 0.0), 1.0)
+        percent = 100 * (self.offsets[self.step] + fraction * self.weights[self.step]) / self.total
+        # Never move backwards, and skip changes the bar would not show
+        if percent >= self.percent + 0.1 or (percent > self.percent and fraction == 1.0):
+            self.percent = percent
+            self._publish(PROGRESS, step=self.step, percent=round(percent, 1))
+
+    def end_step(self, record: Dict, completed: bool = True):
+        """
+        Publish the end of a step.
+
+        Args:
+            record: The step's profile record (step, wall_seconds, rows_out, cache_hit, ...)
+            completed: False when the step raised (failed or cancelled); progress then stays put
+        """
+        if completed and self.step in self.weights:
+            # Reaching the end of a step is not a checkpoint; its work is done
+            self.percent = max(self.percent, 100 * (self.offsets[self.step] + self.weights[self.step]) / self.total)
+            self._publish(PROGRESS, step=self.step, percent=round(self.percent, 1))
+        self._publish(STEP_END, completed=completed, **record)
+
+    def finish(self):
+        """Publish 100% once the run has completed."""
+        self.percent = 100.0
+        self._publish(PROGRESS, step=self.step, percent=100.0)
+
+    def _publish(self, kind: str, **data):
+        if self.bus is not None:
+            self.bus.publish(kind, **data)
@@ -5,13 +5,22 @@ Applies caps, thresholds, and confidence filtering to K-factor changes.
 
 import pandas as pd
 import numpy as np
-from typing import Tuple
+import itertools
+import warnings
+from typing import Tuple, Dict, Iterable
 
 from .config import *
 from .logger import get_logger
 
 logger = get_logger()
 
+# Sweep parameters, in the order their combinations are listed
+SWEEP_PARAMETERS = [
+    'max_increase', 'max_decrease', 'cap_pct', 'var_threshold_pct', 'confidence_threshold', 'min_intervals'
+]
+
+SWEEP_PERCENTILES = [5, 25, 50, 75, 95]
+
 class GovernanceEngine:
     """Applies governance rules to K-factor changes."""
     
@@ -181,3 +190,163 @@ class GovernanceEngine:
         }
         
         return summary
+    
+    def sweep(self, variance_data: pd.DataFrame, grid: Dict[str, Iterable] = None,
+              chunk_cells: int = SWEEP_CHUNK_CELLS) -> pd.DataFrame:
+        """
+        Evaluate governance for every combination of a parameter grid at once.
+        
+        Gives, per combination, the counts and final variance distribution that
+        apply_governance, filter_for_auto_apply and get_review_queue would give
+        with those values in config.py. Caps only move the proposed K and the
+        thresholds only move the status, so the two halves are computed
+        separately on customer arrays and combined with matrix products.
+        
+        Args:
+            variance_data: DataFrame from KFactorCalculator.calculate_variance
+            grid: Parameter name (see SWEEP_PARAMETERS) to values; parameters
+                left out keep their config value
+            chunk_cells: Cap combinations x customers evaluated per block, bounding memory
+            
+        Returns:
+            DataFrame with one row per combination: the parameters, auto-apply,
+            review, capped and status counts, and final variance mean, std and percentiles
+        """
+        grid = dict(grid or {})
+        unknown = set(grid) - set(SWEEP_PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+        defaults = self._sweep_defaults()
+        values = {name: np.atleast_1d(np.asarray(list(np.atleast_1d(grid.get(name, defaults[name]))), dtype=float))
+                  for name in SWEEP_PARAMETERS}
+        
+        winter_k = variance_data['K Factor - Winter'].to_numpy(dtype=float)
+        weighted_k = variance_data['Weighted K Factor'].to_numpy(dtype=float)
+        abs_variance = np.abs(variance_data['Variance Percent'].to_numpy(dtype=float))
+        confidence = variance_data['Confidence'].to_numpy(dtype=float)
+        interval_count = variance_data['Interval Count'].to_numpy(dtype=float)
+        customers = len(variance_data)
+        
+        # Threshold half: pre-governance status per threshold combination (rows) and customer
+        thresholds = np.array(list(itertools.product(
+            values['var_threshold_pct'], values['confidence_threshold'], values['min_intervals']
+        )))
+        var_threshold, confidence_threshold, min_intervals = (thresholds[:, [i]] for i in range(3))
+        insufficient = interval_count < min_intervals
+        low_confidence = ~insufficient & (confidence < confidence_threshold)
+        high_variance = ~insufficient & ~low_confidence & (abs_variance > var_threshold * 100)
+        approved = ~insufficient & ~low_confidence & ~high_variance
+        eligible = ~insufficient & (confidence >= confidence_threshold)
+        
+        # Cap half: proposed K per cap combination (rows) and customer
+        caps = np.array(list(itertools.product(values['max_increase'], values['max_decrease'], values['cap_pct'])))
+        block = max(1, chunk_cells // max(customers, 1))
+        cap_parts = []
+        for start in range(0, len(caps), block):
+            cap_parts.append(self._sweep_caps(caps[start:start + block], winter_k, weighted_k))
+        cap_results = {key: np.concatenate([part[key] for part in cap_parts]) for key in cap_parts[0]}
+        capped = cap_results.pop('capped_mask')
+        
+        # Combine: capped customers are auto-applied when eligible, others when approved
+        capped_f = capped.astype(np.float32).T
+        uncapped_f = 1 - capped_f
+        auto_apply = eligible.astype(np.float32) @ capped_f + approved.astype(np.float32) @ uncapped_f
+        status_counts = {
+            'high_variance': high_variance.astype(np.float32) @ uncapped_f,
+            'low_confidence': low_confidence.astype(np.float32) @ uncapped_f,
+            'insufficient_data': insufficient.astype(np.float32) @ uncapped_f,
+            'approved': approved.astype(np.float32) @ uncapped_f
+        }
+        
+        # Rows in itertools.product order of SWEEP_PARAMETERS, caps varying slowest
+        cap_index = np.repeat(np.arange(len(caps)), len(thresholds))
+        threshold_index = np.tile(np.arange(len(thresholds)), len(caps))
+        results = pd.DataFrame({
+            'max_increase': caps[cap_index, 0],
+            'max_decrease': caps[cap_index, 1],
+            'cap_pct': caps[cap_index, 2],
+            'var_threshold_pct': thresholds[threshold_index, 0],
+            'confidence_threshold': thresholds[threshold_index, 1],
+            'min_intervals': thresholds[threshold_index, 2].astype(int),
+            'auto_apply': np.rint(auto_apply[threshold_index, cap_index]).astype(int)
+        })
+        results['manual_review'] = customers - results['auto_apply']
+        for name, counts in status_counts.items():
+            results[name] = np.rint(counts[threshold_index, cap_index]).astype(int)
+        for name, column in cap_results.items():
+            results[name] = column[cap_index]
+        
+        logger.info(f"Swept {len(results)} governance combinations over {customers} customers")
+        return results
+    
+    def _sweep_defaults(self) -> dict:
+        """Config values of the sweep parameters, read at call time as apply_governance reads them."""
+        return {
+            'max_increase': MAX_INCREASE,
+            'max_decrease': MAX_DECREASE,
+            'cap_pct': CAP_PCT,
+            'var_threshold_pct': VAR_THRESHOLD_PCT,
+            'confidence_threshold': CONFIDENCE_THRESHOLD,
+            'min_intervals': MIN_INTERVALS
+        }
+    
+    def _sweep_caps(self, caps: np.ndarray, winter_k: np.ndarray, weighted_k: np.ndarray) -> dict:
+        """
+        Apply a block of cap combinations to every customer, as apply_governance does.
+        
+        Args:
+            caps: Array of (max_increase, max_decrease, cap_pct) rows
+            winter_k: Current winter K per customer
+            weighted_k: Weighted K per customer
+            
+        Returns:
+            Dictionary of per-combination capped counts and final variance statistics,
+            plus the capped mask (combinations x customers)
+        """
+        max_increase, max_decrease, cap_pct = (caps[:, [i]] for i in range(3))
+        proposed = np.broadcast_to(weighted_k, (len(caps), len(weighted_k))).copy()
+        
+        max_increase_limit = winter_k * (1 + max_increase)
+        increase_cap_applied = proposed > max_increase_limit
+        proposed = np.where(increase_cap_applied, max_increase_limit, proposed)
+        
+        max_decrease_limit = winter_k * (1 - max_decrease)
+        decrease_cap_applied = proposed < max_decrease_limit
+        proposed = np.where(decrease_cap_applied, max_decrease_limit, proposed)
+        
+        variance_boundary_upper = winter_k * (1 + cap_pct)
+        variance_boundary_lower = winter_k * (1 - cap_pct)
+        upper_bound_applied = proposed > variance_boundary_upper
+        lower_bound_applied = proposed < variance_boundary_lower
+        proposed = np.where(upper_bound_applied, variance_boundary_upper, proposed)
+        proposed = np.where(lower_bound_applied, variance_boundary_lower, proposed)
+        
+        final_variance = np.round(((proposed - winter_k) / winter_k) * 100, 2)
+        
+        # Later caps take precedence for the final status, as in apply_governance
+        status_lower = lower_bound_applied
+        status_upper = upper_bound_applied & ~status_lower
+        status_decrease = decrease_cap_applied & ~upper_bound_applied & ~lower_bound_applied
+        status_increase = increase_cap_applied & ~decrease_cap_applied & ~upper_bound_applied & ~lower_bound_applied
+        capped_mask = increase_cap_applied | decrease_cap_applied | upper_bound_applied | lower_bound_applied
+        
+        stats = {
+            'capped': capped_mask.sum(axis=1),
+            'capped_increase': status_increase.sum(axis=1),
+            'capped_decrease': status_decrease.sum(axis=1),
+            'capped_upper_bound': status_upper.sum(axis=1),
+            'capped_lower_bound': status_lower.sum(axis=1)
+        }
+        
+        # Customers without a winter K have no final variance; skip them like the pandas
+        # statistics of get_governance_summary do (all-missing rows give NaN)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            stats['variance_mean'] = np.nanmean(final_variance, axis=1)
+            stats['variance_std'] = (np.nanstd(final_variance, axis=1, ddof=1) if final_variance.shape[1] > 1
+                                     else np.zeros(len(caps)))
+            percentiles = np.nanpercentile(final_variance, SWEEP_PERCENTILES, axis=1)
+        for percentile, column in zip(SWEEP_PERCENTILES, percentiles):
+            stats[f'variance_p{percentile:02d}'] = column
+        stats['capped_mask'] = capped_mask
+        return stats
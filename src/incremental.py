@@ -0,0 +1,173 @@
+"""
+Incremental interval module for the FoxFuel K-Factor Optimizer.
+Persists per-customer interval state so weekly runs only rebuild changed customers.
+"""
+
+import pandas as pd
+import hashlib
+import json
+import pickle
+from pathlib import Path
+
+from .config import *
+from .customer_keys import CUSTOMER_KEY
+from .interval_builder import INTERVAL_COLUMNS
+from .logger import get_logger
+
+logger = get_logger()
+
+# Bump when interval building changes so older state is rebuilt in full
+STATE_VERSION = 1
+
+def customer_fingerprints(customer_fuel: pd.DataFrame, delivery_tickets: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fingerprint the inputs that determine each customer's intervals.
+
+    Rows are hashed together with their position within the customer, so any
+    added, removed, edited or reordered ticket or tank row changes the result.
+
+    Args:
+        customer_fuel: Customer fuel DataFrame
+        delivery_tickets: Delivery tickets DataFrame
+
+    Returns:
+        DataFrame indexed by Customer Number with hash and count columns
+    """
+    def fingerprint(df: pd.DataFrame, columns: list, prefix: str) -> pd.DataFrame:
+        customers = df['Customer Number'].astype(str)
+        rows = df[columns].assign(**{'Customer Number': customers, 'Position': customers.groupby(customers).cumcount()})
+        hashes = pd.util.hash_pandas_object(rows, index=False)
+        grouped = hashes.groupby(customers.to_numpy())
+        return pd.DataFrame({f'{prefix} Hash': grouped.sum(), f'{prefix} Rows': grouped.size()})
+
+    tickets = fingerprint(delivery_tickets, ['Transaction Date', 'Quantity'], 'Ticket')
+    tanks = fingerprint(customer_fuel, ['Usable Size', 'Zone - Fuel'], 'Tank')
+
+    # Reindex with a zero fill so the 64-bit hashes never pass through float NaN
+    customers = tickets.index.union(tanks.index)
+    return pd.concat([
+        tickets.reindex(customers, fill_value=0), tanks.reindex(customers, fill_value=0)
+    ], axis=1).astype('uint64')
+
+def global_fingerprint(degree_days: pd.DataFrame) -> str:
+    """
+    Fingerprint the inputs and settings shared by every customer's intervals.
+
+    Args:
+        degree_days: Degree days DataFrame
+
+    Returns:
+        Hex digest of the degree days table and interval settings
+    """
+    degree_day_hash = pd.util.hash_pandas_object(
+        degree_days[DEGREE_DAY_COLUMNS].astype({'DDay Area': str}), index=False
+    ).to_numpy()
+    settings = {
+        'state_version': STATE_VERSION,
+        'full_threshold': FULL_THRESHOLD,
+        'default_area': DEFAULT_DDAY_AREA,
+        'zone_area_map': ZONE_DDAY_AREA_MAP
+    }
+    digest = hashlib.sha1(degree_day_hash.tobytes())
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    return digest.hexdigest()
+
+class IncrementalIntervalStore:
+    """Reuses intervals from the last run for customers whose inputs have not changed."""
+
+    def __init__(self, state_dir: str = INCREMENTAL_STATE_DIR):
+        self.state_file = Path(state_dir) / "interval_state.pkl"
+        self.rebuilt_customers = 0
+        self.reused_customers = 0
+
+    def build_intervals(self, interval_builder, customer_fuel: pd.DataFrame,
+                        delivery_tickets: pd.DataFrame, degree_days: pd.DataFrame,
+                        customer_keys) -> pd.DataFrame:
+        """
+        Build delivery intervals, rebuilding only customers with changed inputs.
+
+        The result is identical to interval_builder.build_intervals on the full
+        inputs: unchanged customers keep their stored intervals and the merged
+        frame is ordered by customer exactly like a full build. Keys are only
+        valid for one run, so stored intervals hold customer numbers instead.
+
+        Args:
+            interval_builder: IntervalBuilder used for the changed customers
+            customer_fuel: Customer fuel DataFrame
+            delivery_tickets: Delivery tickets DataFrame
+            degree_days: Degree days DataFrame
+            customer_keys: The DataLoader's CustomerKeys for this run
+
+        Returns:
+            DataFrame with delivery intervals for all customers
+        """
+        fingerprints = customer_fingerprints(customer_fuel, delivery_tickets)
+        global_key = global_fingerprint(degree_days)
+        state = self._load_state()
+
+        if state is None or state['global_key'] != global_key:
+            if state is not None:
+                logger.info("Degree days or interval settings changed, rebuilding all customers")
+            changed = fingerprints.index
+            reused = pd.DataFrame()
+        else:
+            previous = state['fingerprints']
+            common = fingerprints.index.intersection(previous.index)
+            same = (previous.loc[common] == fingerprints.loc[common]).all(axis=1)
+            unchanged = common[same.to_numpy()]
+            changed = fingerprints.index.difference(unchanged)
+            stored = state['intervals']
+            reused = stored[stored['Customer Number'].isin(unchanged)]
+            reused = reused.rename(columns={'Customer Number': CUSTOMER_KEY})
+            reused[CUSTOMER_KEY] = customer_keys.encode(reused[CUSTOMER_KEY])
+
+        self.rebuilt_customers = len(changed)
+        self.reused_customers = len(fingerprints) - len(changed)
+        logger.info(f"Incremental run: rebuilding {self.rebuilt_customers} customers, "
+                    f"reusing {self.reused_customers}")
+
+        if len(changed) > 0:
+            rebuilt = interval_builder.build_intervals(
+                customer_fuel[customer_fuel['Customer Number'].astype(str).isin(changed)],
+                delivery_tickets[delivery_tickets['Customer Number'].astype(str).isin(changed)],
+                degree_days
+            )
+        else:
+            # Nothing to rebuild; building from empty frames would warn that no intervals were found
+            rebuilt = pd.DataFrame(columns=INTERVAL_COLUMNS)
+
+        # A stable sort by customer restores the full build's order
+        parts = [part for part in (reused, rebuilt) if len(part) > 0]
+        intervals = pd.concat(parts, ignore_index=True) if parts else rebuilt
+        intervals = intervals.sort_values(CUSTOMER_KEY, kind='mergesort').reset_index(drop=True)
+
+        stored = intervals.rename(columns={CUSTOMER_KEY: 'Customer Number'})
+        stored['Customer Number'] = customer_keys.decode(intervals[CUSTOMER_KEY])
+        self._save_state({'global_key': global_key, 'fingerprints': fingerprints, 'intervals': stored})
+
+        interval_builder.intervals = intervals
+        interval_builder.set_customer_numbers(customer_fuel)
+        return intervals
+
+    def _load_state(self):
+        """Load the stored state, or None if there is no usable state."""
+        if not self.state_file.exists():
+            logger.info("No incremental state found, building all customers")
+            return None
+        try:
+            with open(self.state_file, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable incremental state: {e}")
+            return None
+
+    def _save_state(self, state: dict):
+        """Persist the state for the next run."""
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.state_file.with_suffix(".tmp")
+            with open(temp_file, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            temp_file.replace(self.state_file)
+        except Exception as e:
+            logger.warning(f"Could not save incremental state: {e}")
@@ -0,0 +1,170 @@
+"""
+Input caching module for the FoxFuel K-Factor Optimizer.
+Stores validated input frames in a local columnar cache keyed by file fingerprint.
+"""
+
+import pandas as pd
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from .config import *
+from .logger import get_logger
+
+logger = get_logger()
+
+# Bump when loader validation changes so older cache entries are not reused
+CACHE_SCHEMA_VERSION = 1
+
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = "parquet"
+except ImportError:
+    CACHE_FORMAT = "pkl"
+
+def file_fingerprint(file_path: Path) -> dict:
+    """
+    Fingerprint an input file by path, size, modification time and content hash.
+
+    Args:
+        file_path: Path to the input file
+
+    Returns:
+        Dictionary describing the file
+    """
+    stat = file_path.stat()
+    content_hash = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            content_hash.update(block)
+
+    return {
+        'path': str(file_path.resolve()),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'content_hash': content_hash.hexdigest()
+    }
+
+def _validation_settings() -> dict:
+    """Config values that change what the loaders keep."""
+    return {
+        'schema_version': CACHE_SCHEMA_VERSION,
+        'min_usable_size': MIN_USABLE_SIZE,
+        'min_k_factor': MIN_K_FACTOR,
+        'min_quantity': MIN_QUANTITY,
+        'percent_full_range': [MIN_PERCENT_FULL, MAX_PERCENT_FULL],
+        'min_degree_days': MIN_DEGREE_DAYS,
+        'transaction_type': VALID_TRANSACTION_TYPE,
+        'date_formats': IGNITE_DATE_FORMATS,
+        'ticket_dtypes': DELIVERY_TICKETS_DTYPES
+    }
+
+class InputCache:
+    """Columnar cache of validated input DataFrames."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_age_days: float = INPUT_CACHE_MAX_AGE_DAYS):
+        self.cache_dir = Path(cache_dir)
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+
+    def cache_key(self, file_type: str, file_path: Path) -> str:
+        """
+        Build the cache key for an input file.
+
+        Args:
+            file_type: Input type (customer_fuel, delivery_tickets, degree_days)
+            file_path: Path to the input file
+
+        Returns:
+            Hex digest identifying the file contents and validation settings
+        """
+        key_data = {
+            'file_type': file_type,
+            'fingerprint': file_fingerprint(file_path),
+            'settings': _validation_settings()
+        }
+        return hashlib.sha1(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+
+    def load(self, file_type: str, file_path: Path,
+             loader: Callable[[Path], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Load a validated frame from the cache, or run the loader and cache its result.
+
+        Args:
+            file_type: Input type (customer_fuel, delivery_tickets, degree_days)
+            file_path: Path to the input file
+            loader: Function that loads and validates the file
+
+        Returns:
+            Validated DataFrame
+        """
+        key = self.cache_key(file_type, file_path)
+        entry = self.cache_dir / f"{file_type}_{key}.{CACHE_FORMAT}"
+
+        cached = self._read_entry(entry)
+        if cached is not None:
+            self.hits += 1
+            logger.info(f"Input cache hit for {file_path.name}")
+            return cached
+
+        self.misses += 1
+        logger.info(f"Input cache miss for {file_path.name}, parsing CSV")
+        df = loader(file_path)
+        self._write_entry(entry, df)
+        self.evict(file_type, keep=entry)
+        return df
+
+    def evict(self, file_type: Optional[str] = None, keep: Optional[Path] = None):
+        """
+        Remove stale cache entries.
+
+        Entries for the same input type as a fresh entry are superseded by it, and
+        entries not used for more than max_age_days are removed.
+
+        Args:
+            file_type: Input type whose older entries are superseded, if any
+            keep: Entry to keep
+        """
+        if not self.cache_dir.exists():
+            return
+
+        cutoff = time.time() - self.max_age_days * 86400
+        for entry in self.cache_dir.glob("*_*.*"):
+            if entry.suffix not in ('.parquet', '.pkl') or entry == keep:
+                continue
+            superseded = file_type is not None and entry.name.startswith(f"{file_type}_")
+            try:
+                if superseded or entry.stat().st_mtime < cutoff:
+                    entry.unlink()
+                    logger.debug(f"Evicted input cache entry {entry.name}")
+            except OSError as e:
+                logger.warning(f"Could not evict input cache entry {entry.name}: {e}")
+
+    def _read_entry(self, entry: Path) -> Optional[pd.DataFrame]:
+        """Read a cache entry, returning None if it is missing or unreadable."""
+        if not entry.exists():
+            return None
+        try:
+            df = pd.read_parquet(entry) if CACHE_FORMAT == "parquet" else pd.read_pickle(entry)
+            # Mark the entry as recently used so age-based eviction keeps it
+            entry.touch()
+            return df
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable input cache entry {entry.name}: {e}")
+            return None
+
+    def _write_entry(self, entry: Path, df: pd.DataFrame):
+        """Write a cache entry, logging instead of failing if the cache is not writable."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_entry = entry.with_name(entry.name + ".tmp")
+            if CACHE_FORMAT == "parquet":
+                df.to_parquet(temp_entry)
+            else:
+                df.to_pickle(temp_entry)
+            temp_entry.replace(entry)
+        except Exception as e:
+            logger.warning(f"Could not write input cache entry {entry.name}: {e}")
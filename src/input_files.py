@@ -0,0 +1,72 @@
+"""
+Input file detection for the FoxFuel K-Factor Optimizer.
+Finds the Ignite exports and checks the configuration without importing pandas,
+so startup checks in the GUIs and CLI stay fast.
+"""
+
+import glob
+from pathlib import Path
+from typing import Dict, List
+
+from .config import *
+
+INPUT_FILE_PATTERNS = {
+    'customer_fuel': CUSTOMER_FUEL_PATTERN,
+    'delivery_tickets': DELIVERY_TICKETS_PATTERN,
+    'degree_days': DEGREE_DAY_PATTERN
+}
+
+INPUT_FILE_LABELS = {
+    'customer_fuel': "CustomerFuel",
+    'delivery_tickets': "DeliveryTickets",
+    'degree_days': "DegreeDayValues"
+}
+
+def find_latest_files(input_dir: str = INPUT_DIR) -> Dict[str, Path]:
+    """
+    Find the latest CSV file matching each input pattern.
+
+    Args:
+        input_dir: Directory with the Ignite exports
+
+    Returns:
+        Dictionary mapping file type to Path, for the file types found
+    """
+    files = {}
+    for file_type, pattern in INPUT_FILE_PATTERNS.items():
+        matches = glob.glob(str(Path(input_dir) / pattern))
+        if matches:
+            files[file_type] = Path(max(matches, key=lambda x: Path(x).stat().st_mtime))
+    return files
+
+def validate_config() -> List[str]:
+    """
+    Check the governance and execution settings in config.py.
+
+    Returns:
+        List of problems; empty when the configuration is valid
+    """
+    problems = []
+    for name, value in [("MAX_INCREASE", MAX_INCREASE), ("MAX_DECREASE", MAX_DECREASE),
+                        ("CAP_PCT", CAP_PCT), ("VAR_THRESHOLD_PCT", VAR_THRESHOLD_PCT),
+                        ("CONFIDENCE_THRESHOLD", CONFIDENCE_THRESHOLD), ("FULL_THRESHOLD", FULL_THRESHOLD)]:
+        if not 0 <= value <= 1:
+            problems.append(f"{name} = {value} must be a fraction between 0 and 1")
+    for name, value in [("MIN_INTERVALS", MIN_INTERVALS), ("MIN_INTERVAL_DAYS", MIN_INTERVAL_DAYS),
+                        ("PIPELINE_WORKERS", PIPELINE_WORKERS), ("STREAM_MEMORY_BUDGET_MB", STREAM_MEMORY_BUDGET_MB),
+                        ("STREAM_CHUNK_ROWS", STREAM_CHUNK_ROWS)]:
+        if not isinstance(value, int) or value < 1:
+            problems.append(f"{name} = {value} must be a positive integer")
+    if SUMMER_MULTIPLIER <= 0:
+        problems.append(f"SUMMER_MULTIPLIER = {SUMMER_MULTIPLIER} must be positive")
+    for name, value in [("GUI_RUN_TIMEOUT_SECONDS", GUI_RUN_TIMEOUT_SECONDS),
+                        ("GUI_CANCEL_GRACE_SECONDS", GUI_CANCEL_GRACE_SECONDS)]:
+        if not isinstance(value, (int, float)) or value < 0:
+            problems.append(f"{name} = {value} must be a number of seconds, 0 or more")
+    if KERNEL_BACKEND not in ("auto", "numba", "numpy"):
+        problems.append(f"KERNEL_BACKEND = {KERNEL_BACKEND!r} must be \"auto\", \"numba\" or \"numpy\"")
+    if not isinstance(ZONE_DDAY_AREA_MAP, dict):
+        problems.append("ZONE_DDAY_AREA_MAP must be a dictionary of Zone - Fuel to DDay Area")
+    if DEFAULT_DDAY_AREA is not None and (not isinstance(DEFAULT_DDAY_AREA, str) or not DEFAULT_DDAY_AREA):
+        problems.append(f"DEFAULT_DDAY_AREA = {DEFAULT_DDAY_AREA!r} must be a DDay Area name or None")
+    return problems
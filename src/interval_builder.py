@@ -4,39 +4,62 @@ Creates delivery intervals between full fills and joins with degree days.
 """
 
 import pandas as pd
+import numpy as np
 from typing import Tuple
 from datetime import datetime, timedelta
 
 from .config import *
+from .degree_days import DegreeDayIndex
+from .customer_keys import CUSTOMER_KEY
+from . import kernels
 from .logger import get_logger
 
 logger = get_logger()
 
+# Ticket columns used for intervals; customers are identified by their key
+INTERVAL_TICKET_COLUMNS = [CUSTOMER_KEY] + [col for col in DELIVERY_TICKETS_COLUMNS if col != 'Customer Number']
+
+INTERVAL_COLUMNS = [
+    CUSTOMER_KEY, 'Start Date', 'End Date', 'Start Delivery Gallons',
+    'End Delivery Gallons', 'Total Gallons', 'Degree Days Used', 'Interval Days', 'Usable Size'
+]
+
 class IntervalBuilder:
     """Builds delivery intervals between full fills and calculates degree days used."""
     
     def __init__(self):
         self.intervals = None
+        # Customer Number by Customer Key, for reporting the keyed intervals
+        self.customer_numbers = None
         
     def build_intervals(self, customer_fuel: pd.DataFrame, delivery_tickets: pd.DataFrame, 
                        degree_days: pd.DataFrame) -> pd.DataFrame:
         """
         Build delivery intervals between consecutive full fills.
         
+        Customers are joined and sorted on their integer Customer Key from the
+        DataLoader's customer key dictionary.
+        
         Args:
             customer_fuel: Customer fuel information DataFrame
             delivery_tickets: Delivery tickets DataFrame
-            degree_days: Degree days DataFrame
+            degree_days: Degree days DataFrame or a prebuilt DegreeDayIndex
             
         Returns:
-            DataFrame with delivery intervals
+            DataFrame with delivery intervals, keyed by Customer Key
         """
         logger.info("Building delivery intervals...")
+        self.set_customer_numbers(customer_fuel)
         
-        # Merge delivery tickets with customer fuel to get usable size
-        merged = delivery_tickets.merge(
-            customer_fuel[['Customer Number', 'Usable Size']], 
-            on='Customer Number', 
+        if isinstance(degree_days, DegreeDayIndex):
+            degree_day_index = degree_days
+        else:
+            degree_day_index = DegreeDayIndex(degree_days)
+        
+        # Merge delivery tickets with customer fuel to get usable size and zone
+        merged = delivery_tickets[INTERVAL_TICKET_COLUMNS].merge(
+            customer_fuel[[CUSTOMER_KEY, 'Usable Size', 'Zone - Fuel']], 
+            on=CUSTOMER_KEY, 
             how='inner'
         )
         
@@ -46,18 +69,14 @@ class IntervalBuilder:
         # Identify full fills - use quantity vs usable size since Ignite % Full is unreliable
         merged['Is Full Fill'] = merged['Quantity'] >= merged['Full Fill Threshold']
         
-        # Sort by customer and date
-        merged = merged.sort_values(['Customer Number', 'Transaction Date'])
-        
-        intervals = []
+        # Resolve each customer's weather area from its zone; zones without one raise
+        merged['DDay Area'] = degree_day_index.resolve_areas(merged['Zone - Fuel'])
         
-        # Process each customer
-        for customer in merged['Customer Number'].unique():
-            customer_data = merged[merged['Customer Number'] == customer].copy()
-            customer_intervals = self._build_customer_intervals(customer_data, degree_days)
-            intervals.extend(customer_intervals)
+        # Sort by customer and date
+        merged = merged.sort_values([CUSTOMER_KEY, 'Transaction Date'])
         
-        self.intervals = pd.DataFrame(intervals)
+        # Pair consecutive full fills for every customer in one sorted pass
+        self.intervals = self._build_all_intervals(merged, degree_day_index)
         
         if len(self.intervals) > 0:
             logger.info(f"Built {len(self.intervals)} delivery intervals")
@@ -66,74 +85,56 @@ class IntervalBuilder:
             
         return self.intervals
     
-    def _build_customer_intervals(self, customer_data: pd.DataFrame, 
-                                degree_days: pd.DataFrame) -> list:
+    def _build_all_intervals(self, merged: pd.DataFrame, 
+                             degree_day_index: DegreeDayIndex) -> pd.DataFrame:
         """
-        Build intervals for a single customer.
+        Build intervals for all customers from deliveries sorted by customer and date.
+        
+        Consecutive full fills of the same customer form an interval. Boundaries
+        and gallons over the deliveries dated in (start, end] come from one
+        kernel pass over the sorted deliveries (see kernels.full_fill_intervals),
+        and degree days used for every interval come from one batched index lookup.
         
         Args:
-            customer_data: Delivery data for one customer
-            degree_days: Degree days DataFrame
+            merged: Deliveries with usable size, sorted by customer and date
+            degree_day_index: Cumulative degree day index
             
         Returns:
-            List of interval dictionaries
+            DataFrame with one row per interval
         """
-        intervals = []
-        full_fills = customer_data[customer_data['Is Full Fill']].copy()
+        customer_codes = merged[CUSTOMER_KEY].to_numpy()
+        dates = merged['Transaction Date'].to_numpy()
+        quantities = merged['Quantity'].to_numpy(dtype=float)
+        usable_sizes = merged['Usable Size'].to_numpy()
+        areas = merged['DDay Area'].to_numpy()
+        
+        starts, ends, total_gallons = kernels.full_fill_intervals(
+            customer_codes, dates, quantities, merged['Is Full Fill'].to_numpy(dtype=bool)
+        )
+        if len(starts) == 0:
+            return pd.DataFrame(columns=INTERVAL_COLUMNS)
         
-        if len(full_fills) < 2:
-            return intervals
+        start_dates = dates[starts]
+        end_dates = dates[ends]
+        degree_days_used, has_ddays = degree_day_index.degree_days_used(
+            start_dates, end_dates, areas[starts]
+        )
         
-        # Create intervals between consecutive full fills
-        for i in range(len(full_fills) - 1):
-            start_delivery = full_fills.iloc[i]
-            end_delivery = full_fills.iloc[i + 1]
-            
-            # Calculate degree days between deliveries
-            start_date = start_delivery['Transaction Date']
-            end_date = end_delivery['Transaction Date']
-            
-            # Get degree days for this interval
-            interval_ddays = degree_days[
-                (degree_days['DDay Date'] > start_date) & 
-                (degree_days['DDay Date'] <= end_date)
-            ]
-            
-            if len(interval_ddays) == 0:
-                continue
-            
-            # Calculate total gallons delivered in this interval
-            interval_deliveries = customer_data[
-                (customer_data['Transaction Date'] > start_date) & 
-                (customer_data['Transaction Date'] <= end_date)
-            ]
-            
-            total_gallons = interval_deliveries['Quantity'].sum()
-            
-            # Calculate degree days used in this interval (difference between start and end)
-            if len(interval_ddays) >= 2:
-                # Use difference between first and last degree day values
-                degree_days_used = interval_ddays['Heat Only DDays'].iloc[-1] - interval_ddays['Heat Only DDays'].iloc[0]
-            else:
-                # Fallback: use the single value if only one day
-                degree_days_used = interval_ddays['Heat Only DDays'].iloc[0]
-            
-            # Only include intervals with sufficient data
-            if degree_days_used > 0 and total_gallons > 0:
-                interval = {
-                    'Customer Number': start_delivery['Customer Number'],
-                    'Start Date': start_date,
-                    'End Date': end_date,
-                    'Start Delivery Gallons': start_delivery['Quantity'],
-                    'End Delivery Gallons': end_delivery['Quantity'],
-                    'Total Gallons': total_gallons,
-                    'Degree Days Used': degree_days_used,
-                    'Interval Days': (end_date - start_date).days,
-                    'Usable Size': start_delivery['Usable Size']
-                }
-                intervals.append(interval)
-        
-        return intervals
+        intervals = pd.DataFrame({
+            CUSTOMER_KEY: customer_codes[starts][has_ddays],
+            'Start Date': start_dates[has_ddays],
+            'End Date': end_dates[has_ddays],
+            'Start Delivery Gallons': quantities[starts][has_ddays],
+            'End Delivery Gallons': quantities[ends][has_ddays],
+            'Total Gallons': total_gallons[has_ddays],
+            'Degree Days Used': degree_days_used[has_ddays],
+            'Interval Days': (end_dates - start_dates)[has_ddays] // np.timedelta64(1, 'D'),
+            'Usable Size': usable_sizes[starts][has_ddays]
+        })
+        
+        # Only include intervals with sufficient data
+        sufficient = (intervals['Degree Days Used'] > 0) & (intervals['Total Gallons'] > 0)
+        return intervals[sufficient].reset_index(drop=True)
     
     def filter_valid_intervals(self, intervals: pd.DataFrame) -> pd.DataFrame:
         """
@@ -160,22 +161,42 @@ class IntervalBuilder:
         self.intervals = valid_intervals
         return valid_intervals
     
+    def set_customer_numbers(self, customer_fuel: pd.DataFrame):
+        """
+        Remember the customer numbers of the keys in customer_fuel.
+        
+        Args:
+            customer_fuel: Customer fuel DataFrame; frames without Customer Number
+                (sharded workers get keyed columns only) leave the mapping unchanged
+        """
+        if 'Customer Number' not in customer_fuel.columns:
+            return
+        keys = customer_fuel[CUSTOMER_KEY].to_numpy()
+        numbers = pd.Series(customer_fuel['Customer Number'].astype(str).to_numpy(), index=keys)
+        self.customer_numbers = numbers[~numbers.index.duplicated()]
+    
     def get_customer_summary(self) -> pd.DataFrame:
         """
         Get summary statistics by customer.
         
+        Intervals are grouped on their Customer Key and reported by Customer
+        Number, like the pipeline's outputs.
+        
         Returns:
-            DataFrame with customer-level statistics
+            DataFrame with customer-level statistics, indexed by Customer Number
         """
         if self.intervals is None or len(self.intervals) == 0:
             return pd.DataFrame()
+        if self.customer_numbers is None:
+            raise ValueError("Customer numbers are unknown; build the intervals from customer fuel data first")
         
-        summary = self.intervals.groupby('Customer Number').agg({
+        summary = self.intervals.groupby(CUSTOMER_KEY).agg({
             'Total Gallons': 'sum',
             'Degree Days Used': 'sum',
             'Interval Days': 'sum',
             'Interval Days': 'count',  # Number of intervals
             'Usable Size': 'first'
         }).rename(columns={'Interval Days': 'Interval Count'})
+        summary.index = pd.Index(self.customer_numbers.reindex(summary.index).to_numpy(), name='Customer Number')
         
         return summary
@@ -0,0 +1,288 @@
+"""
+Compute kernels for the FoxFuel K-Factor Optimizer.
+Full-fill interval scan, gallon sums and degree day lookups, with an optional
+Numba backend and a NumPy fallback.
+
+The Numba kernels walk the sorted tickets once, finding interval boundaries
+and summing gallons in the same loop, instead of building the intermediate
+masks and index arrays the NumPy versions need. Both backends return
+identical results. The backend is chosen by KERNEL_BACKEND in config.py:
+"auto" uses Numba when it is installed, "numba" and "numpy" force one (for
+benchmarking). Numba is only imported when its kernels are first used.
+"""
+
+import importlib.util
+from typing import Tuple
+
+import numpy as np
+
+from .config import *
+from .logger import get_logger
+
+logger = get_logger()
+
+KERNEL_BACKENDS = ("auto", "numba", "numpy")
+
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+_backend = None
+_jit_kernels = None
+
+def set_backend(backend: str) -> str:
+    """
+    Select the kernel backend.
+
+    Args:
+        backend: "auto", "numba" or "numpy"
+
+    Returns:
+        The backend in use, "numba" or "numpy"
+    """
+    global _backend
+    if backend not in KERNEL_BACKENDS:
+        raise ValueError(f"Unknown kernel backend '{backend}', expected one of {', '.join(KERNEL_BACKENDS)}")
+    if backend == "numba" and not NUMBA_AVAILABLE:
+        raise ImportError("The numba kernel backend needs the numba package (pip install numba)")
+    _backend = "numba" if backend == "auto" and NUMBA_AVAILABLE else ("numpy" if backend == "auto" else backend)
+    logger.debug(f"Kernel backend: {_backend}")
+    return _backend
+
+def get_backend() -> str:
+    """The kernel backend in use, selecting KERNEL_BACKEND on first use."""
+    if _backend is None:
+        set_backend(KERNEL_BACKEND)
+    return _backend
+
+def full_fill_intervals(customer_codes: np.ndarray, dates: np.ndarray, quantities: np.ndarray,
+                        is_full_fill: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pair consecutive full fills of each customer into intervals and sum their gallons.
+
+    Two consecutive full fills of the same customer on different dates form
+    an interval. Its gallons are the deliveries dated in (start, end]:
+    deliveries sharing a customer and date fall on the same side of a
+    boundary.
+
+    Args:
+        customer_codes: Integer customer code per delivery, sorted by customer and date
+        dates: datetime64 delivery dates
+        quantities: Delivered gallons (float64)
+        is_full_fill: Boolean full fill flag per delivery
+
+    Returns:
+        Tuple of (start rows, end rows, total gallons) per interval
+    """
+    if get_backend() == "numba":
+        return _jit()['full_fill_intervals'](
+            np.ascontiguousarray(customer_codes, dtype=np.int64), dates.view(np.int64),
+            np.ascontiguousarray(quantities, dtype=np.float64), np.ascontiguousarray(is_full_fill, dtype=np.bool_)
+        )
+    return _full_fill_intervals_numpy(customer_codes, dates, quantities, is_full_fill)
+
+def degree_days_between(dates: np.ndarray, values: np.ndarray, start_dates: np.ndarray,
+                        end_dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Degree days used in (start, end] windows of one area's cumulative values.
+
+    The difference between the last and first cumulative value in the window,
+    or the single value when only one day falls in it.
+
+    Args:
+        dates: Sorted datetime64 dates of the area's values
+        values: Cumulative degree day values aligned with dates
+        start_dates: Window starts, same dtype as dates
+        end_dates: Window ends, same dtype as dates
+
+    Returns:
+        Tuple of (degree days used, mask of windows with any values)
+    """
+    if get_backend() == "numba":
+        used = np.zeros(len(start_dates), dtype=values.dtype)
+        found = np.zeros(len(start_dates), dtype=np.bool_)
+        _jit()['degree_days_between'](dates.view(np.int64), values, start_dates.view(np.int64),
+                                      end_dates.view(np.int64), used, found)
+        return used, found
+    return _degree_days_between_numpy(dates, values, start_dates, end_dates)
+
+def _full_fill_intervals_numpy(customer_codes, dates, quantities, is_full_fill):
+    """NumPy version of full_fill_intervals: boundary masks and one segmented reduction."""
+    empty = np.array([], dtype=np.intp)
+    full_fills = np.flatnonzero(is_full_fill)
+    starts, ends = full_fills[:-1], full_fills[1:]
+    same_customer = customer_codes[starts] == customer_codes[ends]
+    starts, ends = starts[same_customer], ends[same_customer]
+
+    # An interval needs time to pass; same-day fills have no degree days
+    elapsed = dates[ends] > dates[starts]
+    starts, ends = starts[elapsed], ends[elapsed]
+    if len(starts) == 0:
+        return empty, empty, np.array([], dtype=np.float64)
+
+    # Each segment runs up to the last row of its boundary's customer and date
+    same_as_next = np.r_[(customer_codes[1:] == customer_codes[:-1]) & (dates[1:] == dates[:-1]), False]
+    run_ends = np.flatnonzero(~same_as_next)
+    run_ids = np.r_[0, np.cumsum(~same_as_next[:-1])]
+    last_of_date = run_ends[run_ids]
+
+    segment_bounds = np.column_stack([last_of_date[starts] + 1, last_of_date[ends] + 1]).ravel()
+    total_gallons = np.add.reduceat(np.r_[quantities, 0.0], segment_bounds)[::2]
+    return starts, ends, total_gallons
+
+def _degree_days_between_numpy(dates, values, start_dates, end_dates):
+    """NumPy version of degree_days_between: two binary searches per window."""
+    first = np.searchsorted(dates, start_dates, side='right')
+    last = np.searchsorted(dates, end_dates, side='right') - 1
+    found = last >= first
+
+    if len(values) == 0:
+        return np.zeros(len(start_dates), dtype=values.dtype), found
+
+    # Clip so windows without values still index safely; they are masked out
+    first = np.clip(first, 0, len(values) - 1)
+    last = np.clip(last, 0, len(values) - 1)
+    return np.where(last > first, values[last] - values[first], values[first]), found
+
+# Numba kernels, written as plain Python over int64 dates and compiled on first use
+
+def _block_sum(values, start, count):
+    """Sum up to 128 values the way NumPy's pairwise summation sums one block."""
+    if count < 8:
+        total = 0.0
+        for index in range(start, start + count):
+            total += values[index]
+        return total
+    r0, r1, r2, r3 = values[start], values[start + 1], values[start + 2], values[start + 3]
+    r4, r5, r6, r7 = values[start + 4], values[start + 5], values[start + 6], values[start + 7]
+    index = start + 8
+    unrolled_end = start + count - count % 8
+    while index < unrolled_end:
+        r0 += values[index]
+        r1 += values[index + 1]
+        r2 += values[index + 2]
+        r3 += values[index + 3]
+        r4 += values[index + 4]
+        r5 += values[index + 5]
+        r6 += values[index + 6]
+        r7 += values[index + 7]
+        index += 8
+    total = ((r0 + r1) + (r2 + r3)) + ((r4 + r5) + (r6 + r7))
+    for index in range(unrolled_end, start + count):
+        total += values[index]
+    return total
+
+def _pairwise_sum(values, start, count):
+    """
+    Sum values[start:start + count] in the order NumPy's add reduction uses.
+
+    np.add.reduceat sums each segment's values after the first with NumPy's
+    pairwise summation (eight running sums per block of up to 128 values,
+    blocks combined by halving), so the same order is kept here for
+    bit-identical gallons. The halving runs on an explicit stack rather than
+    by recursion, which Numba cannot cache.
+    """
+    if count <= 128:
+        return _block_sum(values, start, count)
+
+    # Frames are (start, count, phase); phase 0 splits, 1 keeps the left sum, 2 adds the right one
+    frame_starts = np.empty(64, dtype=np.int64)
+    frame_counts = np.empty(64, dtype=np.int64)
+    frame_phases = np.zeros(64, dtype=np.int64)
+    left_sums = np.empty(64, dtype=np.float64)
+    frame_starts[0], frame_counts[0] = start, count
+    top = 0
+    total = 0.0
+    while top >= 0:
+        frame_count = frame_counts[top]
+        if frame_count <= 128:
+            total = _block_sum(values, frame_starts[top], frame_count)
+            top -= 1
+            continue
+        half = frame_count // 2
+        half -= half % 8
+        phase = frame_phases[top]
+        if phase == 2:
+            total = left_sums[top] + total
+            top -= 1
+            continue
+        if phase == 1:
+            left_sums[top] = total
+            child_start, child_count = frame_starts[top] + half, frame_count - half
+        else:
+            child_start, child_count = frame_starts[top], half
+        frame_phases[top] = phase + 1
+        top += 1
+        frame_starts[top], frame_counts[top], frame_phases[top] = child_start, child_count, 0
+    return total
+
+def _full_fill_intervals_loop(customer_codes, dates, quantities, is_full_fill):
+    """Single pass over the deliveries, finding boundaries and summing each interval's gallons."""
+    n = len(customer_codes)
+
+    # Last row sharing each row's customer and date
+    last_of_date = np.empty(n, dtype=np.int64)
+    for row in range(n - 1, -1, -1):
+        if (row < n - 1 and customer_codes[row + 1] == customer_codes[row]
+                and dates[row + 1] == dates[row]):
+            last_of_date[row] = last_of_date[row + 1]
+        else:
+            last_of_date[row] = row
+
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    total_gallons = np.empty(n, dtype=np.float64)
+    count = 0
+    previous = -1
+    for row in range(n):
+        if not is_full_fill[row]:
+            continue
+        if previous >= 0 and customer_codes[previous] == customer_codes[row] and dates[row] > dates[previous]:
+            first_delivery = last_of_date[previous] + 1
+            count_deliveries = last_of_date[row] + 1 - first_delivery
+            gallons = quantities[first_delivery] + _pairwise_sum(quantities, first_delivery + 1, count_deliveries - 1)
+            starts[count] = previous
+            ends[count] = row
+            total_gallons[count] = gallons
+            count += 1
+        previous = row
+    return starts[:count], ends[:count], total_gallons[:count]
+
+def _search_right(dates, date):
+    """Index of the first of the sorted dates after date (np.searchsorted side='right')."""
+    low, high = 0, len(dates)
+    while low < high:
+        middle = (low + high) // 2
+        if dates[middle] <= date:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+def _degree_days_between_loop(dates, values, start_dates, end_dates, used, found):
+    """Binary searches and difference per window, without intermediate arrays."""
+    size = len(values)
+    for window in range(len(start_dates)):
+        first = _search_right(dates, start_dates[window])
+        last = _search_right(dates, end_dates[window]) - 1
+        found[window] = last >= first
+        if size == 0:
+            continue
+        first = min(max(first, 0), size - 1)
+        last = min(max(last, 0), size - 1)
+        used[window] = values[last] - values[first] if last > first else values[first]
+
+def _jit() -> dict:
+    """Compile the Numba kernels on first use; compiled code is cached on disk by Numba."""
+    global _jit_kernels
+    if _jit_kernels is None:
+        import numba
+        global _block_sum, _pairwise_sum, _search_right
+        # The kernels call these helpers through their module globals
+        _block_sum = numba.njit(cache=True, nogil=True)(_block_sum)
+        _pairwise_sum = numba.njit(cache=True, nogil=True)(_pairwise_sum)
+        _search_right = numba.njit(cache=True, nogil=True)(_search_right)
+        _jit_kernels = {
+            'full_fill_intervals': numba.njit(cache=True, nogil=True)(_full_fill_intervals_loop),
+            'degree_days_between': numba.njit(cache=True, nogil=True)(_degree_days_between_loop)
+        }
+        logger.debug(f"Compiled kernels with numba {numba.__version__}")
+    return _jit_kernels
@@ -8,6 +8,7 @@ import numpy as np
 from typing import Tuple
 
 from .config import *
+from .customer_keys import CUSTOMER_KEY
 from .logger import get_logger
 
 logger = get_logger()
@@ -18,6 +19,7 @@ class KFactorCalculator:
     def __init__(self):
         self.interval_k_factors = None
         self.customer_k_factors = None
+        self.population_maxima = None
         
     def calculate_interval_k_factors(self, intervals: pd.DataFrame) -> pd.DataFrame:
         """
@@ -66,18 +68,22 @@ class KFactorCalculator:
         
         logger.info("Calculating weighted K-factors by customer...")
         
-        # Group by customer and calculate weighted average
-        customer_stats = interval_k_factors.groupby('Customer Number').agg({
-            'Total Gallons': ['sum', 'count'],
-            'Interval K Factor': lambda x: np.average(x, weights=interval_k_factors.loc[x.index, 'Total Gallons']),
-            'Degree Days Used': 'sum',
-            'Usable Size': 'first'
-        }).round(4)
-        
-        # Flatten column names
-        customer_stats.columns = ['Total Gallons', 'Interval Count', 'Weighted K Factor', 'Total Degree Days', 'Usable Size']
-        
-        # Reset index to make Customer Number a column
+        # Group by customer; the gallons-weighted K is sum(K * gallons) / sum(gallons),
+        # so every column comes from one grouped aggregation without per-customer calls
+        weighted = interval_k_factors.assign(
+            **{'K Gallons': interval_k_factors['Interval K Factor'] * interval_k_factors['Total Gallons']}
+        )
+        customer_stats = weighted.groupby(CUSTOMER_KEY).agg(**{
+            'Total Gallons': ('Total Gallons', 'sum'),
+            'Interval Count': ('Total Gallons', 'count'),
+            'K Gallons': ('K Gallons', 'sum'),
+            'Total Degree Days': ('Degree Days Used', 'sum'),
+            'Usable Size': ('Usable Size', 'first')
+        })
+        customer_stats.insert(2, 'Weighted K Factor', customer_stats.pop('K Gallons') / customer_stats['Total Gallons'])
+        customer_stats = customer_stats.round(4)
+        
+        # Reset index to make Customer Key a column
         customer_stats = customer_stats.reset_index()
         
         self.customer_k_factors = customer_stats
@@ -85,33 +91,82 @@ class KFactorCalculator:
         logger.info(f"Calculated weighted K-factors for {len(customer_stats)} customers")
         return customer_stats
     
-    def calculate_variance(self, customer_fuel: pd.DataFrame, customer_k_factors: pd.DataFrame) -> pd.DataFrame:
+    def calculate_from_interval_stream(self, interval_batches) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Calculate interval and weighted K-factors from a stream of interval batches.
+        
+        Each batch must contain all intervals of its customers, so weighted K can
+        be completed per batch and only customer-level results are combined.
+        
+        Args:
+            interval_batches: Iterable of interval DataFrames
+            
+        Returns:
+            Tuple of (interval K-factors, customer K-factors) ordered by customer
+        """
+        interval_parts = []
+        customer_parts = []
+        for intervals in interval_batches:
+            interval_k_factors = self.calculate_interval_k_factors(intervals)
+            if len(interval_k_factors) == 0:
+                continue
+            interval_parts.append(interval_k_factors)
+            customer_parts.append(self.calculate_weighted_k_by_customer(interval_k_factors))
+        
+        if not interval_parts:
+            self.interval_k_factors = pd.DataFrame()
+            self.customer_k_factors = pd.DataFrame()
+            return self.interval_k_factors, self.customer_k_factors
+        
+        # Batches hold disjoint customers; a stable sort restores single-pass order
+        self.interval_k_factors = pd.concat(interval_parts, ignore_index=True).sort_values(
+            CUSTOMER_KEY, kind='mergesort').reset_index(drop=True)
+        self.customer_k_factors = pd.concat(customer_parts, ignore_index=True).sort_values(
+            CUSTOMER_KEY, kind='mergesort').reset_index(drop=True)
+        
+        logger.info(f"Calculated weighted K-factors for {len(self.customer_k_factors)} customers "
+                    f"from {len(interval_parts)} interval batches")
+        return self.interval_k_factors, self.customer_k_factors
+    
+    def calculate_variance(self, customer_fuel: pd.DataFrame, customer_k_factors: pd.DataFrame,
+                           population_maxima: dict = None) -> pd.DataFrame:
         """
         Calculate variance between weighted K and winter K for each customer.
         
         Args:
             customer_fuel: Customer fuel DataFrame with Winter K values
             customer_k_factors: Customer K-factors DataFrame
+            population_maxima: Interval count and gallon maxima used to scale confidence;
+                taken from customer_k_factors when not given
             
         Returns:
             DataFrame with variance calculations
         """
         logger.info("Calculating K-factor variance...")
         
-        # Merge customer fuel with calculated K-factors
+        # Merge customer fuel with calculated K-factors, restoring customer numbers from the key
         merged = customer_k_factors.merge(
-            customer_fuel[['Customer Number', 'K Factor - Winter', 'K Factor']], 
-            on='Customer Number', 
+            customer_fuel[[CUSTOMER_KEY, 'Customer Number', 'K Factor - Winter', 'K Factor']], 
+            on=CUSTOMER_KEY, 
             how='inner'
         )
+        # Customer Number leads as before; the key stays last for sorting the outputs
+        merged.insert(0, 'Customer Number', merged.pop('Customer Number'))
+        merged[CUSTOMER_KEY] = merged.pop(CUSTOMER_KEY)
         
         # Calculate variance percentage (using Winter K-factor as baseline)
         merged['Variance Percent'] = ((merged['Weighted K Factor'] - merged['K Factor - Winter']) / merged['K Factor - Winter']) * 100
         
         # Calculate confidence score based on interval count and total gallons
         # More intervals and more gallons = higher confidence
-        max_intervals = merged['Interval Count'].max()
-        max_gallons = merged['Total Gallons'].max()
+        if population_maxima is None:
+            population_maxima = {
+                'max_intervals': merged['Interval Count'].max(),
+                'max_gallons': merged['Total Gallons'].max()
+            }
+        self.population_maxima = population_maxima
+        max_intervals = population_maxima['max_intervals']
+        max_gallons = population_maxima['max_gallons']
         
         if max_intervals > 0 and max_gallons > 0:
             merged['Confidence'] = (
@@ -3,27 +3,50 @@ Logging configuration for the FoxFuel K-Factor Optimizer.
 Uses loguru for clean, readable output.
 """
 
-from loguru import logger
 import sys
+from functools import lru_cache
 from pathlib import Path
 
-def setup_logger(log_level="INFO", log_file=None):
+@lru_cache(maxsize=None)
+def _loguru():
+    """Import the loguru logger on first use."""
+    from loguru import logger
+    return logger
+
+class _LazyLogger:
+    """
+    Stands in for the loguru logger so importing a module does not load loguru.
+    
+    Attribute access is forwarded, so log calls still run in the caller's
+    frame and keep their module, function and line.
+    """
+    
+    def __getattr__(self, name):
+        return getattr(_loguru(), name)
+
+logger = _LazyLogger()
+
+def setup_logger(log_level="INFO", log_file=None, stream=None, colorize=True):
     """
     Configure logging for the K-Factor Optimizer.
     
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR)
         log_file: Optional log file path
+        stream: Console stream (default: sys.stdout)
+        colorize: Color console output; None colors only terminals
     """
+    logger = _loguru()
+    
     # Remove default handler
     logger.remove()
     
     # Console output with colors
     logger.add(
-        sys.stdout,
+        stream or sys.stdout,
         level=log_level,
         format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        colorize=True
+        colorize=colorize
     )
     
     # Optional file logging
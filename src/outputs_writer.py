@@ -4,17 +4,47 @@ Generates Apply_K_ThisWeek.csv and K_Review_Queue.xlsx files.
 """
 
 import pandas as pd
+import numpy as np
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
+from types import SimpleNamespace
 
 from .config import *
+from .customer_keys import CUSTOMER_KEY
 from .logger import get_logger
 
 logger = get_logger()
 
+# Review sheet rows written between progress reports
+REVIEW_PROGRESS_ROWS = 5000
+
+# openpyxl is imported on first workbook write, so CSV-only and headless
+# callers do not pay for it at startup
+
+@lru_cache(maxsize=None)
+def _styles() -> SimpleNamespace:
+    """Styles shared by every cell that uses them, created on first use."""
+    from openpyxl.styles import Font, PatternFill
+
+    def solid_fill(color: str) -> PatternFill:
+        return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+    return SimpleNamespace(
+        HEADER_FONT=Font(bold=True, color="FFFFFF"),
+        HEADER_FILL=solid_fill("366092"),
+        BOLD_FONT=Font(bold=True),
+        TITLE_FONT=Font(bold=True, size=14),
+        RUN_OUT_RISK_FONT=Font(bold=True, color="FF0000"),
+        STATUS_FILLS={
+            'HIGH_VARIANCE': solid_fill("FFE6E6"),  # Light red
+            'LOW_CONFIDENCE': solid_fill("FFF2CC"),  # Light yellow
+            'INSUFFICIENT_DATA': solid_fill("E6F3FF")  # Light blue
+        },
+        CAPPED_FILL=solid_fill("F0F0F0"),  # Light gray
+        APPROVED_FILL=solid_fill("E6FFE6")  # Light green
+    )
+
 class OutputsWriter:
     """Handles generation of output files for Ignite import and manual review."""
     
@@ -41,13 +71,13 @@ class OutputsWriter:
             pd.DataFrame(columns=['Customer Number', 'K Factor - Winter']).to_csv(output_file, index=False)
             return output_file
         
+        # Sort by customer number; keys are in customer number order and sort as integers
+        auto_apply_data = auto_apply_data.sort_values(CUSTOMER_KEY)
+        
         # Create the import file (focus on Winter K-factor updates)
         import_data = auto_apply_data[['Customer Number', 'Proposed K Factor']].copy()
         import_data.columns = ['Customer Number', 'K Factor - Winter']
         
-        # Sort by customer number
-        import_data = import_data.sort_values('Customer Number')
-        
         # Write to CSV
         output_file = self.output_dir / "Apply_K_ThisWeek.csv"
         import_data.to_csv(output_file, index=False)
@@ -55,17 +85,19 @@ class OutputsWriter:
         logger.info(f"Generated Apply_K_ThisWeek.csv with {len(import_data)} customers")
         return output_file
     
-    def write_k_review_queue(self, governed_data: pd.DataFrame) -> Path:
+    def write_k_review_queue(self, governed_data: pd.DataFrame, progress=None) -> Path:
         """
         Generate K_Review_Queue.xlsx with comprehensive review information.
         
         Args:
             governed_data: DataFrame with all governed K-factors
+            progress: Optional callable taking the share of review rows written (0 to 1)
             
         Returns:
             Path to the generated Excel file
         """
         logger.info("Generating K_Review_Queue.xlsx...")
+        from openpyxl import Workbook
         
         if governed_data is None or len(governed_data) == 0:
             logger.warning("No governed data provided")
@@ -82,14 +114,11 @@ class OutputsWriter:
                 logger.warning(f"Original file locked, saved as: {backup_file.name}")
                 return backup_file
         
-        # Create workbook
-        wb = Workbook()
-        
-        # Remove default sheet
-        wb.remove(wb.active)
+        # Write-only workbook: rows are streamed to disk as they are appended
+        wb = Workbook(write_only=True)
         
         # Create main review sheet
-        self._create_review_sheet(wb, governed_data)
+        self._create_review_sheet(wb, governed_data, progress)
         
         # Create summary sheet
         self._create_summary_sheet(wb, governed_data)
@@ -113,7 +142,7 @@ class OutputsWriter:
             logger.warning(f"Original file locked, saved as: {backup_file.name}")
             return backup_file
     
-    def _create_review_sheet(self, wb: Workbook, governed_data: pd.DataFrame):
+    def _create_review_sheet(self, wb: 'Workbook', governed_data: pd.DataFrame, progress=None):
         """Create the main review sheet with conditional formatting."""
         
         ws = wb.create_sheet("K Review Queue")
@@ -144,69 +173,70 @@ class OutputsWriter:
             'Total Degree Days', 'Run-Out Risk'
         ]
         
-        # Write headers
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.font = Font(bold=True, color="FFFFFF")
+        review_data['Run-Out Risk'] = np.where(review_data['Run-Out Risk'], "YES", "NO")
+        rows = review_data[[
+            'Customer Number', 'K Factor - Winter', 'Weighted K Factor', 'Proposed K Factor',
+            'Final Variance Percent', 'Final Status', 'Confidence', 'Interval Count',
+            'Total Gallons', 'Total Degree Days', 'Run-Out Risk'
+        ]]
         
-        # Write data
-        for row_idx, (_, row) in enumerate(review_data.iterrows(), 2):
-            ws.cell(row=row_idx, column=1, value=row['Customer Number'])
-            ws.cell(row=row_idx, column=2, value=row['K Factor - Winter'])
-            ws.cell(row=row_idx, column=3, value=row['Weighted K Factor'])
-            ws.cell(row=row_idx, column=4, value=row['Proposed K Factor'])
-            ws.cell(row=row_idx, column=5, value=row['Final Variance Percent'])
-            ws.cell(row=row_idx, column=6, value=row['Final Status'])
-            ws.cell(row=row_idx, column=7, value=row['Confidence'])
-            ws.cell(row=row_idx, column=8, value=row['Interval Count'])
-            ws.cell(row=row_idx, column=9, value=row['Total Gallons'])
-            ws.cell(row=row_idx, column=10, value=row['Total Degree Days'])
-            ws.cell(row=row_idx, column=11, value="YES" if row['Run-Out Risk'] else "NO")
-            
-            # Apply conditional formatting
-            self._apply_row_formatting(ws, row_idx, row)
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 20)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        # Column widths have to be set before the first row is streamed
+        self._set_column_widths(ws, headers, rows)
+        
+        # Write headers
+        styles = _styles()
+        ws.append([self._styled_cell(ws, header, font=styles.HEADER_FONT, fill=styles.HEADER_FILL)
+                   for header in headers])
+        
+        # Write data one row at a time; colors come from sheet-level rules
+        for row_number, values in enumerate(rows.itertuples(index=False, name=None), 1):
+            ws.append(values)
+            # Serializing rows is most of the workbook's time
+            if progress is not None and row_number % REVIEW_PROGRESS_ROWS == 0:
+                progress(row_number / len(rows))
+        
+        self._apply_conditional_formatting(ws, len(rows))
+    
+    def _set_column_widths(self, ws, headers: list, rows: pd.DataFrame):
+        """Size columns to their longest header or value, capped at 20 characters."""
+        from openpyxl.utils import get_column_letter
+        for col, (header, column) in enumerate(zip(headers, rows.columns), 1):
+            max_length = len(header)
+            if len(rows) > 0:
+                max_length = max(max_length, rows[column].astype(str).str.len().max())
+            ws.column_dimensions[get_column_letter(col)].width = min(max_length + 2, 20)
     
-    def _apply_row_formatting(self, ws, row_idx: int, row_data: pd.Series):
-        """Apply conditional formatting to a row based on status and variance."""
-        
-        # Color coding based on status
-        if row_data['Final Status'] == 'HIGH_VARIANCE':
-            fill_color = "FFE6E6"  # Light red
-        elif row_data['Final Status'] == 'LOW_CONFIDENCE':
-            fill_color = "FFF2CC"  # Light yellow
-        elif row_data['Final Status'] == 'INSUFFICIENT_DATA':
-            fill_color = "E6F3FF"  # Light blue
-        elif 'CAPPED' in row_data['Final Status']:
-            fill_color = "F0F0F0"  # Light gray
-        else:
-            fill_color = "E6FFE6"  # Light green
-        
-        # Apply fill to entire row
-        for col in range(1, 12):
-            ws.cell(row=row_idx, column=col).fill = PatternFill(
-                start_color=fill_color, end_color=fill_color, fill_type="solid"
-            )
-        
-        # Highlight run-out risk
-        if row_data['Run-Out Risk']:
-            ws.cell(row=row_idx, column=11).font = Font(bold=True, color="FF0000")
+    def _styled_cell(self, ws, value, font: 'Font' = None, fill: 'PatternFill' = None) -> 'WriteOnlyCell':
+        """Create a write-only cell with shared styles."""
+        from openpyxl.cell import WriteOnlyCell
+        cell = WriteOnlyCell(ws, value=value)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        return cell
     
-    def _create_summary_sheet(self, wb: Workbook, governed_data: pd.DataFrame):
+    def _apply_conditional_formatting(self, ws, row_count: int):
+        """Color rows by status and highlight run-out risk with sheet-level rules."""
+        if row_count == 0:
+            return
+        last_row = row_count + 1
+        from openpyxl.formatting.rule import FormulaRule
+        styles = _styles()
+        
+        # Highlight run-out risk (font only, so it combines with the row fill)
+        ws.conditional_formatting.add(
+            f"K2:K{last_row}", FormulaRule(formula=['$K2="YES"'], font=styles.RUN_OUT_RISK_FONT)
+        )
+        
+        # Color coding based on status; earlier rules take precedence
+        row_range = f"A2:K{last_row}"
+        for status, fill in styles.STATUS_FILLS.items():
+            ws.conditional_formatting.add(row_range, FormulaRule(formula=[f'$F2="{status}"'], fill=fill))
+        ws.conditional_formatting.add(row_range, FormulaRule(formula=['ISNUMBER(FIND("CAPPED",$F2))'], fill=styles.CAPPED_FILL))
+        ws.conditional_formatting.add(row_range, FormulaRule(formula=['$F2<>""'], fill=styles.APPROVED_FILL))
+    
+    def _create_summary_sheet(self, wb: 'Workbook', governed_data: pd.DataFrame):
         """Create summary statistics sheet."""
         
         ws = wb.create_sheet("Summary")
@@ -241,34 +271,31 @@ class OutputsWriter:
             ["Average Confidence:", f"{avg_confidence:.3f}"],
         ]
         
+        styles = _styles()
         for row_idx, (label, value) in enumerate(summary_data, 1):
-            ws.cell(row=row_idx, column=1, value=label)
-            ws.cell(row=row_idx, column=2, value=value)
-            
             if row_idx == 1:  # Title
-                ws.cell(row=row_idx, column=1).font = Font(bold=True, size=14)
+                label_font = styles.TITLE_FONT
             elif label.endswith(":"):  # Labels
-                ws.cell(row=row_idx, column=1).font = Font(bold=True)
+                label_font = styles.BOLD_FONT
+            else:
+                label_font = None
+            ws.append([self._styled_cell(ws, label, font=label_font), value])
     
-    def _create_auto_apply_sheet(self, wb: Workbook, auto_apply_data: pd.DataFrame):
+    def _create_auto_apply_sheet(self, wb: 'Workbook', auto_apply_data: pd.DataFrame):
         """Create auto-apply sheet for easy reference."""
         
         ws = wb.create_sheet("Auto-Apply")
         
         # Write headers
         headers = ['Customer Number', 'Current Winter K Factor', 'Proposed Winter K Factor', 'Variance %']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.font = Font(bold=True, color="FFFFFF")
+        styles = _styles()
+        ws.append([self._styled_cell(ws, header, font=styles.HEADER_FONT, fill=styles.HEADER_FILL)
+                   for header in headers])
         
         # Write data
-        for row_idx, (_, row) in enumerate(auto_apply_data.iterrows(), 2):
-            ws.cell(row=row_idx, column=1, value=row['Customer Number'])
-            ws.cell(row=row_idx, column=2, value=row['K Factor - Winter'])
-            ws.cell(row=row_idx, column=3, value=row['Proposed K Factor'])
-            ws.cell(row=row_idx, column=4, value=row['Final Variance Percent'])
+        rows = auto_apply_data[['Customer Number', 'K Factor - Winter', 'Proposed K Factor', 'Final Variance Percent']]
+        for values in rows.itertuples(index=False, name=None):
+            ws.append(values)
     
     def _filter_auto_apply(self, governed_data: pd.DataFrame) -> pd.DataFrame:
         """Filter customers eligible for auto-apply."""
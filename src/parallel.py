@@ -0,0 +1,216 @@
+"""
+Parallel execution module for the FoxFuel K-Factor Optimizer.
+Runs the per-customer interval and K-factor steps on customer shards in a process pool.
+"""
+
+import pandas as pd
+import numpy as np
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+from .config import *
+from .degree_days import DegreeDayIndex
+from .interval_builder import IntervalBuilder, INTERVAL_TICKET_COLUMNS
+from .customer_keys import CUSTOMER_KEY
+from .kfactor_calculator import KFactorCalculator
+from .logger import get_logger
+
+logger = get_logger()
+
+# Degree day index attached by each worker process
+_worker_index = None
+_worker_memory = None
+
+def customer_shards(customer_keys: pd.Series, workers: int) -> np.ndarray:
+    """
+    Assign customers to shards by their customer key.
+
+    Keys are dense, so consecutive customers go to different shards and
+    shards get similar numbers of customers.
+
+    Args:
+        customer_keys: Series of customer keys
+        workers: Number of shards
+
+    Returns:
+        Array of shard numbers aligned with customer_keys
+    """
+    return np.mod(customer_keys.to_numpy(dtype=np.int64), workers)
+
+class SharedDegreeDayIndex:
+    """Degree day index arrays placed in shared memory for read-only use by workers."""
+
+    def __init__(self, index: DegreeDayIndex):
+        self.layout = {}
+        offset = 0
+        for area, (dates, values) in index.areas.items():
+            self.layout[area] = (offset, len(dates), str(dates.dtype))
+            offset += len(dates)
+
+        # All areas' dates (as int64) are stored first, followed by all their values
+        self.values_dtype = str(index.dtype)
+        self.length = offset
+        size = offset * (8 + index.dtype.itemsize)
+        self.memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+        dates_block, values_block = self._blocks(self.memory.buf, self.length, self.values_dtype)
+        for area, (dates, values) in index.areas.items():
+            start, count, _ = self.layout[area]
+            dates_block[start:start + count] = dates.view(np.int64)
+            values_block[start:start + count] = values
+
+    @staticmethod
+    def _blocks(buffer, length: int, values_dtype: str) -> Tuple[np.ndarray, np.ndarray]:
+        """View a shared buffer as the dates block followed by the values block."""
+        dates_block = np.ndarray((length,), dtype=np.int64, buffer=buffer)
+        values_block = np.ndarray((length,), dtype=values_dtype, buffer=buffer, offset=length * 8)
+        return dates_block, values_block
+
+    def spec(self) -> dict:
+        """Picklable description workers use to attach to the shared arrays."""
+        return {
+            'name': self.memory.name,
+            'layout': self.layout,
+            'values_dtype': self.values_dtype,
+            'length': self.length
+        }
+
+    @classmethod
+    def attach(cls, spec: dict):
+        """
+        Attach to shared arrays described by spec.
+
+        Returns:
+            Tuple of (DegreeDayIndex viewing the shared arrays, SharedMemory handle)
+        """
+        try:
+            memory = shared_memory.SharedMemory(name=spec['name'], track=False)
+        except TypeError:
+            # Before Python 3.13 attaching also registers the block with the resource
+            # tracker the workers share with the parent; the parent's unlink clears it
+            memory = shared_memory.SharedMemory(name=spec['name'])
+
+        dates_block, values_block = cls._blocks(memory.buf, spec['length'], spec['values_dtype'])
+        areas = {}
+        for area, (start, count, dates_dtype) in spec['layout'].items():
+            areas[area] = (
+                dates_block[start:start + count].view(dates_dtype),
+                values_block[start:start + count]
+            )
+        return DegreeDayIndex.from_arrays(areas, spec['values_dtype']), memory
+
+    def close(self):
+        """Release and remove the shared memory block."""
+        self.memory.close()
+        self.memory.unlink()
+
+def _init_worker(spec: dict):
+    """Attach the shared degree day index in a worker process."""
+    global _worker_index, _worker_memory
+    _worker_index, _worker_memory = SharedDegreeDayIndex.attach(spec)
+
+    # Keep worker output to warnings; the parent logs progress
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    # A parent that is killed (a GUI run terminated after cancelling) cannot shut
+    # the pool down, so workers watch it instead of idling on as orphans
+    parent = multiprocessing.parent_process()
+    if parent is not None:
+        threading.Thread(target=_exit_with_parent, args=(parent,), daemon=True).start()
+
+def _exit_with_parent(parent):
+    """Exit the worker process once its parent has exited."""
+    parent.join()
+    os._exit(1)
+
+def _run_shard(customer_fuel: pd.DataFrame,
+               delivery_tickets: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Run interval building through weighted K for one shard of customers."""
+    interval_builder = IntervalBuilder()
+    kfactor_calculator = KFactorCalculator()
+
+    intervals = interval_builder.build_intervals(customer_fuel, delivery_tickets, _worker_index)
+    intervals = interval_builder.filter_valid_intervals(intervals)
+    interval_k_factors = kfactor_calculator.calculate_interval_k_factors(intervals)
+    customer_k_factors = kfactor_calculator.calculate_weighted_k_by_customer(interval_k_factors)
+
+    return intervals, interval_k_factors, customer_k_factors
+
+def _merge_by_customer(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate shard results into the order a serial run produces."""
+    frames = [frame for frame in frames if len(frame) > 0]
+    if not frames:
+        return pd.DataFrame()
+    merged = pd.concat(frames, ignore_index=True)
+    return merged.sort_values(CUSTOMER_KEY, kind='mergesort').reset_index(drop=True)
+
+class ShardedExecutor:
+    """Hash-partitions customers across worker processes for the per-customer steps."""
+
+    def __init__(self, workers: int = PIPELINE_WORKERS):
+        self.workers = max(1, int(workers))
+
+    def run(self, customer_fuel: pd.DataFrame, delivery_tickets: pd.DataFrame,
+            degree_days: pd.DataFrame, progress=None) -> Dict[str, pd.DataFrame]:
+        """
+        Build intervals and K-factors for all customers across worker processes.
+
+        Results are merged in customer order, matching a serial run, before
+        variance and governance, which need population-wide values.
+
+        Args:
+            customer_fuel: Customer fuel DataFrame
+            delivery_tickets: Delivery tickets DataFrame
+            degree_days: Degree days DataFrame
+            progress: Optional callable taking the share of shards finished (0 to 1); an
+                exception it raises (cancellation) stops the run
+
+        Returns:
+            Dictionary with intervals, interval_k_factors and customer_k_factors
+        """
+        fuel_shards = customer_shards(customer_fuel[CUSTOMER_KEY], self.workers)
+        ticket_shards = customer_shards(delivery_tickets[CUSTOMER_KEY], self.workers)
+        # Workers only need the keyed columns, which keeps what is pickled to them small
+        customer_fuel = customer_fuel[[CUSTOMER_KEY, 'Usable Size', 'Zone - Fuel']]
+        delivery_tickets = delivery_tickets[INTERVAL_TICKET_COLUMNS]
+        shards = [
+            (customer_fuel[fuel_shards == shard], delivery_tickets[ticket_shards == shard])
+            for shard in range(self.workers)
+        ]
+        logger.info(f"Running {self.workers} customer shards "
+                    f"({', '.join(str(len(tickets)) for _, tickets in shards)} tickets)")
+
+        shared_index = SharedDegreeDayIndex(DegreeDayIndex(degree_days))
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(shared_index.spec(),)) as executor:
+                futures = [executor.submit(_run_shard, *shard) for shard in shards]
+                try:
+                    for finished, _ in enumerate(as_completed(futures), 1):
+                        if progress is not None:
+                            progress(finished / len(futures))
+                except BaseException:
+                    # A cancelled run drops shards that have not started; running ones finish first
+                    for future in futures:
+                        future.cancel()
+                    raise
+                # Results are taken in shard order, keeping the merge deterministic
+                results = [future.result() for future in futures]
+        finally:
+            shared_index.close()
+
+        intervals, interval_k_factors, customer_k_factors = zip(*results)
+        merged = {
+            'intervals': _merge_by_customer(intervals),
+            'interval_k_factors': _merge_by_customer(interval_k_factors),
+            'customer_k_factors': _merge_by_customer(customer_k_factors)
+        }
+        logger.info(f"Merged {len(merged['intervals'])} intervals and "
+                    f"{len(merged['customer_k_factors'])} customer K-factors from {self.workers} shards")
+        return merged
@@ -3,34 +3,81 @@ Main pipeline module for the FoxFuel K-Factor Optimizer.
 Orchestrates the 8-step transformation workflow.
 """
 
-import pandas as pd
+import cProfile
 from pathlib import Path
 from datetime import datetime
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List, Optional
 
-from .data_loader import DataLoader
-from .interval_builder import IntervalBuilder
-from .kfactor_calculator import KFactorCalculator
-from .governance import GovernanceEngine
-from .outputs_writer import OutputsWriter
+from .profiling import PipelineProfiler, save_cprofile, top_functions, format_top_functions
+from .events import ProgressTracker, PipelineCancelled
 from .logger import get_logger
 from .config import *
 
 logger = get_logger()
 
+# Typical share of run time per step (100,000 customer benchmark), weighting the progress events
+STEP_PROGRESS_WEIGHTS = {
+    'load_inputs': 20, 'customer_fuel': 1, 'delivery_tickets': 18, 'degree_days': 1,
+    'build_intervals': 8, 'intervals': 8, 'filter_intervals': 0.3, 'valid_intervals': 0.3,
+    'sharded_intervals_and_k_factors': 8, 'stream_intervals_and_k_factors': 28,
+    'interval_k_factors': 0.2, 'weighted_k': 0.4, 'customer_k_factors': 0.4,
+    'governance': 0.3, 'variance': 0.2, 'governed': 0.1,
+    'apply_k_this_week': 0.1, 'k_review_queue': 70
+}
+
 class KFactorPipeline:
     """Main pipeline orchestrating the K-Factor optimization process."""
     
-    def __init__(self, input_dir: str = INPUT_DIR, output_dir: str = OUTPUT_DIR):
+    def __init__(self, input_dir: str = INPUT_DIR, output_dir: str = OUTPUT_DIR,
+                 incremental: bool = False, workers: int = PIPELINE_WORKERS,
+                 streaming: bool = False, profile_memory: bool = False, profile: bool = False,
+                 cached_stages: bool = STAGE_CACHE_ENABLED, data_loader=None, events=None,
+                 cancel_event=None):
         self.input_dir = input_dir
         self.output_dir = output_dir
+        self.incremental = incremental
+        self.streaming = streaming
+        self.workers = max(1, int(workers))
+        self.profile_memory = profile_memory
+        self.profile = profile
+        # Optional events.EventBus receiving step, progress and log events (used by the GUI)
+        self.events = events
+        # Optional Event; once set the run stops at the next step, shard or partition boundary
+        self.cancel_event = cancel_event
+        self.progress = None
+        
+        # Stage modules load pandas and numpy, so they are imported when a
+        # pipeline is created rather than when this module is imported
+        from .data_loader import DataLoader
+        from .interval_builder import IntervalBuilder
+        from .kfactor_calculator import KFactorCalculator
+        from .governance import GovernanceEngine
+        from .outputs_writer import OutputsWriter
         
-        # Initialize components
-        self.data_loader = DataLoader(input_dir)
+        # Initialize components; a loader that prefetched the inputs lets the run skip parsing them
+        self.data_loader = data_loader if data_loader is not None else DataLoader(input_dir)
         self.interval_builder = IntervalBuilder()
         self.kfactor_calculator = KFactorCalculator()
         self.governance_engine = GovernanceEngine()
         self.outputs_writer = OutputsWriter(output_dir)
+        self.incremental_store = None
+        if incremental:
+            from .incremental import IncrementalIntervalStore
+            self.incremental_store = IncrementalIntervalStore()
+        self.sharded_executor = None
+        if streaming and (incremental or self.workers > 1):
+            logger.warning("Streaming runs process one partition at a time; ignoring incremental and workers")
+            self.incremental_store = None
+        elif self.workers > 1:
+            if incremental:
+                logger.warning("Incremental runs rebuild few customers and run serially; ignoring workers")
+            else:
+                from .parallel import ShardedExecutor
+                self.sharded_executor = ShardedExecutor(self.workers)
+        # Incremental, sharded and streaming runs have their own reuse and memory strategies
+        self.cached_stages = (cached_stages and self.incremental_store is None
+                              and self.sharded_executor is None and not streaming)
+        self.stage_graph = None
         
         # Pipeline state
         self.customer_fuel = None
@@ -42,75 +89,337 @@ class KFactorPipeline:
         self.variance_data = None
         self.governed_data = None
         self.auto_apply_data = None
+        self.profiler = None
+        self.profile_file = None
         
     def run_pipeline(self) -> Dict[str, any]:
         """
         Execute the complete 8-step K-Factor optimization pipeline.
         
+        With profile=True the run is wrapped in cProfile; the .prof file is
+        saved in the output directory and the hottest functions are logged.
+        Work done in sharded worker processes is not included.
+        
         Returns:
             Dictionary with pipeline results and statistics
         """
+        if self.events is None:
+            return self._run_profiled()
+        
+        # Log records of the run are published too, for the GUI log
+        sink_id = logger.add(self.events.log_sink, level="INFO", format="{message}")
+        try:
+            return self._run_profiled()
+        finally:
+            logger.remove(sink_id)
+    
+    def _run_profiled(self) -> Dict[str, any]:
+        """Run the steps, under cProfile when profile=True."""
+        if not self.profile:
+            return self._run_steps()
+        
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            results = self._run_steps()
+        finally:
+            profiler.disable()
+        
+        self.profile_file = save_cprofile(profiler, self.output_dir, datetime.now().strftime('%Y%m%d_%H%M%S'))
+        hot_functions = top_functions(profiler)
+        logger.info(f"cProfile saved to {self.profile_file}")
+        logger.info(f"Top functions by cumulative time:\n{format_top_functions(hot_functions)}")
+        results['profile_file'] = str(self.profile_file)
+        results['top_functions'] = hot_functions
+        return results
+    
+    def _run_steps(self) -> Dict[str, any]:
+        """Run the 8 pipeline steps."""
         logger.info("Starting FoxFuel K-Factor Optimization Pipeline")
         logger.info("=" * 60)
         
+        if self.events is not None or self.cancel_event is not None:
+            self.progress = ProgressTracker(self.events, self._progress_steps(), self.cancel_event)
+        self.profiler = PipelineProfiler(trace_memory=self.profile_memory, progress=self.progress)
+        profile = self.profiler.step
+        
         try:
-            # Step 1: Clean Delivery Tickets
-            logger.info("Step 1: Loading and validating input data...")
-            self.customer_fuel, self.delivery_tickets, self.degree_days = self.data_loader.load_all_data()
-            
-            # Step 2: Build Intervals
-            logger.info("Step 2: Building delivery intervals...")
-            self.intervals = self.interval_builder.build_intervals(
-                self.customer_fuel, self.delivery_tickets, self.degree_days
-            )
-            
-            # Step 3: Filter Valid Intervals
-            logger.info("Step 3: Filtering valid intervals...")
-            self.intervals = self.interval_builder.filter_valid_intervals(self.intervals)
-            
-            if len(self.intervals) == 0:
-                logger.error("No valid intervals found. Pipeline cannot continue.")
-                return self._create_error_result("No valid intervals found")
-            
-            # Step 4: Calculate Interval K-Factors
-            logger.info("Step 4: Calculating interval K-factors...")
-            self.interval_k_factors = self.kfactor_calculator.calculate_interval_k_factors(self.intervals)
-            
-            # Step 5: Weighted K by Customer
-            logger.info("Step 5: Calculating weighted K-factors by customer...")
-            self.customer_k_factors = self.kfactor_calculator.calculate_weighted_k_by_customer(
-                self.interval_k_factors
-            )
-            
-            # Step 6: Apply Governance
-            logger.info("Step 6: Applying governance rules...")
-            self.variance_data = self.kfactor_calculator.calculate_variance(
-                self.customer_fuel, self.customer_k_factors
-            )
-            self.governed_data = self.governance_engine.apply_governance(self.variance_data)
+            if self.cached_stages:
+                # Steps 1-6: Stage graph; stages whose inputs, settings and code are unchanged are reused
+                self._run_cached_stages()
+            else:
+                error = self._run_stages(profile)
+                if error is not None:
+                    return self._create_error_result(error)
             
             # Step 7: Apply K This Week
             logger.info("Step 7: Generating Apply_K_ThisWeek.csv...")
-            self.auto_apply_data = self.governance_engine.filter_for_auto_apply(self.governed_data)
-            apply_file = self.outputs_writer.write_apply_k_this_week(self.auto_apply_data)
+            with profile("apply_k_this_week", len(self.governed_data)) as step:
+                self.auto_apply_data = self.governance_engine.filter_for_auto_apply(self.governed_data)
+                apply_file = self.outputs_writer.write_apply_k_this_week(self.auto_apply_data)
+                step['rows_out'] = len(self.auto_apply_data)
             
             # Step 8: K Review Queue
             logger.info("Step 8: Generating K_Review_Queue.xlsx...")
-            review_file = self.outputs_writer.write_k_review_queue(self.governed_data)
+            with profile("k_review_queue", len(self.governed_data)) as step:
+                review_file = self.outputs_writer.write_k_review_queue(self.governed_data, self._step_progress())
+                step['rows_out'] = len(self.governed_data)
             
             # Generate results summary
             results = self._create_success_result(apply_file, review_file)
+            if self.progress is not None:
+                self.progress.finish()
             
             logger.info("=" * 60)
             logger.info("Pipeline completed successfully!")
             logger.info(f"Apply_K_ThisWeek.csv: {apply_file}")
             logger.info(f"K_Review_Queue.xlsx: {review_file}")
+            logger.info(f"Step profile:\n{self.profiler.summary()}")
             
             return results
             
+        except PipelineCancelled as e:
+            logger.warning(f"Pipeline stopped: {e}")
+            results = self._create_error_result(str(e), type(e).__name__)
+            results['status'] = 'cancelled'
+            return results
+            
         except Exception as e:
             logger.error(f"Pipeline failed with error: {str(e)}")
-            return self._create_error_result(str(e))
+            return self._create_error_result(str(e), type(e).__name__)
+    
+    def _run_stages(self, profile) -> Optional[str]:
+        """
+        Run steps 1-6 on data held in memory.
+        
+        Args:
+            profile: Step context manager of the run's profiler
+            
+        Returns:
+            Error message if the pipeline cannot continue, otherwise None
+        """
+        # Step 1: Clean Delivery Tickets
+        logger.info("Step 1: Loading and validating input data...")
+        with profile("load_inputs") as step:
+            self.customer_fuel, self.delivery_tickets, self.degree_days = self.data_loader.load_all_data(
+                load_tickets=not self.streaming
+            )
+            step['rows_out'] = sum(len(df) for df in (self.customer_fuel, self.delivery_tickets, self.degree_days)
+                                   if df is not None)
+        
+        if self.streaming:
+            # Steps 1-5: Tickets streamed in chunks, intervals and K-factors per customer partition
+            logger.info("Steps 1-5: Streaming delivery tickets into intervals and K-factors...")
+            with profile("stream_intervals_and_k_factors") as step:
+                from .streaming import TicketStream
+                ticket_stream = TicketStream(self.data_loader, self.data_loader.files['delivery_tickets'])
+                self.interval_k_factors, self.customer_k_factors = \
+                    self.kfactor_calculator.calculate_from_interval_stream(
+                        ticket_stream.iter_intervals(self.customer_fuel, self.degree_days, self._step_progress())
+                    )
+                step['rows_out'] = len(self.customer_k_factors)
+            # Interval K-factors carry every interval column; no separate copy is kept
+            self.intervals = self.interval_k_factors
+        elif self.sharded_executor is not None:
+            # Steps 2-5: Intervals and K-factors on customer shards in worker processes
+            logger.info(f"Steps 2-5: Building intervals and K-factors on {self.workers} workers...")
+            with profile("sharded_intervals_and_k_factors", len(self.delivery_tickets)) as step:
+                sharded = self.sharded_executor.run(
+                    self.customer_fuel, self.delivery_tickets, self.degree_days, self._step_progress()
+                )
+                self.intervals = sharded['intervals']
+                self.interval_k_factors = sharded['interval_k_factors']
+                self.customer_k_factors = sharded['customer_k_factors']
+                step['rows_out'] = len(self.customer_k_factors)
+        else:
+            # Step 2: Build Intervals
+            logger.info("Step 2: Building delivery intervals...")
+            with profile("build_intervals", len(self.delivery_tickets)) as step:
+                if self.incremental_store is not None:
+                    # Only customers with new or changed tickets are rebuilt
+                    self.intervals = self.incremental_store.build_intervals(
+                        self.interval_builder, self.customer_fuel, self.delivery_tickets, self.degree_days,
+                        self.data_loader.customer_keys
+                    )
+                else:
+                    self.intervals = self.interval_builder.build_intervals(
+                        self.customer_fuel, self.delivery_tickets, self.degree_days
+                    )
+                step['rows_out'] = len(self.intervals)
+            
+            # Step 3: Filter Valid Intervals
+            logger.info("Step 3: Filtering valid intervals...")
+            with profile("filter_intervals", len(self.intervals)) as step:
+                self.intervals = self.interval_builder.filter_valid_intervals(self.intervals)
+                step['rows_out'] = len(self.intervals)
+        
+        if len(self.intervals) == 0:
+            logger.error("No valid intervals found. Pipeline cannot continue.")
+            return "No valid intervals found"
+        
+        if self.sharded_executor is None and not self.streaming:
+            # Step 4: Calculate Interval K-Factors
+            logger.info("Step 4: Calculating interval K-factors...")
+            with profile("interval_k_factors", len(self.intervals)) as step:
+                self.interval_k_factors = self.kfactor_calculator.calculate_interval_k_factors(self.intervals)
+                step['rows_out'] = len(self.interval_k_factors)
+            
+            # Step 5: Weighted K by Customer
+            logger.info("Step 5: Calculating weighted K-factors by customer...")
+            with profile("weighted_k", len(self.interval_k_factors)) as step:
+                self.customer_k_factors = self.kfactor_calculator.calculate_weighted_k_by_customer(
+                    self.interval_k_factors
+                )
+                step['rows_out'] = len(self.customer_k_factors)
+        
+        # Step 6: Apply Governance
+        logger.info("Step 6: Applying governance rules...")
+        with profile("governance", len(self.customer_k_factors)) as step:
+            self.variance_data = self.kfactor_calculator.calculate_variance(
+                self.customer_fuel, self.customer_k_factors
+            )
+            self.governed_data = self.governance_engine.apply_governance(self.variance_data)
+            step['rows_out'] = len(self.governed_data)
+        # Lets single-customer analysis scale confidence like this run without rebuilding everyone
+        from .customer_query import save_population_stats
+        save_population_stats(self.kfactor_calculator.population_maxima, self.data_loader.files)
+        return None
+    
+    def _run_cached_stages(self):
+        """
+        Resolve steps 1-6 through the stage graph.
+        
+        Only stages whose key has no cache entry are run, and only the inputs
+        those stages read are loaded; e.g. after changing MAX_INCREASE only the
+        governed stage runs, from the cached variance data.
+        """
+        graph = self._build_stage_graph()
+        files = self.data_loader.files
+        
+        self.governed_data = graph.get('governed')
+        variance_result = graph.get('variance')
+        self.variance_data = variance_result['variance']
+        # Lets single-customer analysis scale confidence like this run without rebuilding everyone
+        from .customer_query import save_population_stats
+        save_population_stats(variance_result['population_maxima'], files)
+        
+        # Intermediates that were not needed stay unloaded
+        self.customer_fuel = graph.values.get('customer_fuel')
+        self.delivery_tickets = graph.values.get('delivery_tickets')
+        self.degree_days = graph.values.get('degree_days')
+        self.intervals = graph.values.get('valid_intervals')
+        self.interval_k_factors = graph.values.get('interval_k_factors')
+        self.customer_k_factors = graph.values.get('customer_k_factors')
+        logger.info(f"Stage graph: {len(graph.runs)} stages run, {len(graph.hits)} reused from cache")
+    
+    def _build_stage_graph(self):
+        """
+        Build the stage graph of steps 1-6 for the latest input files.
+        
+        Returns:
+            StageGraph with the input, interval, K-factor, variance and governed stages
+        """
+        from .stage_graph import StageGraph
+        from .input_cache import file_fingerprint, _validation_settings
+        
+        files = self.data_loader.find_latest_files()
+        self.data_loader.files = files
+        graph = StageGraph(profiler=self.profiler)
+        
+        def load_input(file_type: str, customer_fuel=None):
+            if customer_fuel is not None:
+                # Tickets are keyed with the dictionary of the CustomerFuel stage, which may come from the cache
+                self.data_loader.build_customer_keys(customer_fuel)
+            return self.data_loader.load_input(file_type)
+        
+        def input_stage(file_type: str, persist: bool = True, inputs: tuple = ()):
+            if file_type not in files:
+                # Reports the missing file the same way load_all_data does
+                self.data_loader.load_input(file_type)
+            fingerprint = file_fingerprint(files[file_type])
+            graph.add(file_type, lambda *upstream: load_input(file_type, *upstream), inputs=inputs,
+                      settings={'size': fingerprint['size'], 'content_hash': fingerprint['content_hash'],
+                                'validation': _validation_settings()},
+                      modules=('src.data_loader', 'src.customer_keys'), persist=persist)
+        
+        def interval_k_factors(valid_intervals):
+            if len(valid_intervals) == 0:
+                logger.error("No valid intervals found. Pipeline cannot continue.")
+                raise ValueError("No valid intervals found")
+            return self.kfactor_calculator.calculate_interval_k_factors(valid_intervals)
+        
+        def variance(customer_fuel, customer_k_factors):
+            variance_data = self.kfactor_calculator.calculate_variance(customer_fuel, customer_k_factors)
+            return {'variance': variance_data, 'population_maxima': self.kfactor_calculator.population_maxima}
+        
+        input_stage('customer_fuel')
+        # Tickets are the largest input and already in the input cache
+        input_stage('delivery_tickets', persist=False, inputs=('customer_fuel',))
+        input_stage('degree_days')
+        graph.add('intervals', self.interval_builder.build_intervals,
+                  inputs=('customer_fuel', 'delivery_tickets', 'degree_days'),
+                  settings={'full_threshold': FULL_THRESHOLD, 'default_area': DEFAULT_DDAY_AREA,
+                            'zone_area_map': ZONE_DDAY_AREA_MAP},
+                  modules=('src.interval_builder', 'src.degree_days', 'src.kernels'))
+        graph.add('valid_intervals', self.interval_builder.filter_valid_intervals, inputs=('intervals',),
+                  settings={'min_interval_days': MIN_INTERVAL_DAYS}, modules=('src.interval_builder',))
+        graph.add('interval_k_factors', interval_k_factors, inputs=('valid_intervals',),
+                  modules=('src.kfactor_calculator',))
+        graph.add('customer_k_factors', self.kfactor_calculator.calculate_weighted_k_by_customer,
+                  inputs=('interval_k_factors',), modules=('src.kfactor_calculator',))
+        graph.add('variance', variance, inputs=('customer_fuel', 'customer_k_factors'),
+                  settings={'var_threshold_pct': VAR_THRESHOLD_PCT, 'confidence_threshold': CONFIDENCE_THRESHOLD,
+                            'min_intervals': MIN_INTERVALS},
+                  modules=('src.kfactor_calculator',))
+        graph.add('governed', lambda variance_result: self.governance_engine.apply_governance(
+                      variance_result['variance']),
+                  inputs=('variance',),
+                  settings={'max_increase': MAX_INCREASE, 'max_decrease': MAX_DECREASE, 'cap_pct': CAP_PCT,
+                            'confidence_threshold': CONFIDENCE_THRESHOLD, 'min_intervals': MIN_INTERVALS},
+                  modules=('src.governance',))
+        self.stage_graph = graph
+        return graph
+    
+    def compute_variance_data(self):
+        """
+        Variance data for the latest inputs, through the stage graph.
+        
+        Used by governance sweeps, which need the variance stage but not the
+        governed one; with unchanged inputs and settings it is read from the
+        stage cache.
+        
+        Returns:
+            DataFrame from KFactorCalculator.calculate_variance
+        """
+        graph = self._build_stage_graph()
+        return graph.get('variance')['variance']
+    
+    def _progress_steps(self) -> List[Tuple[str, float]]:
+        """Planned steps of this run and their progress weights, in run order."""
+        if self.cached_stages:
+            steps = ['customer_fuel', 'delivery_tickets', 'degree_days', 'intervals', 'valid_intervals',
+                     'interval_k_factors', 'customer_k_factors', 'variance', 'governed']
+        elif self.streaming:
+            steps = ['load_inputs', 'stream_intervals_and_k_factors', 'governance']
+        elif self.sharded_executor is not None:
+            steps = ['load_inputs', 'sharded_intervals_and_k_factors', 'governance']
+        else:
+            steps = ['load_inputs', 'build_intervals', 'filter_intervals', 'interval_k_factors',
+                     'weighted_k', 'governance']
+        steps += ['apply_k_this_week', 'k_review_queue']
+        return [(step, STEP_PROGRESS_WEIGHTS[step]) for step in steps]
+    
+    def _step_progress(self):
+        """Callback reporting progress within the current step, or None without an event bus."""
+        return self.progress.advance if self.progress is not None else None
+    
+    def _stage_rows(self, name: str, df) -> int:
+        """Row count of a pipeline intermediate, from the stage cache if it was not loaded."""
+        if df is not None:
+            return len(df)
+        if self.stage_graph is not None:
+            return self.stage_graph.rows(name) or 0
+        return 0
     
     def _create_success_result(self, apply_file: Path, review_file: Path) -> Dict[str, any]:
         """Create success result dictionary."""
@@ -129,22 +438,38 @@ class KFactorPipeline:
             'statistics': {
                 'calculation_stats': calc_stats,
                 'governance_stats': gov_stats,
-                'total_customers': len(self.customer_fuel) if self.customer_fuel is not None else 0,
-                'valid_intervals': len(self.intervals) if self.intervals is not None else 0,
-                'auto_apply_customers': len(self.auto_apply_data) if self.auto_apply_data is not None else 0
+                'total_customers': self._stage_rows('customer_fuel', self.customer_fuel),
+                'valid_intervals': self._stage_rows('valid_intervals', self.intervals),
+                'auto_apply_customers': len(self.auto_apply_data) if self.auto_apply_data is not None else 0,
+                'profile': self.profiler.to_records() if self.profiler is not None else []
             }
         }
     
-    def _create_error_result(self, error_message: str) -> Dict[str, any]:
+    def _create_error_result(self, error_message: str, error_type: str = None) -> Dict[str, any]:
         """Create error result dictionary."""
         return {
             'status': 'error',
             'timestamp': datetime.now().isoformat(),
             'error': error_message,
+            'error_type': error_type,
             'files': None,
             'statistics': None
         }
     
+    def export_profile(self, path) -> Path:
+        """
+        Write the per-step profile of the last run to a .json or .csv file.
+        
+        Args:
+            path: Output file; the suffix selects the format
+            
+        Returns:
+            Path to the written file
+        """
+        if self.profiler is None:
+            raise RuntimeError("Pipeline not yet executed.")
+        return self.profiler.export(path)
+    
     def get_pipeline_summary(self) -> str:
         """
         Get a human-readable summary of the pipeline execution.
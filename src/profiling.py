@@ -0,0 +1,213 @@
+"""
+Profiling module for the FoxFuel K-Factor Optimizer.
+Records wall time, CPU time, row counts and memory high-water marks per pipeline step.
+"""
+
+import cProfile
+import csv
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional
+
+from .config import *
+from .logger import get_logger
+
+logger = get_logger()
+
+PROFILE_FIELDS = [
+    "step", "wall_seconds", "cpu_seconds", "rows_in", "rows_out", "peak_rss_mb", "peak_traced_mb", "cache_hit"
+]
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident memory of this process so far.
+
+    Returns:
+        Peak RSS in MB, or None where the platform does not report it
+    """
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class ProcessMemoryCounters(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)
+                ]
+
+            counters = ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return None
+            return counters.PeakWorkingSetSize / 1e6
+
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+    except Exception:
+        return None
+
+class PipelineProfiler:
+    """Collects one measurement record per pipeline step."""
+
+    def __init__(self, trace_memory: bool = False, progress=None):
+        """
+        Args:
+            trace_memory: Also record the traced Python allocation peak of each step.
+                Tracing slows Python-heavy steps such as the workbook several times over.
+            progress: Optional events.ProgressTracker told when each step starts and ends
+        """
+        self.trace_memory = trace_memory
+        self.progress = progress
+        self.records = []
+
+    @contextmanager
+    def step(self, name: str, rows_in: int = None):
+        """
+        Measure one step.
+
+        Yields a record dict; set its 'rows_out' inside the block.
+
+        Args:
+            name: Step name
+            rows_in: Rows entering the step
+        """
+        record = {field: None for field in PROFILE_FIELDS}
+        record['step'] = name
+        record['rows_in'] = rows_in
+
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+        if self.progress is not None:
+            self.progress.start_step(name)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        completed = False
+        try:
+            yield record
+            completed = True
+        finally:
+            record['wall_seconds'] = round(time.perf_counter() - wall_start, 4)
+            record['cpu_seconds'] = round(time.process_time() - cpu_start, 4)
+            if self.trace_memory:
+                record['peak_traced_mb'] = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+                if started_tracing:
+                    tracemalloc.stop()
+            rss = peak_rss_mb()
+            record['peak_rss_mb'] = round(rss, 1) if rss is not None else None
+            self.records.append(record)
+            if self.progress is not None:
+                self.progress.end_step(dict(record), completed)
+            logger.debug(f"{name}: {record['wall_seconds']:.3f}s wall, {record['cpu_seconds']:.3f}s CPU, "
+                         f"rows {rows_in} -> {record['rows_out']}")
+
+    def to_records(self) -> List[dict]:
+        """Measurement records in step order."""
+        return [dict(record) for record in self.records]
+
+    def summary(self) -> str:
+        """
+        Format the records as a table.
+
+        Returns:
+            Formatted table string
+        """
+        lines = [f"{'Step':<34}{'Wall s':>9}{'CPU s':>9}{'Rows in':>11}{'Rows out':>11}{'RSS MB':>9}"]
+        for record in self.records:
+            rows_in = f"{record['rows_in']:,}" if record['rows_in'] is not None else "-"
+            rows_out = f"{record['rows_out']:,}" if record['rows_out'] is not None else "-"
+            rss = f"{record['peak_rss_mb']:.0f}" if record['peak_rss_mb'] is not None else "-"
+            cached = "  (cached)" if record['cache_hit'] else ""
+            lines.append(f"{record['step']:<34}{record['wall_seconds']:>9.3f}{record['cpu_seconds']:>9.3f}"
+                         f"{rows_in:>11}{rows_out:>11}{rss:>9}{cached}")
+        return "\n".join(lines)
+
+    def export(self, path) -> Path:
+        """
+        Write the records to a .json or .csv file.
+
+        Args:
+            path: Output file; the suffix selects the format
+
+        Returns:
+            Path to the written file
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix.lower() == ".csv":
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=PROFILE_FIELDS)
+                writer.writeheader()
+                writer.writerows(self.records)
+        elif path.suffix.lower() == ".json":
+            path.write_text(json.dumps(self.records, indent=2))
+        else:
+            raise ValueError(f"Unsupported profile format '{path.suffix}', use .json or .csv")
+        logger.info(f"Step profile written to {path}")
+        return path
+
+def save_cprofile(profiler: cProfile.Profile, output_dir, timestamp: str) -> Path:
+    """
+    Save cProfile statistics next to the run outputs.
+
+    The .prof file opens in pstats, snakeviz or gprof2dot.
+
+    Args:
+        profiler: Disabled profiler holding the run
+        output_dir: Directory of the run outputs
+        timestamp: Run timestamp used in the file name
+
+    Returns:
+        Path to the .prof file
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    prof_file = output_path / f"pipeline_profile_{timestamp}.prof"
+    profiler.dump_stats(str(prof_file))
+    return prof_file
+
+def top_functions(profiler: cProfile.Profile, limit: int = PROFILE_TOP_FUNCTIONS) -> List[dict]:
+    """
+    Functions with the most cumulative time in a profiled run.
+
+    Args:
+        profiler: Disabled profiler holding the run
+        limit: Number of functions to return
+
+    Returns:
+        List of dicts with function, calls, total_seconds and cumulative_seconds
+    """
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, name), (_, calls, total, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': f"{Path(filename).name}:{line}({name})",
+            'calls': calls,
+            'total_seconds': round(total, 4),
+            'cumulative_seconds': round(cumulative, 4)
+        })
+    rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+    return rows[:limit]
+
+def format_top_functions(rows: List[dict]) -> str:
+    """Format top_functions() rows as a table."""
+    lines = [f"{'Cumulative s':>13}{'Own s':>9}{'Calls':>10}  Function"]
+    for row in rows:
+        lines.append(f"{row['cumulative_seconds']:>13.3f}{row['total_seconds']:>9.3f}{row['calls']:>10,}  {row['function']}")
+    return "\n".join(lines)
@@ -0,0 +1,201 @@
+"""
+Child process runs for the FoxFuel K-Factor Optimizer.
+Runs the pipeline in a separate process so its pandas work does not compete
+with the GUI for the GIL, streaming events and the result back over a pipe.
+Runs can be cancelled and are stopped after a timeout.
+"""
+
+import multiprocessing
+import time
+from datetime import datetime
+from typing import Optional
+
+from .config import *
+from .events import EventBus, STATUS
+from .logger import get_logger
+
+logger = get_logger()
+
+# Message kind carrying the run's result dictionary
+RESULT = "result"
+
+class _PipeEventBus(EventBus):
+    """Event bus of the child process; events are sent to the parent instead of queued."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def publish(self, kind: str, **data):
+        self.connection.send({'kind': kind, 'time': time.time(), **data})
+
+def _error_result(message: str, error_type: str = None, status: str = 'error') -> dict:
+    """Result dictionary of a run that did not complete, shaped like KFactorPipeline's."""
+    return {
+        'status': status,
+        'timestamp': datetime.now().isoformat(),
+        'error': message,
+        'error_type': error_type,
+        'files': None,
+        'statistics': None
+    }
+
+def _run_child(connection, cancel_event, input_dir: str, prefetch: bool):
+    """
+    Child process entry point.
+
+    Loads the inputs while waiting for the run options, then runs the
+    pipeline and sends its result.
+    """
+    events = _PipeEventBus(connection)
+    try:
+        from .data_loader import DataLoader
+        data_loader = DataLoader(input_dir)
+        if prefetch:
+            try:
+                data_loader.prefetch(progress=lambda message: events.publish(STATUS, message=message))
+            except Exception as e:
+                # The run loads the files itself and reports the error properly
+                logger.warning(f"Background input load failed: {e}")
+                events.publish(STATUS, message="Background load failed; inputs will load when you run")
+
+        try:
+            pipeline_options = connection.recv()
+        except EOFError:
+            # The parent closed without starting a run
+            return
+
+        from .pipeline import KFactorPipeline
+        pipeline = KFactorPipeline(input_dir=input_dir, data_loader=data_loader, events=events,
+                                   cancel_event=cancel_event, **pipeline_options)
+        result = pipeline.run_pipeline()
+    except Exception as e:
+        result = _error_result(str(e), type(e).__name__)
+    connection.send({'kind': RESULT, 'result': result})
+    connection.close()
+
+class PipelineProcess:
+    """
+    One pipeline run in a child process.
+
+    The child starts loading the inputs as soon as it is created, so a run
+    started later begins with them in memory. Its events are forwarded to an
+    EventBus by poll(), which the GUI calls from its event timer.
+    """
+
+    def __init__(self, events: EventBus, input_dir: str = INPUT_DIR, prefetch: bool = True):
+        """
+        Args:
+            events: Bus the child's step, progress, status and log events are published to
+            input_dir: Directory with the input CSV files
+            prefetch: Load the inputs before the run is started
+        """
+        # spawn on every platform: forking a process that runs Tk is not safe. Not a
+        # daemon, because sharded runs start worker processes of their own; close()
+        # stops it instead
+        context = multiprocessing.get_context("spawn")
+        self.events = events
+        self.connection, child_connection = context.Pipe()
+        self.cancel_event = context.Event()
+        self.process = context.Process(target=_run_child, name="kfactor-pipeline", daemon=False,
+                                       args=(child_connection, self.cancel_event, str(input_dir), prefetch))
+        self.process.start()
+        child_connection.close()
+
+        self.result = None
+        self.started_at = None
+        self.timeout = None
+        self.cancel_requested_at = None
+        self.timed_out = False
+
+    @property
+    def running(self) -> bool:
+        """Whether a run has been started and has not finished."""
+        return self.started_at is not None and self.result is None
+
+    def run(self, timeout: float = GUI_RUN_TIMEOUT_SECONDS, **pipeline_options):
+        """
+        Start the run.
+
+        Args:
+            timeout: Seconds after which the run is cancelled (0 = no limit)
+            **pipeline_options: KFactorPipeline arguments, e.g. profile=True
+        """
+        self.connection.send(pipeline_options)
+        self.started_at = time.monotonic()
+        self.timeout = timeout
+
+    def cancel(self):
+        """
+        Ask the run to stop.
+
+        The pipeline stops at its next step, shard or partition boundary; a
+        child still running GUI_CANCEL_GRACE_SECONDS later is terminated.
+        """
+        if self.result is not None or self.cancel_requested_at is not None:
+            return
+        self.cancel_requested_at = time.monotonic()
+        self.cancel_event.set()
+        logger.info("Cancellation requested")
+
+    def poll(self) -> Optional[dict]:
+        """
+        Forward the child's events to the bus and enforce the timeout.
+
+        Returns:
+            The result dictionary once the run has finished, otherwise None
+        """
+        if self.result is not None:
+            return self.result
+
+        try:
+            while self.result is None and self.connection.poll():
+                message = self.connection.recv()
+                kind = message.pop('kind')
+                if kind == RESULT:
+                    self.result = message['result']
+                else:
+                    self.events.publish(kind, **message)
+        except (EOFError, OSError):
+            # The child has exited; handled below
+            pass
+
+        now = time.monotonic()
+        if self.result is None:
+            if self.running and self.timeout and now - self.started_at > self.timeout:
+                if self.cancel_requested_at is None:
+                    logger.warning(f"Run exceeded its {self.timeout:g} second timeout, cancelling")
+                    self.timed_out = True
+                    self.cancel()
+            if (self.cancel_requested_at is not None and self.process.is_alive()
+                    and now - self.cancel_requested_at > GUI_CANCEL_GRACE_SECONDS):
+                logger.warning("Run did not stop at a checkpoint, terminating its process")
+                self.process.terminate()
+                self.process.join(5)
+            if not self.process.is_alive():
+                if self.cancel_requested_at is not None:
+                    self.result = _error_result("Run cancelled", "PipelineCancelled", status='cancelled')
+                else:
+                    self.result = _error_result(
+                        f"Run process exited unexpectedly (exit code {self.process.exitcode})"
+                    )
+
+        if self.result is not None and self.timed_out and self.result['status'] != 'success':
+            # A run that completed before reaching another checkpoint keeps its result
+            self.result['error'] = f"Run timed out after {self.timeout:g} seconds ({self.result['error']})"
+        return self.result
+
+    def close(self):
+        """
+        Stop the child if it is still alive, e.g. when the GUI closes.
+
+        A child still waiting for run() exits on its own once the pipe is
+        closed; a running one is terminated.
+        """
+        if not self.running:
+            self.connection.close()
+            self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(5)
+        if not self.connection.closed:
+            self.connection.close()
@@ -0,0 +1,251 @@
+"""
+Stage graph module for the FoxFuel K-Factor Optimizer.
+Runs pipeline stages as a dependency graph with intermediates cached by content key.
+
+Each stage's key is a hash of its input stages' keys, the config values it
+reads and the source of the modules it runs, so a key can be computed without
+loading any data. A stage whose key has a cache entry is read back instead of
+run, and its inputs are never loaded.
+"""
+
+import hashlib
+import importlib.util
+import json
+import pickle
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from . import __version__
+from .config import *
+from .logger import get_logger
+
+logger = get_logger()
+
+# Bump when the layout of cached stage values changes
+STAGE_CACHE_VERSION = 2
+
+@lru_cache(maxsize=None)
+def code_fingerprint(modules: tuple) -> str:
+    """
+    Hash the source of the modules a stage runs, so editing them invalidates its entries.
+
+    Args:
+        modules: Dotted module names
+
+    Returns:
+        Hex digest of the module sources (the package version where sources are not available)
+    """
+    digest = hashlib.sha1()
+    for module in modules:
+        spec = importlib.util.find_spec(module)
+        origin = Path(spec.origin) if spec is not None and spec.origin else None
+        if origin is not None and origin.suffix == ".py" and origin.exists():
+            digest.update(origin.read_bytes())
+        else:
+            # Frozen executables ship no sources; their code changes with the version
+            digest.update(f"{module}:{__version__}".encode())
+    return digest.hexdigest()
+
+class Stage:
+    """One node of the stage graph."""
+
+    def __init__(self, name: str, func: Callable, inputs: tuple = (), settings: dict = None,
+                 modules: tuple = (), persist: bool = True):
+        """
+        Args:
+            name: Stage name, unique in the graph
+            func: Function called with the input stages' values, in order
+            inputs: Names of the stages this one reads
+            settings: Config values and file fingerprints the stage depends on
+            modules: Modules whose source determines the stage's result
+            persist: Write the result to the stage cache
+        """
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.settings = settings or {}
+        self.modules = tuple(modules)
+        self.persist = persist
+
+class StageGraph:
+    """Resolves stages on demand, reusing cached intermediates whose keys match."""
+
+    def __init__(self, cache_dir: str = STAGE_CACHE_DIR, keep_per_stage: int = STAGE_CACHE_KEEP,
+                 max_age_days: float = INPUT_CACHE_MAX_AGE_DAYS, profiler=None):
+        """
+        Args:
+            cache_dir: Directory of the stage cache
+            keep_per_stage: Entries kept per stage, most recently used first
+            max_age_days: Entries unused for this long are removed
+            profiler: Optional PipelineProfiler recording each resolved stage
+        """
+        self.cache_dir = Path(cache_dir)
+        self.keep_per_stage = keep_per_stage
+        self.max_age_days = max_age_days
+        self.profiler = profiler
+        self.stages: Dict[str, Stage] = {}
+        self.values = {}
+        self.hits = []
+        self.runs = []
+        self._keys = {}
+
+    def add(self, name: str, func: Callable, inputs: tuple = (), settings: dict = None,
+            modules: tuple = (), persist: bool = True):
+        """Add a stage; see Stage for the arguments."""
+        for input_name in inputs:
+            if input_name not in self.stages:
+                raise ValueError(f"Stage '{name}' reads unknown stage '{input_name}'")
+        self.stages[name] = Stage(name, func, inputs, settings, modules, persist)
+
+    def key(self, name: str) -> str:
+        """
+        Content key of a stage.
+
+        Args:
+            name: Stage name
+
+        Returns:
+            Hex digest of the stage's settings, code and input keys
+        """
+        if name not in self._keys:
+            stage = self.stages[name]
+            key_data = {
+                'stage': name,
+                'version': STAGE_CACHE_VERSION,
+                'settings': stage.settings,
+                'code': code_fingerprint(stage.modules),
+                'inputs': [self.key(input_name) for input_name in stage.inputs]
+            }
+            self._keys[name] = hashlib.sha1(
+                json.dumps(key_data, sort_keys=True, default=str).encode()
+            ).hexdigest()
+        return self._keys[name]
+
+    def get(self, name: str):
+        """
+        Value of a stage: from memory, from the stage cache, or by running it.
+
+        Args:
+            name: Stage name
+
+        Returns:
+            The stage's value
+        """
+        if name in self.values:
+            return self.values[name]
+
+        stage = self.stages[name]
+        entry = self._entry(name)
+        value = self._read_entry(entry) if stage.persist else None
+        if value is not None:
+            self.hits.append(name)
+            logger.info(f"Stage {name}: reused cached result")
+            self._record(name, None, value, cache_hit=True)
+        else:
+            # Inputs are resolved before timing starts so each record covers one stage
+            inputs = [self.get(input_name) for input_name in stage.inputs]
+            start = time.perf_counter()
+            value = self._record(name, inputs, None, cache_hit=False)
+            self.runs.append(name)
+            logger.info(f"Stage {name}: ran in {time.perf_counter() - start:.2f}s")
+            if stage.persist:
+                self._write_entry(entry, value)
+                self.evict(name)
+
+        self.values[name] = value
+        return value
+
+    def rows(self, name: str) -> Optional[int]:
+        """
+        Row count of a stage's value without loading it.
+
+        Args:
+            name: Stage name
+
+        Returns:
+            Number of rows, or None if unknown
+        """
+        if name in self.values:
+            return _row_count(self.values[name])
+        meta = self._entry(name).with_suffix(".json")
+        try:
+            return json.loads(meta.read_text()).get('rows')
+        except (OSError, ValueError):
+            return None
+
+    def _record(self, name: str, inputs: Optional[List], value, cache_hit: bool):
+        """Run a stage (or record a cache hit) inside a profiler step."""
+        if self.profiler is None:
+            return value if cache_hit else self.stages[name].func(*inputs)
+        rows_in = None
+        if inputs:
+            counts = [_row_count(input_value) for input_value in inputs]
+            rows_in = sum(count for count in counts if count is not None)
+        with self.profiler.step(name, rows_in) as step:
+            step['cache_hit'] = cache_hit
+            if not cache_hit:
+                value = self.stages[name].func(*inputs)
+            step['rows_out'] = _row_count(value)
+        return value
+
+    def _entry(self, name: str) -> Path:
+        """Cache entry path of a stage's current key."""
+        return self.cache_dir / f"{name}_{self.key(name)}.pkl"
+
+    def _read_entry(self, entry: Path):
+        """Read a cache entry, returning None if it is missing or unreadable."""
+        if not entry.exists():
+            return None
+        try:
+            with open(entry, 'rb') as f:
+                value = pickle.load(f)
+            # Mark the entry as recently used so eviction keeps it
+            entry.touch()
+            return value
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable stage cache entry {entry.name}: {e}")
+            return None
+
+    def _write_entry(self, entry: Path, value):
+        """Write a cache entry and its row count, logging instead of failing if the cache is not writable."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_entry = entry.with_name(entry.name + ".tmp")
+            with open(temp_entry, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            temp_entry.replace(entry)
+            entry.with_suffix(".json").write_text(json.dumps({'rows': _row_count(value)}))
+        except Exception as e:
+            logger.warning(f"Could not write stage cache entry {entry.name}: {e}")
+
+    def evict(self, name: str):
+        """
+        Remove old entries of a stage.
+
+        The keep_per_stage most recently used entries are kept, so switching
+        back and forth between a few settings stays cached; entries unused for
+        more than max_age_days are removed regardless.
+
+        Args:
+            name: Stage name
+        """
+        entries = [entry for entry in self.cache_dir.glob(f"{name}_*.pkl")
+                   if len(entry.stem) == len(name) + 41]
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        cutoff = time.time() - self.max_age_days * 86400
+        for index, entry in enumerate(entries):
+            try:
+                if index >= self.keep_per_stage or entry.stat().st_mtime < cutoff:
+                    entry.unlink()
+                    entry.with_suffix(".json").unlink(missing_ok=True)
+                    logger.debug(f"Evicted stage cache entry {entry.name}")
+            except OSError as e:
+                logger.warning(f"Could not evict stage cache entry {entry.name}: {e}")
+
+def _row_count(value) -> Optional[int]:
+    """Rows of a DataFrame value, or of the first DataFrame in a dict value."""
+    if isinstance(value, dict):
+        value = next((item for item in value.values() if hasattr(item, 'shape')), None)
+    return len(value) if hasattr(value, 'shape') else None
@@ -0,0 +1,119 @@
+"""
+Streaming ticket processing module for the FoxFuel K-Factor Optimizer.
+Processes delivery ticket files larger than memory in customer partitions.
+"""
+
+import pandas as pd
+import math
+import pickle
+import tempfile
+from pathlib import Path
+
+from .config import *
+from .degree_days import DegreeDayIndex
+from .interval_builder import IntervalBuilder, INTERVAL_TICKET_COLUMNS
+from .customer_keys import CUSTOMER_KEY
+from .parallel import customer_shards
+from .logger import get_logger
+
+logger = get_logger()
+
+class TicketStream:
+    """Spills delivery tickets to disk by customer partition and emits intervals partition by partition."""
+
+    def __init__(self, data_loader, tickets_file: Path,
+                 memory_budget_mb: float = STREAM_MEMORY_BUDGET_MB,
+                 chunk_rows: int = STREAM_CHUNK_ROWS, spill_dir: str = STREAM_SPILL_DIR):
+        self.data_loader = data_loader
+        self.tickets_file = Path(tickets_file)
+        self.memory_budget_mb = memory_budget_mb
+        self.chunk_rows = chunk_rows
+        self.spill_dir = spill_dir
+        self.rows_spilled = 0
+
+        # Every customer lands wholly in one partition, and each partition's share
+        # of the file is kept within the memory budget
+        file_mb = self.tickets_file.stat().st_size / 1e6
+        self.partitions = max(1, math.ceil(file_mb / memory_budget_mb))
+
+    def iter_intervals(self, customer_fuel: pd.DataFrame, degree_days: pd.DataFrame, progress=None):
+        """
+        Build valid delivery intervals one customer partition at a time.
+
+        Tickets are read in chunks, validated, and each chunk's rows are written
+        as customer/date sorted runs to their partition's spill file. Each
+        partition is then read back and turned into intervals, so only one
+        partition's tickets are in memory at a time.
+
+        Args:
+            customer_fuel: Customer fuel DataFrame
+            degree_days: Degree days DataFrame
+            progress: Optional callable taking the share of work done (0 to 1); the
+                spill counts as the first half, each partition as an equal share of the rest
+
+        Yields:
+            Filtered interval DataFrames covering complete customers
+        """
+        degree_day_index = DegreeDayIndex(degree_days)
+
+        with tempfile.TemporaryDirectory(prefix="kfactor_spill_", dir=self.spill_dir) as spill_dir:
+            spill_files = self._spill(Path(spill_dir), progress)
+            if progress is not None:
+                progress(0.5)
+
+            fuel_partitions = customer_shards(customer_fuel[CUSTOMER_KEY], self.partitions)
+            for partition, spill_file in enumerate(spill_files):
+                tickets = self._read_runs(spill_file)
+                if len(tickets) == 0:
+                    continue
+
+                interval_builder = IntervalBuilder()
+                intervals = interval_builder.build_intervals(
+                    customer_fuel[fuel_partitions == partition], tickets, degree_day_index
+                )
+                intervals = interval_builder.filter_valid_intervals(intervals)
+                logger.debug(f"Partition {partition + 1}/{self.partitions}: "
+                             f"{len(tickets)} tickets, {len(intervals)} intervals")
+
+                # Release the partition's tickets before the next one is read
+                del tickets
+                if progress is not None:
+                    progress(0.5 + 0.5 * (partition + 1) / self.partitions)
+                if len(intervals) > 0:
+                    yield intervals
+
+    def _spill(self, spill_dir: Path, progress=None) -> list:
+        """Write validated ticket chunks to per-partition spill files as sorted runs."""
+        spill_files = [spill_dir / f"partition_{partition:04d}.pkl" for partition in range(self.partitions)]
+        logger.info(f"Spilling tickets to {self.partitions} partitions "
+                    f"(memory budget {self.memory_budget_mb:,.0f} MB)")
+
+        for chunk in self.data_loader.iter_delivery_ticket_chunks(self.tickets_file, self.chunk_rows):
+            # Only keyed columns are spilled; integer keys also keep runs from different chunks concatenable
+            chunk = chunk[INTERVAL_TICKET_COLUMNS]
+            chunk_partitions = customer_shards(chunk[CUSTOMER_KEY], self.partitions)
+            for partition, run in chunk.groupby(chunk_partitions, sort=False):
+                run = run.sort_values([CUSTOMER_KEY, 'Transaction Date'])
+                with open(spill_files[partition], 'ab') as f:
+                    pickle.dump(run, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self.rows_spilled += len(chunk)
+            if progress is not None:
+                # The chunk count is not known up front, so chunks only serve as cancellation checkpoints
+                progress(0.0)
+
+        logger.info(f"Spilled {self.rows_spilled:,} valid delivery records")
+        return spill_files
+
+    def _read_runs(self, spill_file: Path) -> pd.DataFrame:
+        """Read back all sorted runs of one partition in the order they were written."""
+        runs = []
+        if spill_file.exists():
+            with open(spill_file, 'rb') as f:
+                while True:
+                    try:
+                        runs.append(pickle.load(f))
+                    except EOFError:
+                        break
+        if not runs:
+            return pd.DataFrame(columns=INTERVAL_TICKET_COLUMNS)
+        return pd.concat(runs, ignore_index=True)
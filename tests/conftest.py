@@ -0,0 +1,24 @@
+"""
+Shared fixtures for the FoxFuel K-Factor Optimizer tests.
+"""
+
+import pytest
+from pathlib import Path
+
+from src.config import *
+from src.data_loader import DataLoader
+
+# Sample inputs shipped with the repo
+SAMPLE_INPUT_DIR = Path(__file__).resolve().parents[1] / INPUT_DIR
+
+@pytest.fixture(scope="session")
+def sample_input_dir() -> Path:
+    """Directory with the sample inputs."""
+    return SAMPLE_INPUT_DIR
+
+@pytest.fixture(scope="session")
+def sample_inputs():
+    """Sample inputs loaded the way the pipeline loads them, without the input cache."""
+    data_loader = DataLoader(SAMPLE_INPUT_DIR, use_cache=False)
+    customer_fuel, delivery_tickets, degree_days = data_loader.load_all_data()
+    return data_loader, customer_fuel, delivery_tickets, degree_days
@@ -0,0 +1,68 @@
+"""
+DDay Area resolution tests for the FoxFuel K-Factor Optimizer degree day index.
+"""
+
+import pandas as pd
+import pytest
+
+from src.customer_keys import CUSTOMER_KEY
+from src.degree_days import DegreeDayIndex
+from src.interval_builder import IntervalBuilder
+
+def make_degree_days(areas: list) -> pd.DataFrame:
+    """Daily cumulative degree days for January 2024, the same counter in every area."""
+    dates = pd.date_range("2024-01-01", "2024-01-31")
+    return pd.concat([
+        pd.DataFrame({'DDay Area': area, 'DDay Date': dates, 'Heat Only DDays': range(1000, 1000 + 30 * len(dates), 30)})
+        for area in areas
+    ], ignore_index=True)
+
+def make_deliveries(zone: str):
+    """One customer with three full fills ten days apart."""
+    customer_fuel = pd.DataFrame({
+        'Customer Number': ["1001"], CUSTOMER_KEY: [0], 'Usable Size': [250.0], 'Zone - Fuel': [zone]
+    })
+    delivery_tickets = pd.DataFrame({
+        'Customer Number': ["1001"] * 3,
+        CUSTOMER_KEY: [0] * 3,
+        'Transaction Date': pd.to_datetime(["2024-01-02", "2024-01-12", "2024-01-22"]),
+        'Transaction Type': ["Delivery"] * 3,
+        'Quantity': [240.0, 230.0, 235.0],
+        '% Full': [None] * 3,
+        'PIDCustomerFuel1': [1.0] * 3
+    })
+    return customer_fuel, delivery_tickets
+
+@pytest.mark.parametrize("area", ["Default", "North"])
+def test_single_area_is_the_fallback_for_any_zone(area):
+    customer_fuel, delivery_tickets = make_deliveries("M38C4")
+
+    intervals = IntervalBuilder().build_intervals(customer_fuel, delivery_tickets, make_degree_days([area]))
+
+    assert len(intervals) == 2
+    assert intervals['Degree Days Used'].tolist() == [270, 270]
+
+def test_zone_named_like_an_area_uses_it():
+    index = DegreeDayIndex(make_degree_days(["North", "South"]))
+
+    assert index.resolve_areas(["South", "North"]).tolist() == ["South", "North"]
+
+def test_unmapped_zone_with_several_areas_and_no_default_raises(monkeypatch):
+    monkeypatch.setattr("src.degree_days.DEFAULT_DDAY_AREA", None)
+    index = DegreeDayIndex(make_degree_days(["North", "South"]))
+
+    with pytest.raises(ValueError, match="M38C4.*have no DDay Area.*ZONE_DDAY_AREA_MAP"):
+        index.resolve_areas(["North", "M38C4"])
+
+def test_default_area_missing_from_several_areas_raises():
+    index = DegreeDayIndex(make_degree_days(["North", "South"]))
+
+    with pytest.raises(ValueError, match="M38C4.*without degree day values.*Default"):
+        index.resolve_areas(["North", "M38C4"])
+
+def test_zone_resolving_to_an_unindexed_area_raises(monkeypatch):
+    monkeypatch.setattr("src.degree_days.ZONE_DDAY_AREA_MAP", {"M38C4": "East"})
+    index = DegreeDayIndex(make_degree_days(["North"]))
+
+    with pytest.raises(ValueError, match="without degree day values.*East"):
+        index.resolve_areas(["M38C4"])
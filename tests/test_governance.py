@@ -0,0 +1,68 @@
+"""
+Governance sweep tests for the FoxFuel K-Factor Optimizer.
+Checks GovernanceEngine.sweep against apply_governance and its summary.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import *
+from src.governance import GovernanceEngine
+
+def make_variance_data() -> pd.DataFrame:
+    """Customers covering every status and cap, two of them without a winter K."""
+    winter_k = [1.0, 1.0, 1.0, 1.0, 1.0, 1.0, np.nan, 2.0, np.nan]
+    weighted_k = [1.05, 1.5, 0.6, 1.2, 0.95, 1.3, 1.1, 1.9, 0.9]
+    variance_data = pd.DataFrame({
+        'Customer Number': [f"C{number}" for number in range(len(winter_k))],
+        'K Factor - Winter': winter_k,
+        'Weighted K Factor': weighted_k,
+        'Interval Count': [5, 5, 5, 2, 5, 5, 5, 5, 5],
+        'Confidence': [0.9, 0.9, 0.9, 0.9, 0.5, 0.9, 0.9, 0.95, 0.9]
+    })
+    variance_data['Variance Percent'] = (variance_data['Weighted K Factor'] - variance_data['K Factor - Winter']) \
+        / variance_data['K Factor - Winter'] * 100
+    variance_data['Status'] = 'APPROVED'
+    variance_data.loc[abs(variance_data['Variance Percent']) > VAR_THRESHOLD_PCT * 100, 'Status'] = 'HIGH_VARIANCE'
+    variance_data.loc[variance_data['Confidence'] < CONFIDENCE_THRESHOLD, 'Status'] = 'LOW_CONFIDENCE'
+    variance_data.loc[variance_data['Interval Count'] < MIN_INTERVALS, 'Status'] = 'INSUFFICIENT_DATA'
+    return variance_data
+
+def assert_sweep_matches_governance(row: pd.Series, engine: GovernanceEngine, variance_data: pd.DataFrame):
+    """Compare one sweep row with apply_governance on the same data and settings."""
+    governed = engine.apply_governance(variance_data)
+    summary = engine.get_governance_summary(governed)
+    final_variance = governed['Final Variance Percent']
+
+    assert row['auto_apply'] == summary['auto_apply_eligible']
+    assert row['manual_review'] == summary['manual_review_required']
+    assert row['capped'] == summary['capped_customers']
+    assert row['capped_increase'] == summary['max_increase_applied']
+    assert row['capped_decrease'] == summary['max_decrease_applied']
+    assert row['variance_mean'] == pytest.approx(summary['avg_final_variance'])
+    assert row['variance_std'] == pytest.approx(final_variance.std())
+    assert row['variance_p50'] == pytest.approx(final_variance.median())
+    assert row['variance_p95'] == pytest.approx(final_variance.quantile(0.95))
+
+def test_sweep_matches_governance_with_missing_winter_k():
+    engine = GovernanceEngine()
+    variance_data = make_variance_data()
+
+    results = engine.sweep(variance_data)
+
+    assert len(results) == 1
+    assert np.isfinite(results.filter(like='variance_').to_numpy()).all()
+    assert_sweep_matches_governance(results.iloc[0], engine, variance_data)
+
+def test_sweep_defaults_follow_config_changes_after_import(monkeypatch):
+    monkeypatch.setattr("src.governance.MAX_INCREASE", 0.05)
+    monkeypatch.setattr("src.governance.CAP_PCT", 0.4)
+    engine = GovernanceEngine()
+    variance_data = make_variance_data()
+
+    results = engine.sweep(variance_data)
+
+    assert results.loc[0, 'max_increase'] == 0.05
+    assert results.loc[0, 'cap_pct'] == 0.4
+    assert_sweep_matches_governance(results.iloc[0], engine, variance_data)
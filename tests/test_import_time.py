@@ -0,0 +1,22 @@
+"""
+Import-time budget tests for the FoxFuel K-Factor Optimizer.
+Runs the checks of benchmarks/import_time.py as part of the test suite.
+"""
+
+import pytest
+
+from benchmarks.import_time import IMPORT_BUDGETS, check_budgets
+
+# Fresh imports per module; the fastest is compared with the budget
+RUNS = 3
+
+@pytest.fixture(scope="module")
+def budget_results() -> dict:
+    return {result['module']: result for result in check_budgets(RUNS)}
+
+@pytest.mark.parametrize("module", list(IMPORT_BUDGETS))
+def test_import_within_budget(module, budget_results):
+    result = budget_results[module]
+
+    assert result['heavy'] == [], f"{module} imports {', '.join(result['heavy'])}"
+    assert result['ms'] <= result['budget_ms'], f"{module} took {result['ms']} ms"
@@ -0,0 +1,38 @@
+"""
+Incremental interval store tests for the FoxFuel K-Factor Optimizer.
+"""
+
+import pandas as pd
+import pytest
+
+from src.incremental import IncrementalIntervalStore
+from src.interval_builder import IntervalBuilder
+from src.logger import logger
+
+@pytest.fixture
+def warnings():
+    """Messages of WARNING and higher log records emitted during the test."""
+    messages = []
+    handler = logger.add(lambda message: messages.append(message.record['message']), level="WARNING")
+    yield messages
+    logger.remove(handler)
+
+def build(store: IncrementalIntervalStore, sample_inputs) -> pd.DataFrame:
+    data_loader, customer_fuel, delivery_tickets, degree_days = sample_inputs
+    return store.build_intervals(IntervalBuilder(), customer_fuel, delivery_tickets,
+                                 degree_days, data_loader.customer_keys)
+
+def test_unchanged_rerun_reuses_every_customer(sample_inputs, tmp_path, warnings):
+    _, customer_fuel, delivery_tickets, degree_days = sample_inputs
+    full = IntervalBuilder().build_intervals(customer_fuel, delivery_tickets, degree_days)
+    first = build(IncrementalIntervalStore(tmp_path), sample_inputs)
+    warnings.clear()
+
+    store = IncrementalIntervalStore(tmp_path)
+    second = build(store, sample_inputs)
+
+    assert store.rebuilt_customers == 0
+    assert store.reused_customers > 0
+    pd.testing.assert_frame_equal(first, full)
+    pd.testing.assert_frame_equal(second, full)
+    assert warnings == []
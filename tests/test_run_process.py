@@ -0,0 +1,48 @@
+"""
+Child process run tests for the FoxFuel K-Factor Optimizer.
+"""
+
+import time
+
+from src.events import EventBus
+from src.run_process import PipelineProcess
+
+# Seconds a sample run is given before a test fails
+RUN_DEADLINE_SECONDS = 120
+
+def wait_for_result(process: PipelineProcess) -> dict:
+    """Poll the process like the GUI does until its run finishes."""
+    deadline = time.monotonic() + RUN_DEADLINE_SECONDS
+    try:
+        while time.monotonic() < deadline:
+            result = process.poll()
+            if result is not None:
+                return result
+            time.sleep(0.05)
+        raise AssertionError("Run did not finish")
+    finally:
+        process.close()
+
+def test_sharded_run_in_child_process(sample_input_dir, tmp_path):
+    process = PipelineProcess(EventBus(), input_dir=sample_input_dir)
+    process.run(timeout=0, workers=2, output_dir=str(tmp_path))
+
+    result = wait_for_result(process)
+
+    assert result['status'] == 'success', result.get('error')
+    assert result['statistics']['total_customers'] > 0
+
+def test_timed_out_run_that_completes_keeps_its_result(sample_input_dir, tmp_path):
+    process = PipelineProcess(EventBus(), input_dir=sample_input_dir)
+    process.run(timeout=1e-6, output_dir=str(tmp_path))
+
+    # The first poll cancels the overdue run; clearing the request stands in for a
+    # run that completes without reaching another checkpoint
+    assert process.poll() is None
+    assert process.timed_out
+    process.cancel_event.clear()
+
+    result = wait_for_result(process)
+
+    assert result['status'] == 'success'
+    assert 'error' not in result
@@ -12,10 +12,6 @@ from pathlib import Path
 # Add src to path
 sys.path.append('src')
 
-from src.data_loader import DataLoader
-from src.interval_builder import IntervalBuilder
-from src.kfactor_calculator import KFactorCalculator
-from src.governance import GovernanceEngine
 from src.config import *
 
 class CustomerAnalysisGUI:
@@ -24,7 +20,9 @@ class CustomerAnalysisGUI:
         self.root.title("FoxFuel K-Factor Analysis Tool")
         self.root.geometry("1200x800")
         
-        # Initialize components
+        # Initialize components; data loads in the background while the window is usable
+        self.customer_query = None
+        self.load_thread = None
         self.setup_ui()
         self.load_data()
         
@@ -44,6 +42,11 @@ class CustomerAnalysisGUI:
         
         ttk.Button(input_frame, text="Analyze", command=self.analyze_customer).pack(side=tk.LEFT, padx=5)
         
+        # Status bar
+        self.status_var = tk.StringVar(value="Starting...")
+        status_bar = ttk.Label(self.root, textvariable=self.status_var, relief=tk.SUNKEN)
+        status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        
         # Main notebook for different views
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -92,14 +95,47 @@ class CustomerAnalysisGUI:
         self.output_text.pack(fill=tk.BOTH, expand=True)
         
     def load_data(self):
-        """Load all data files."""
+        """Start loading all data files on a background thread."""
+        self.load_thread = threading.Thread(target=self._load_data_thread)
+        self.load_thread.daemon = True
+        self.load_thread.start()
+        
+    def _load_data_thread(self):
+        """Load all data files, reporting progress in the status bar."""
         try:
+            # pandas is imported here so the window opens without waiting for it
+            from src.data_loader import DataLoader
+            from src.customer_query import CustomerQuery
+            
             self.data_loader = DataLoader(INPUT_DIR)
-            self.customer_fuel, self.delivery_tickets, self.degree_days = self.data_loader.load_all_data()
+            frames = self.data_loader.prefetch(progress=self._set_status)
+            for file_type in ('customer_fuel', 'delivery_tickets', 'degree_days'):
+                if file_type not in frames:
+                    # Raises the usual missing file error
+                    self.data_loader.load_input(file_type)
+            self.customer_fuel = frames['customer_fuel']
+            self.delivery_tickets = frames['delivery_tickets']
+            self.degree_days = frames['degree_days']
+            
+            # Index tickets by customer once so each lookup only processes that customer's rows
+            self._set_status("Indexing delivery tickets by customer...")
+            self.customer_query = CustomerQuery(
+                self.customer_fuel, self.delivery_tickets, self.degree_days, self.data_loader.files
+            )
+            self._set_status(f"Data loaded: {len(self.customer_fuel):,} customers, "
+                             f"{len(self.delivery_tickets):,} delivery tickets")
             print("Data loaded successfully")
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load data: {e}")
-            self.root.destroy()
+            self.root.after(0, self._load_failed, str(e))
+    
+    def _set_status(self, message):
+        """Show a status message from any thread."""
+        self.root.after(0, self.status_var.set, message)
+    
+    def _load_failed(self, error_msg):
+        """Report a data loading error and close the tool."""
+        messagebox.showerror("Error", f"Failed to load data: {error_msg}")
+        self.root.destroy()
             
     def analyze_customer(self):
         """Analyze the specified customer."""
@@ -117,9 +153,17 @@ class CustomerAnalysisGUI:
     def _analyze_thread(self, customer_number):
         """Run analysis in background thread."""
         
+        if self.load_thread is not None and self.load_thread.is_alive():
+            self._set_status(f"Waiting for data to finish loading before analyzing {customer_number}...")
+            self.load_thread.join()
+        if self.customer_query is None:
+            # Loading failed and the error has been shown
+            return
+        self._set_status(f"Analyzing customer {customer_number}...")
+        
         try:
             # Find customer
-            customer_data = self.customer_fuel[self.customer_fuel['Customer Number'] == customer_number]
+            customer_data = self.customer_query.customer_fuel_rows(customer_number)
             
             if customer_data.empty:
                 self.root.after(0, lambda: messagebox.showerror("Error", f"Customer {customer_number} not found!"))
@@ -130,23 +174,12 @@ class CustomerAnalysisGUI:
             current_summer_k = customer_data['K Factor - Summer'].iloc[0]
             usable_size = customer_data['Usable Size'].iloc[0]
             
-            # Build intervals
-            interval_builder = IntervalBuilder()
-            intervals = interval_builder.build_intervals(self.customer_fuel, self.delivery_tickets, self.degree_days)
-            customer_intervals = intervals[intervals['Customer Number'] == customer_number]
-            
-            # Filter valid intervals
-            valid_intervals = interval_builder.filter_valid_intervals(intervals)
-            customer_valid_intervals = valid_intervals[valid_intervals['Customer Number'] == customer_number]
-            
-            # Calculate interval K-factors
-            kfactor_calculator = KFactorCalculator()
-            interval_k_factors = kfactor_calculator.calculate_interval_k_factors(valid_intervals)
-            customer_interval_k = interval_k_factors[interval_k_factors['Customer Number'] == customer_number]
-            
-            # Calculate weighted K-factor
-            customer_k_factors = kfactor_calculator.calculate_weighted_k_by_customer(interval_k_factors)
-            customer_weighted_k = customer_k_factors[customer_k_factors['Customer Number'] == customer_number]
+            # Build intervals, K-factors and governance for this customer only
+            analysis = self.customer_query.analyze(customer_number)
+            customer_intervals = analysis['intervals']
+            customer_valid_intervals = analysis['valid_intervals']
+            customer_interval_k = analysis['interval_k_factors']
+            customer_weighted_k = analysis['customer_k_factors']
             
             if customer_weighted_k.empty:
                 weighted_k = None
@@ -159,9 +192,7 @@ class CustomerAnalysisGUI:
                 total_gallons = customer_weighted_k['Total Gallons'].iloc[0]
                 total_days = customer_weighted_k['Total Degree Days'].iloc[0]
             
-            # Calculate variance
-            variance_data = kfactor_calculator.calculate_variance(self.customer_fuel, customer_k_factors)
-            customer_variance = variance_data[variance_data['Customer Number'] == customer_number]
+            customer_variance = analysis['variance']
             
             if customer_variance.empty:
                 final_data = {
@@ -179,10 +210,8 @@ class CustomerAnalysisGUI:
                     'final_variance': None,
                 }
             else:
-                # Apply governance
-                governance_engine = GovernanceEngine()
-                governed_data = governance_engine.apply_governance(variance_data)
-                customer_governed = governed_data[governed_data['Customer Number'] == customer_number]
+                # Governance applied with the population's confidence scaling
+                customer_governed = analysis['governed']
                 
                 if customer_governed.empty:
                     proposed_k = None
@@ -220,6 +249,8 @@ class CustomerAnalysisGUI:
     def _update_display(self, data):
         """Update the display with analysis results."""
         
+        self.status_var.set(f"Showing customer {data['customer_number']}")
+        
         # Clear previous content
         self.summary_text.delete(1.0, tk.END)
         self.output_text.delete(1.0, tk.END)
@@ -6,6 +6,8 @@ Entry point for running the K-Factor optimization pipeline.
 
 import sys
 import os
+import argparse
+import multiprocessing
 from pathlib import Path
 from datetime import datetime
 
@@ -15,8 +17,27 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 from src.pipeline import KFactorPipeline
 from src.logger import setup_logger
 
-def main():
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="FoxFuel K-Factor Optimizer")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only rebuild intervals for customers whose tickets changed since the last run")
+    parser.add_argument("--workers", type=int, default=None, metavar="N",
+                        help="Worker processes for interval and K-factor steps (default: PIPELINE_WORKERS)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Process delivery tickets in chunks for files larger than memory")
+    parser.add_argument("--timings", type=Path, default=None, metavar="FILE",
+                        help="Write per-step wall time, CPU time, row counts and peak memory to a .json or .csv file")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also record the traced allocation peak of each step (slower)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run under cProfile, save a .prof file with the outputs and list the hottest functions")
+    return parser.parse_args(argv)
+
+def main(args=None):
     """Main entry point for the K-Factor Optimizer."""
+    if args is None:
+        args = parse_args()
     
     print("FoxFuel K-Factor Optimizer")
     print("=" * 40)
@@ -28,7 +49,11 @@ def main():
     
     try:
         # Initialize pipeline
-        pipeline = KFactorPipeline()
+        pipeline_options = {'incremental': args.incremental, 'streaming': args.stream,
+                            'profile_memory': args.trace_memory, 'profile': args.profile}
+        if args.workers is not None:
+            pipeline_options['workers'] = args.workers
+        pipeline = KFactorPipeline(**pipeline_options)
         
         # Run the pipeline
         results = pipeline.run_pipeline()
@@ -53,6 +78,11 @@ def main():
             print(f"• Valid intervals found: {stats['valid_intervals']}")
             print(f"• Customers ready for auto-apply: {stats['auto_apply_customers']}")
             
+            if args.timings is not None:
+                print(f"• Step timings: {pipeline.export_profile(args.timings)}")
+            if args.profile:
+                print(f"• cProfile: {results['profile_file']}")
+            
             print("\nNext Steps:")
             print("1. Review K_Review_Queue.xlsx for flagged customers")
             print("2. Import Apply_K_ThisWeek.csv into Ignite")
@@ -83,6 +113,8 @@ def main():
         return 1
 
 if __name__ == "__main__":
+    # Required for worker processes in the frozen executable
+    multiprocessing.freeze_support()
     exit_code = main()
     input("\nPress Enter to exit...")
     sys.exit(exit_code)